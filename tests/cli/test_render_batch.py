@@ -0,0 +1,87 @@
+# coding: utf-8
+import multiprocessing as mp
+import os
+import time
+
+import pytest
+
+from veditor.cli import render_batch
+
+# Workers inherit ``run_job`` patched by the tests only when they are forked.
+pytestmark = pytest.mark.skipif(
+    mp.get_start_method() != "fork", reason="Workers are not forked."
+)
+
+
+def _job(id, **export):
+    return dict(id=id, editor=dict(width=32, height=32), elements=[], export=export)
+
+
+def _fake_run_job(job):
+    """Behave as ``job["export"]`` says instead of rendering."""
+    export = job["export"]
+    if "sleep" in export:
+        time.sleep(export["sleep"])
+    if "exit" in export:
+        os._exit(export["exit"])
+    if "fail_once" in export:
+        # Fail the first attempt (in whichever worker it runs.)
+        if not os.path.exists(export["fail_once"]):
+            open(export["fail_once"], mode="w").close()
+            raise RuntimeError("The first attempt fails.")
+    return f"{job['id']}.mp4"
+
+
+@pytest.fixture(autouse=True)
+def fake_run_job(monkeypatch):
+    monkeypatch.setattr(render_batch, "run_job", _fake_run_job)
+
+
+@pytest.mark.parametrize(
+    ["retries", "status", "attempts"], [(0, "failed", 1), (1, "succeeded", 2)]
+)
+def test_retry(tmp_path, retries, status, attempts):
+    jobs = [_job("flaky", fail_once=str(tmp_path / "marker")), _job("ok")]
+    results = render_batch.run_jobs(jobs=jobs, workers=2, retries=retries)
+    assert [(r["id"], r["status"], r["attempts"]) for r in results] == [
+        ("flaky", status, attempts),
+        ("ok", "succeeded", 1),
+    ]
+    if status == "failed":
+        assert "The first attempt fails." in results[0]["error"]
+    else:
+        assert results[0]["out_path"] == "flaky.mp4"
+
+
+def test_timeout_kills_and_respawns_the_worker():
+    jobs = [_job("slow", sleep=60), _job("ok")]
+    start = time.time()
+    # With one worker, "ok" is rendered only if the killed worker is replaced.
+    results = render_batch.run_jobs(jobs=jobs, workers=1, retries=1, timeout=0.5)
+    assert time.time() - start < 30
+    assert [(r["status"], r["attempts"]) for r in results] == [
+        ("timeout", 2),
+        ("succeeded", 1),
+    ]
+    assert results[1]["out_path"] == "ok.mp4"
+
+
+def test_crashed_worker_is_respawned():
+    results = render_batch.run_jobs(jobs=[_job("crash", exit=3), _job("ok")])
+    assert [r["status"] for r in results] == ["failed", "succeeded"]
+    assert results[0]["error"] == "Exit code 3"
+
+
+@pytest.mark.parametrize(
+    "job",
+    [
+        dict(id="elements", elements=5),
+        dict(id="tracks", elements=[dict(type="ImageElement", tracks=5)]),
+        dict(id="editor", editor=[1]),
+        dict(id="scene", scene=str(os.devnull) + ".json"),
+    ],
+)
+def test_invalid_jobs(job):
+    results = render_batch.run_jobs(jobs=[job, _job("ok")])
+    assert [r["status"] for r in results] == ["invalid", "succeeded"]
+    assert (results[0]["attempts"] == 0) and (len(results[0]["error"]) > 0)
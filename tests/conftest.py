@@ -1,5 +1,8 @@
 # coding: utf-8
+import glob
 import os
+import shutil
+import subprocess
 import sys
 import pytest
 from data import TestData
@@ -23,4 +26,33 @@ def pytest_configure(config):
 @pytest.fixture
 def db():
     database = TestData()
-    return database
\ No newline at end of file
+    return database
+
+@pytest.fixture
+def make_video(tmp_path):
+    """Factory of small H.264 test videos in ``tmp_path`` (skips the test if ``ffmpeg`` is not installed.)"""
+    if shutil.which("ffmpeg") is None:
+        pytest.skip("ffmpeg is not installed.")
+    def _make_video(name="video.mp4", frames=90, size=(160, 120), fps=30, gop=15, start_time=0.0, source="testsrc", options=()):
+        path = str(tmp_path / name)
+        command = [
+            "ffmpeg", "-y", "-v", "error",
+            "-f", "lavfi", "-i", f"{source}=size={size[0]}x{size[1]}:rate={fps}",
+            "-frames:v", str(frames),
+            "-c:v", "libx264", "-g", str(gop), "-sc_threshold", "0", "-pix_fmt", "yuv420p",
+            "-output_ts_offset", str(start_time),
+            *options,
+            path,
+        ]
+        subprocess.run(command, check=True)
+        return path
+    return _make_video
+
+@pytest.fixture
+def ttfont():
+    """Path to a TrueType font installed in this machine (skips the test if there is none.)"""
+    for dirname in ["/usr/share/fonts", "/Library/Fonts", "C:/Windows/Fonts"]:
+        paths = sorted(glob.glob(os.path.join(dirname, "**", "*.ttf"), recursive=True))
+        if len(paths) > 0:
+            return paths[0]
+    pytest.skip("No TrueType font is installed.")
@@ -0,0 +1,80 @@
+# coding: utf-8
+import numpy as np
+import pytest
+
+from veditor.elements import ImageElement
+from veditor.utils.track_utils import cubic_bezier
+
+
+def _white(size=20, **kwargs):
+    return ImageElement(
+        x=np.full(shape=(size, size, 3), fill_value=255, dtype=np.uint8),
+        top=10,
+        left=10,
+        **kwargs
+    )
+
+
+def test_transform_at():
+    element = _white().animate("left", [(0, 0), (10, 100)])
+    element.animate("opacity", [(10, 1.0, "ease-out"), (20, 0.0)])
+    for pos, left, opacity in [(-5, 0, 1), (0, 0, 1), (5, 50, 1), (10, 100, 1)]:
+        t = element.transform_at(pos)
+        assert (t["left"], t["opacity"]) == (left, opacity)
+        # Properties without a track keep their fixed values.
+        assert (t["top"], t["width"], t["height"], t["rotation"]) == (10, 20, 20, 0)
+    assert element.transform_at(25)["opacity"] == 0.0
+    assert element.transform_at(15)["opacity"] == pytest.approx(
+        1 - cubic_bezier(0.5, easing="ease-out")
+    )
+    # Precomputed values are the same as the ones computed on demand.
+    expected = [element.transform_at(pos) for pos in range(-5, 30)]
+    element.prepare_tracks(start=0, end=20)
+    assert [element.transform_at(pos) for pos in range(-5, 30)] == expected
+
+
+def test_animate_validation():
+    element = _white()
+    with pytest.raises(KeyError):
+        element.animate("color", [(0, 0)])
+    with pytest.raises(ValueError):
+        element.animate("left", [])
+    with pytest.raises(KeyError):
+        element.animate("left", [(0, 0, "bounce")])
+    assert not element.animated
+
+
+def test_paste_sprite_opacity_and_rotation():
+    sprite = np.full(shape=(20, 20, 3), fill_value=200, dtype=np.uint8)
+    element = _white().animate("opacity", [(0, 0.5)])
+    frame = element.paste_sprite(
+        frame=np.zeros(shape=(50, 50, 3), dtype=np.uint8), pos=0, premultiplied=sprite
+    )
+    assert np.all(np.abs(frame[12:28, 12:28].astype(int) - 100) <= 1)
+    assert frame[:10].max() == 0 and frame[31:].max() == 0
+
+    # A square rotated by 90 degrees covers the same pixels.
+    element = _white().animate("rotation", [(0, 90)])
+    frame = element.paste_sprite(
+        frame=np.zeros(shape=(50, 50, 3), dtype=np.uint8), pos=0, premultiplied=sprite
+    )
+    assert np.all(frame[11:29, 11:29] == 200)
+    assert frame[:9].max() == 0 and frame[:, 31:].max() == 0
+
+
+def test_paste_sprite_clips_the_roi():
+    sprite = np.full(shape=(20, 20, 3), fill_value=200, dtype=np.uint8)
+    element = _white().animate("left", [(0, -10)]).animate("rotation", [(0, 180)])
+    element.animate("top", [(0, 40)])
+    frame = element.paste_sprite(
+        frame=np.zeros(shape=(50, 50, 3), dtype=np.uint8), pos=0, premultiplied=sprite
+    )
+    assert frame.shape == (50, 50, 3)
+    assert np.all(frame[41:, :9] == 200)
+    assert frame[:39].max() == 0 and frame[:, 11:].max() == 0
+    # Entirely out of the frame.
+    element.animate("left", [(0, 100)])
+    frame = element.paste_sprite(
+        frame=np.zeros(shape=(50, 50, 3), dtype=np.uint8), pos=0, premultiplied=sprite
+    )
+    assert frame.max() == 0
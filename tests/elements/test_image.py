@@ -0,0 +1,21 @@
+# coding: utf-8
+import gc
+import weakref
+
+import numpy as np
+
+from veditor.elements import ImageElement
+from veditor.elements.base import OmittedArgument
+
+
+def test_constructor_arrays_are_not_kept_alive():
+    x = np.zeros(shape=(400, 600, 3), dtype=np.uint8)
+    ref = weakref.ref(x)
+    element = ImageElement(x=x, width=60, top=0, left=0)
+    del x
+    gc.collect()
+    assert ref() is None
+    assert element.width == 60
+    args, kwargs = element._init_args
+    assert isinstance(kwargs["x"], OmittedArgument)
+    assert kwargs["width"] == 60
@@ -0,0 +1,76 @@
+# coding: utf-8
+import numpy as np
+import pytest
+
+from veditor.elements import ImageElement, LayoutGraph
+
+
+def _image(width, height, **kwargs):
+    return ImageElement(x=np.zeros(shape=(height, width, 3), dtype=np.uint8), **kwargs)
+
+
+def _scramble(elements):
+    for element in elements:
+        element.top, element.left = (-999, -999)
+
+
+def test_solve_matches_set_location_chained():
+    # Each ImageElement solves its location by ``set_location`` on construction.
+    a = _image(20, 10, top=5, left=7, margin=2)
+    b = _image(30, 15, top=a, left=a, margin=[1, 3, 4, 5])
+    c = _image(10, 10, top=b, left=b)
+    d = _image(10, 10, bottom=c, right=c, margin=3)
+    elements = [d, c, b, a]
+    expected = [e.locations for e in elements]
+    graph = LayoutGraph(elements=elements)
+    _scramble(elements)
+    graph.solve()
+    assert [e.locations for e in elements] == expected
+
+
+def test_solve_matches_set_location_mixed():
+    a = _image(20, 10, top=0, left=0)
+    b = _image(20, 10, top=200, left=300, margin=4)
+    c = _image(30, 20, top=a, bottom=b, left=10, right=b, margin=[1, 2, 3, 4])
+    c.set_location(lb=a, ub=b, direction="vertical", ratio=(1, 3))
+    c.set_location(lb=10, ub=b, direction="horizontal", ratio=(2, 1))
+    d = _image(10, 10, top=c, bottom=250, right=290)
+    elements = [a, b, c, d]
+    expected = [e.locations for e in elements]
+    graph = LayoutGraph(elements=elements)
+    _scramble(elements)
+    graph.solve()
+    assert [e.locations for e in elements] == expected
+
+
+def test_update_only_resolves_descendants():
+    a = _image(20, 10, top=0, left=0)
+    b = _image(20, 10, top=a, left=a)
+    c = _image(20, 10, top=b, left=0)
+    other = _image(20, 10, top=50, left=50)
+    graph = LayoutGraph(elements=[a, b, c, other])
+    assert {id(e) for e in graph.descendants(b)} == {id(b), id(c)}
+    _scramble([a, other])
+    a.top, a.left = (0, 0)
+    a.resize(width=40, height=20)
+    graph.update(a)
+    assert b.locations == (20, 60, 30, 40)
+    assert c.locations == (30, 20, 40, 0)
+    # Not affected by ``a``, so left as it is.
+    assert other.locations == (-999, -979, -989, -999)
+
+
+def test_circular_references():
+    a = _image(20, 10, top=0, left=0)
+    b = _image(20, 10, top=a, left=0)
+    a.constraints["top"] = b
+    graph = LayoutGraph(elements=[a, b])
+    with pytest.raises(ValueError, match="circular"):
+        graph.solve()
+
+
+def test_default_elements_are_not_shared():
+    graph = LayoutGraph()
+    graph.add(_image(20, 10, top=0, left=0))
+    assert len(graph) == 1
+    assert len(LayoutGraph()) == 0
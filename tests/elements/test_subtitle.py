@@ -0,0 +1,34 @@
+# coding: utf-8
+import numpy as np
+
+from veditor.elements import SubtitleTrackElement
+
+CUES = [(0, 1000, "Hello"), (500, 1500, "World"), (2000, 2500, "After a gap")]
+
+
+def test_get_cue(ttfont):
+    element = SubtitleTrackElement(
+        subtitles=CUES, ttfontname=ttfont, fps=10, start_pos=5, top=0, left=0
+    )
+    assert (element.start_pos, element.end_pos) == (5, 30)
+    expected = (
+        [None] * 5
+        + ["Hello"] * 5
+        + ["Hello\nWorld"] * 5
+        + ["World"] * 5
+        + [None] * 5
+        + ["After a gap"] * 5
+        + [None] * 5
+    )
+    assert [element.get_cue(pos) for pos in range(35)] == expected
+
+
+def test_edit_draws_only_active_cues(ttfont):
+    element = SubtitleTrackElement(
+        subtitles=CUES, ttfontname=ttfont, fps=10, top=0, left=0, fontsize=12
+    )
+    # Sized to the largest (stacked) cue.
+    assert element.height > element.get_sprite("Hello").shape[0]
+    frame = np.zeros(shape=(element.height, element.width, 3), dtype=np.uint8)
+    assert element.edit(frame=frame.copy(), pos=7).any()
+    assert not element.edit(frame=frame.copy(), pos=17).any()
@@ -0,0 +1,51 @@
+# coding: utf-8
+import numpy as np
+import pytest
+
+from veditor.elements import DynamicTextElement
+from veditor.utils.glyph_utils import get_glyph_atlas
+
+
+def test_size_fits_every_text(ttfont):
+    element = DynamicTextElement(
+        text=lambda pos: "\n".join(["8"] * (pos // 50 + 1)),
+        ttfontname=ttfont,
+        pos_frames=(0, 120),
+        top=0,
+        left=0,
+    )
+    atlas = get_glyph_atlas(ttfontname=ttfont, fontsize=16, stroke_width=0)
+    assert (element.width, element.height) == atlas.measure("8\n8\n8")
+    element = DynamicTextElement(
+        text="{pos}",
+        ttfontname=ttfont,
+        pos_frames=(5, 125),
+        textRGB="white",
+        top=0,
+        left=0,
+    )
+    assert (element.width, element.height) == atlas.measure("120")
+    # The widest text is drawn in full.
+    frame = np.zeros(shape=(element.height, element.width, 3), dtype=np.uint8)
+    assert np.array_equal(
+        element.edit(frame=frame.copy(), pos=125)[..., 0] > 0,
+        atlas.render("120", textRGB="white")[..., 3] > 0,
+    )
+
+
+def test_size_requires_end_or_explicit_size(ttfont):
+    with pytest.raises(ValueError):
+        DynamicTextElement(text="{pos}", ttfontname=ttfont, top=0, left=0)
+    with pytest.raises(ValueError):
+        DynamicTextElement(text="{pos}", ttfontname=ttfont, width=40, top=0, left=0)
+    element = DynamicTextElement(
+        text="{pos}", ttfontname=ttfont, width=40, height=20, top=0, left=0
+    )
+    assert (element.width, element.height) == (40, 20)
+
+
+def test_measure_matches_compose(ttfont):
+    atlas = get_glyph_atlas(ttfontname=ttfont, fontsize=16, stroke_width=2)
+    for text in ["", "AV", "Wy\nfi", "12:34"]:
+        w, h = atlas.measure(text, spacing=3)
+        assert atlas.compose(text, spacing=3).shape == (h, w, 2)
@@ -0,0 +1,52 @@
+# coding: utf-8
+import cv2
+import numpy as np
+import pytest
+
+from veditor.elements import VideoElement
+from veditor.utils.video_utils import probe_keyframes
+
+
+def test_fingerprint_ignores_proxies_and_decoders(make_video):
+    element = VideoElement(video_path=make_video("video.mp4"))
+    fingerprint = element.fingerprint()
+    element.set_proxy(make_video("proxy.mp4", size=(80, 60)))
+    element.read(pos=0)
+    assert element.fingerprint() == fingerprint
+    other = VideoElement(video_path=make_video("other.mp4", source="rgbtestsrc"))
+    assert other.fingerprint() != fingerprint
+
+
+def _read_all(path):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+@pytest.mark.parametrize(
+    ["in_pos", "out_pos"], [(-1, None), (30, 30), (30, 20), (0, 91), (90, None)]
+)
+def test_invalid_subclip(make_video, in_pos, out_pos):
+    with pytest.raises(ValueError):
+        VideoElement(video_path=make_video(frames=90), in_pos=in_pos, out_pos=out_pos)
+
+
+@pytest.mark.parametrize("in_pos", [0, 7, 15, 22])
+def test_subclip_frames(make_video, in_pos):
+    # Keyframes are every 15 frames, so 7 and 22 are reached by decoding forward.
+    video_path = make_video(frames=60, gop=15)
+    assert in_pos % 15 != 0 or in_pos in probe_keyframes(video_path, fps=30)
+    source = _read_all(video_path)
+    element = VideoElement(
+        video_path=video_path, start_pos=10, in_pos=in_pos, out_pos=in_pos + 20
+    )
+    assert (element.start_pos, element.end_pos) == (10, 30)
+    assert element.read(pos=9) is None and element.read(pos=30) is None
+    for pos in range(10, 30):
+        assert np.array_equal(element.read(pos=pos), source[in_pos + pos - 10]), pos
@@ -0,0 +1,152 @@
+# coding: utf-8
+import shutil
+
+import cv2
+import numpy as np
+import pytest
+
+from veditor import editor as editor_module
+from veditor.editor import VEditor
+from veditor.elements import ImageElement, VideoElement
+from veditor.utils.cache_utils import RenderCache
+from veditor.utils.proxy_utils import ProxyManager
+from veditor.utils.video_utils import probe_keyframes
+
+
+def _read_all(path):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame.astype(np.int16))
+    cap.release()
+    return frames
+
+
+@pytest.fixture
+def base_video(make_video):
+    return make_video("base.mp4")
+
+
+def _editor(video_path, bgRGB):
+    element = ImageElement(
+        np.full(shape=(40, 40, 3), fill_value=255, dtype=np.uint8),
+        pos_frames=(30, 44),
+        top=10,
+        left=10,
+    )
+    return VEditor(elements=[element], video_path=video_path, bgRGB=bgRGB)
+
+
+@pytest.mark.parametrize("bgRGB", [(0, 0, 0), None])
+@pytest.mark.parametrize("start_time", [0.0, 2.0])
+def test_smart_cut_matches_normal_render(tmp_path, make_video, bgRGB, start_time):
+    base_video = make_video("base.mp4", start_time=start_time)
+    editor = _editor(video_path=base_video, bgRGB=bgRGB)
+    expected = [
+        editor.edit(frame=frame, pos=pos).astype(np.int16)
+        for pos, frame in editor.read_frames()
+    ]
+    out_path = editor.smart_cut(out_path=str(tmp_path / "smart.mp4"))
+    actual = _read_all(out_path)
+    assert len(actual) == len(expected)
+    ranges = editor.smart_cut_ranges(
+        keyframes=probe_keyframes(base_video, fps=editor.fps)
+    )
+    for start, end, edited in ranges:
+        for pos in range(start, end):
+            diff = np.abs(actual[pos] - expected[pos]).mean()
+            if edited:
+                assert diff < 4, (pos, diff)
+            else:
+                # Stream-copied from the base video, as the normal render is.
+                assert diff == 0, (pos, diff)
+
+
+def test_edited_mask_with_background(base_video):
+    assert _editor(video_path=base_video, bgRGB=(0, 0, 0)).edited_mask().all()
+    mask = _editor(video_path=base_video, bgRGB=None).edited_mask()
+    assert mask.sum() == 15 and mask[30:45].all()
+
+
+def test_export_with_small_render_cache(tmp_path):
+    element = ImageElement(
+        np.full(shape=(40, 40, 3), fill_value=255, dtype=np.uint8),
+        pos_frames=(0, 99),
+        top=0,
+        left=0,
+    )
+    editor = VEditor(elements=[element])
+    cache = RenderCache(
+        cache_dir=str(tmp_path / "cache"), segment_frames=30, max_bytes=1
+    )
+    out_path = editor.export(
+        out_path=str(tmp_path / "out.mp4"), codec="mp4v", open=False, cache=cache
+    )
+    assert len(_read_all(out_path)) == editor.frame_count
+
+
+def test_retimed_frames_blend_pairs(base_video):
+    editor = VEditor(elements=[], video_path=base_video, bgRGB=None)
+    frames = [frame for _, frame in editor.read_frames()]
+    idx = np.asarray([0, 0, 1, 5, 5, 89])
+    weights = np.asarray([0.0, 0.25, 0.5, 0.0, 0.75, 0.0])
+    actual = list(editor.retimed_frames(idx=idx, weights=weights))
+    assert len(actual) == len(idx)
+    for frame, pos, weight in zip(actual, idx, weights):
+        expected = cv2.addWeighted(
+            frames[pos], 1 - weight, frames[min(pos + 1, 89)], weight, 0
+        )
+        assert np.array_equal(frame, expected), (pos, weight)
+
+
+@pytest.mark.parametrize(
+    "crop",
+    [
+        dict(top=10, left=20, right=140, bottom=100),
+        dict(top=11, left=21, right=139, bottom=99),
+        dict(top=0, left=3, right=160, bottom=120),
+    ],
+)
+@pytest.mark.parametrize("use_ffmpeg", [True, False])
+def test_cropped_frames(base_video, monkeypatch, crop, use_ffmpeg):
+    original = VEditor(elements=[], video_path=base_video)
+    expected = {
+        pos: frame[crop["top"] : crop["bottom"], crop["left"] : crop["right"]]
+        for pos, frame in original.read_frames()
+    }
+    if not use_ffmpeg:
+        monkeypatch.setattr(shutil, "which", lambda cmd: None)
+    editor = VEditor(elements=[], video_path=base_video, crop=crop)
+    for pos in [0, 7, 31]:
+        assert np.array_equal(editor.read_frame(pos), expected[pos]), pos
+    for pos, frame in editor.read_frames(start=40, end=50):
+        assert np.array_equal(frame, expected[pos]), pos
+
+
+def test_check_works_sets_proxies_only_on_the_preview(
+    tmp_path, make_video, monkeypatch
+):
+    heights = []
+
+    def get_proxy_manager(height):
+        heights.append(height)
+        return ProxyManager(cache_dir=str(tmp_path / "proxies"), height=height)
+
+    monkeypatch.setattr(editor_module, "get_proxy_manager", get_proxy_manager)
+    element = VideoElement(
+        video_path=make_video("video.mp4", frames=10, size=(320, 240))
+    )
+    editor = VEditor(elements=[element])
+    fingerprint = editor.fingerprint()
+    out_path = editor.check_works(
+        out_path=str(tmp_path / "preview.mp4"), codec="mp4v", open=False, scale=0.25
+    )
+    assert heights == [60]
+    assert len(_read_all(out_path)) == editor.frame_count
+    assert cv2.VideoCapture(out_path).get(cv2.CAP_PROP_FRAME_HEIGHT) == 60
+    # The editor (and its elements) still decode the originals.
+    assert (element.proxy_path, element.decode_path) == (None, element.video_path)
+    assert editor.fingerprint() == fingerprint
@@ -0,0 +1,120 @@
+# coding: utf-8
+import copy
+import re
+
+import cv2
+import numpy as np
+import pytest
+
+from veditor.editor import VEditor
+from veditor.elements import ImageElement
+from veditor.scene import Scene, SceneValidationError
+
+
+@pytest.fixture
+def image_path(tmp_path):
+    path = str(tmp_path / "logo.png")
+    image = np.zeros(shape=(20, 30, 3), dtype=np.uint8)
+    image[5:15, 5:25] = (0, 128, 255)
+    cv2.imwrite(path, image)
+    return path
+
+
+@pytest.fixture
+def editor(image_path):
+    logo = ImageElement(x=image_path, pos_frames=(0, 30), top=10, left=10)
+    logo.animate("left", [(0, 10), (20, 50, "ease-out")])
+    shadow = ImageElement(
+        x=image_path, pos_frames=(5, None), top=logo, left=logo, margin=2
+    )
+    return VEditor(elements=[logo, shadow], width=120, height=80, fps=24.0)
+
+
+def _render(editor, pos):
+    return editor.edit(frame=editor.read_frame(pos), pos=pos)
+
+
+@pytest.mark.parametrize("ext", ["json", "yaml"])
+def test_round_trip(tmp_path, editor, ext):
+    if ext == "yaml":
+        pytest.importorskip("yaml")
+    scene = Scene.from_editor(editor)
+    path = scene.dump(str(tmp_path / f"scene.{ext}"))
+    loaded = Scene.load(path)
+    assert loaded.hash() == scene.hash()
+    built = loaded.validate().build()
+    assert Scene.from_editor(built).hash() == scene.hash()
+    assert [e.locations for e in built.elements] == [
+        e.locations for e in editor.elements
+    ]
+    assert built.elements[1].constraints["top"] is built.elements[0]
+    for pos in [0, 10, 25]:
+        assert np.array_equal(_render(built, pos), _render(editor, pos)), pos
+
+
+def test_hash(editor, image_path):
+    scene = Scene.from_editor(editor)
+    assert Scene.from_dict(scene.to_dict()).hash() == scene.hash()
+    # Ids are only names.
+    data = copy.deepcopy(scene.to_dict())
+    data["elements"][0]["id"] = "logo"
+    data["elements"][1]["top"] = {"$ref": "logo"}
+    data["elements"][1]["left"] = {"$ref": "logo"}
+    assert Scene.from_dict(data).hash() == scene.hash()
+    # Arguments are hashed.
+    data["elements"][1]["margin"] = 3
+    assert Scene.from_dict(data).hash() != scene.hash()
+    # So are the contents of the assets.
+    before = scene.hash()
+    cv2.imwrite(image_path, np.full(shape=(20, 30, 3), fill_value=9, dtype=np.uint8))
+    assert scene.hash() != before
+
+
+def test_validate_reports_all_errors(tmp_path):
+    scene = Scene(
+        editor=dict(width="wide", elements=[]),
+        elements=[
+            dict(type="UnknownElement"),
+            dict(type="ImageElement", id="a", top=0, left=0),
+            dict(type="ImageElement", id="a", x=str(tmp_path / "no.png"), top=0),
+            dict(type="ImageElement", x="logo.png", top={"$ref": "b"}, unknown=1),
+            dict(type="ImageElement", x="logo.png", tracks=[(0, 1)]),
+            dict(type="ImageElement", x="logo.png", tracks={"color": [(0, 1)]}),
+            dict(type="ImageElement", x="logo.png", tracks={"left": [(0, 1, "x")]}),
+        ],
+        version=0,
+    )
+    with pytest.raises(SceneValidationError) as e:
+        scene.validate(check_files=False)
+    errors = [re.sub(r"\x1b\[[0-9;]*m", "", error) for error in e.value.errors]
+    expected = [
+        "Unsupported version 0",
+        "editor: width is invalid.",
+        "editor: elements must be given",
+        "elements[0]: type must be one of",
+        "elements[1] (ImageElement): x is required.",
+        "elements[2]: id 'a' is duplicated.",
+        "elements[3] (ImageElement): top refers to 'b'",
+        "elements[3] (ImageElement): unknown argument unknown.",
+        "elements[4]: tracks must be a dictionary",
+        "elements[5]: track color is invalid.",
+        "elements[6]: track left is invalid.",
+    ]
+    assert len(errors) == len(expected), errors
+    for error, prefix in zip(errors, expected):
+        assert error.startswith(prefix), (error, prefix)
+    # Files are checked only when asked.
+    with pytest.raises(SceneValidationError) as e:
+        Scene(
+            elements=[dict(type="ImageElement", x=str(tmp_path / "no.png"))]
+        ).validate()
+    assert "is not found" in e.value.errors[0]
+
+
+def test_from_editor_with_arrays():
+    element = ImageElement(x=np.zeros(shape=(20, 30, 3), dtype=np.uint8), top=0, left=0)
+    with pytest.raises(SceneValidationError) as e:
+        Scene.from_editor(VEditor(elements=[element]))
+    assert e.value.errors == [
+        "ndarray can not be serialized. (Use the path to the file instead.)"
+    ]
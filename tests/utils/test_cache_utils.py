@@ -0,0 +1,34 @@
+# coding: utf-8
+import numpy as np
+
+from veditor.utils.cache_utils import FrameRing
+
+
+def _frame(pos):
+    return np.full(shape=(2, 3, 3), fill_value=pos, dtype=np.uint8)
+
+
+def test_frame_ring_wraparound(tmp_path):
+    ring = FrameRing(capacity=4, shape=(2, 3, 3), dir=str(tmp_path))
+    for pos in range(10):
+        ring.put(pos=pos, frame=_frame(pos))
+    # Only the last ``capacity`` frames survive, each in the slot ``pos % capacity``.
+    assert [pos for pos in range(12) if pos in ring] == [6, 7, 8, 9]
+    for pos in range(10):
+        frame = ring.get(pos)
+        if pos < 6:
+            assert frame is None
+        else:
+            assert np.array_equal(frame, _frame(pos))
+    # Positions which share a slot with a stored frame are not mistaken for it.
+    assert (13 not in ring) and (ring.get(13) is None)
+    ring.close()
+
+
+def test_frame_ring_get_returns_a_copy():
+    ring = FrameRing(capacity=2, shape=(2, 3, 3))
+    ring.put(pos=1, frame=_frame(1))
+    frame = ring.get(1)
+    frame[:] = 0
+    assert np.array_equal(ring.get(1), _frame(1))
+    ring.close()
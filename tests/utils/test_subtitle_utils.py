@@ -0,0 +1,107 @@
+# coding: utf-8
+import pytest
+
+from veditor.utils.subtitle_utils import (
+    load_subtitles,
+    merge_cues,
+    parse_subtitles,
+    timestamp2msec,
+)
+
+SRT = """1
+00:00:01,000 --> 00:00:03,000
+<i>Hello</i>
+
+2
+00:00:02,000 --> 00:00:04,500
+Overlapping
+second line
+
+3
+00:00:06,000 --> 00:00:07,000
+After a gap
+"""
+
+VTT = """WEBVTT
+
+NOTE This is a comment.
+
+intro
+00:01.000 --> 00:03.000 align:start position:10%
+<v Speaker>Hello</v>
+
+00:02.000 --> 00:04.500
+Overlapping
+second line
+
+00:00:06.000 --> 00:00:07.000
+After a gap
+"""
+
+EXPECTED = [
+    (1000, 3000, "Hello"),
+    (2000, 4500, "Overlapping\nsecond line"),
+    (6000, 7000, "After a gap"),
+]
+
+
+@pytest.mark.parametrize(
+    ["timestamp", "msec"],
+    [("00:01:02,345", 62345), ("01:02.345", 62345), ("1:00:00.5", 3600500)],
+)
+def test_timestamp2msec(timestamp, msec):
+    assert timestamp2msec(timestamp) == msec
+
+
+def test_timestamp2msec_invalid():
+    with pytest.raises(ValueError):
+        timestamp2msec("1 second")
+
+
+@pytest.mark.parametrize("text", [SRT, VTT, SRT.replace("\n", "\r\n")])
+def test_parse_subtitles(text):
+    assert parse_subtitles(text) == EXPECTED
+
+
+def test_parse_subtitles_sorts_and_skips_empty_cues():
+    text = "00:00:05,000 --> 00:00:06,000\nB\n\n00:00:01,000 --> 00:00:02,000\n\n\n00:00:00,000 --> 00:00:01,000\nA\n"
+    assert parse_subtitles(text) == [(0, 1000, "A"), (5000, 6000, "B")]
+
+
+@pytest.mark.parametrize(["ext", "text"], [("srt", SRT), ("vtt", VTT)])
+def test_load_subtitles(tmp_path, ext, text):
+    path = tmp_path / f"subtitles.{ext}"
+    path.write_text(text, encoding="utf-8-sig")
+    assert load_subtitles(str(path)) == EXPECTED
+
+
+def test_load_subtitles_invalid(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        load_subtitles(str(tmp_path / "not_found.srt"))
+    path = tmp_path / "subtitles.txt"
+    path.write_text(SRT)
+    with pytest.raises(KeyError):
+        load_subtitles(str(path))
+
+
+def test_merge_cues_overlaps_and_gaps():
+    assert merge_cues(EXPECTED) == [
+        (1000, 2000, "Hello"),
+        (2000, 3000, "Hello\nOverlapping\nsecond line"),
+        (3000, 4500, "Overlapping\nsecond line"),
+        (6000, 7000, "After a gap"),
+    ]
+
+
+def test_merge_cues_nested_and_adjacent():
+    cues = [(0, 1000, "A"), (1000, 2000, "A"), (500, 800, "B"), (500, 3000, "C")]
+    assert merge_cues(cues) == [
+        (0, 500, "A"),
+        (500, 800, "A\nB\nC"),
+        (800, 1000, "A\nC"),
+        # Stacked in order of their start times.
+        (1000, 2000, "C\nA"),
+        (2000, 3000, "C"),
+    ]
+    assert merge_cues([(0, 1000, "A"), (1000, 2000, "A")]) == [(0, 2000, "A")]
+    assert merge_cues([]) == []
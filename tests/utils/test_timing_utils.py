@@ -0,0 +1,134 @@
+# coding: utf-8
+import numpy as np
+import pytest
+from PIL import Image
+
+from veditor.utils.timing_utils import (
+    DEFAULT_FRAME_DURATION,
+    frame_schedule,
+    probe_frame_times,
+    retime_schedule,
+)
+
+
+@pytest.mark.parametrize(
+    ["src_fps", "fps"], [(30, 24), (24, 60), (30, 30), (25, 30), (60, 24)]
+)
+def test_frame_schedule_constant_frame_rates(src_fps, fps):
+    frame_times = np.arange(src_fps + 1) / src_fps  # 1 second.
+    schedule = frame_schedule(frame_times, fps=fps)
+    assert len(schedule) == fps
+    # The source frame which is presented when each timeline frame is.
+    expected = [int(np.floor(k * src_fps / fps + 1e-9)) for k in range(fps)]
+    assert schedule.tolist() == expected
+
+
+def test_frame_schedule_30_to_24():
+    schedule = frame_schedule(np.arange(31) / 30, fps=24)
+    assert schedule[:8].tolist() == [0, 1, 2, 3, 5, 6, 7, 8]
+    # One frame in five is dropped.
+    assert len(set(schedule.tolist())) == 24
+
+
+def test_frame_schedule_24_to_60():
+    schedule = frame_schedule(np.arange(25) / 24, fps=60)
+    # Frames are held for 3 and 2 timeline frames alternately (2:3 pulldown.)
+    assert np.bincount(schedule).tolist() == [3, 2] * 12
+
+
+def test_frame_schedule_variable_frame_rate():
+    frame_times = [0.0, 0.1, 0.15, 0.4, 0.5]
+    assert frame_schedule(frame_times, fps=20).tolist() == [
+        0, 0, 1, 2, 2, 2, 2, 2, 3, 3
+    ]  # fmt: skip
+    # Subclip of the source.
+    assert frame_schedule(frame_times, fps=20, start=1, end=3).tolist() == [
+        1, 2, 2, 2, 2, 2
+    ]  # fmt: skip
+
+
+def test_probe_frame_times_of_variable_frame_rate_video(make_video):
+    # The first 10 frames last 1/30 seconds, and the others last 2/30 seconds.
+    path = make_video(
+        "vfr.mp4",
+        frames=20,
+        options=[
+            "-vf", "setpts='if(lt(N,10),N,10+2*(N-10))/30/TB'",
+            "-fps_mode", "vfr",
+        ],
+    )  # fmt: skip
+    frame_times = probe_frame_times(path)
+    assert np.allclose(frame_times[:20] * 30, list(range(10)) + list(range(10, 30, 2)))
+    schedule = frame_schedule(frame_times, fps=30)
+    assert schedule[:14].tolist() == list(range(10)) + [10, 10, 11, 11]
+
+
+def test_probe_frame_times_of_gif(tmp_path):
+    path = str(tmp_path / "animation.gif")
+    images = [Image.new("RGB", (8, 8), (60 * i, 0, 0)) for i in range(4)]
+    images[0].save(
+        path, save_all=True, append_images=images[1:], duration=[100, 300, 0, 50]
+    )
+    frame_times = probe_frame_times(path)
+    # Frames without a duration last ``DEFAULT_FRAME_DURATION``.
+    assert np.allclose(np.diff(frame_times), [0.1, 0.3, DEFAULT_FRAME_DURATION, 0.05])
+    assert frame_schedule(frame_times, fps=20).tolist() == [
+        0, 0, 1, 1, 1, 1, 1, 1, 2, 2, 3
+    ]  # fmt: skip
+
+
+@pytest.mark.parametrize(
+    ["speed", "expected"],
+    [
+        (1.0, list(range(12))),
+        (2.0, list(range(0, 12, 2))),
+        (0.5, np.repeat(range(12), 2).tolist()),
+        (3, [0, 3, 6, 9]),
+    ],
+)
+def test_retime_schedule_constant_speed(speed, expected):
+    idx, weights = retime_schedule(frame_count=12, fps=30, speed=speed)
+    assert idx.tolist() == expected
+    assert not weights.any()
+
+
+def test_retime_schedule_frame_rate():
+    idx, _ = retime_schedule(frame_count=30, fps=30, out_fps=24)
+    assert idx.tolist() == frame_schedule(np.arange(31) / 30, fps=24).tolist()
+    idx, _ = retime_schedule(frame_count=24, fps=24, out_fps=60, speed=2.0)
+    assert len(idx) == 30 and idx[-1] == 23
+
+
+def test_retime_schedule_speed_ramp():
+    # Linearly from 1x to 3x in the first 30 frames, and 3x after that.
+    speed = [(0, 1.0), (30, 3.0)]
+    idx, _ = retime_schedule(frame_count=60, fps=30, speed=speed)
+    speeds = np.minimum(1 + 2 * np.arange(60) / 30, 3)
+    assert len(idx) == int(np.ceil(np.sum(1 / speeds) - 1e-6))
+    steps = np.diff(idx)
+    assert idx[0] == 0 and np.all(steps >= 0)
+    assert steps[:3].tolist() == [1, 1, 1] and np.all(steps[-5:] == 3)
+    # Same as a constant speed when the ramp is flat.
+    assert (
+        retime_schedule(frame_count=60, fps=30, speed=[(0, 2.0), (30, 2.0)])[0].tolist()
+        == retime_schedule(frame_count=60, fps=30, speed=2.0)[0].tolist()
+    )
+
+
+def test_retime_schedule_blend_pairs():
+    idx, weights = retime_schedule(frame_count=10, fps=30, speed=0.75, blend=True)
+    # Output frame ``k`` presents the (fractional) timeline position ``0.75 * k``.
+    positions = 0.75 * np.arange(len(idx))
+    assert idx.tolist() == np.floor(positions).astype(int).tolist()
+    assert np.allclose(weights, np.where(idx < 9, positions - idx, 0))
+    assert np.all((0 <= weights) & (weights < 1))
+    # The last timeline frame is never blended with the frame after the end.
+    idx, weights = retime_schedule(frame_count=3, fps=30, out_fps=60, blend=True)
+    assert idx.tolist() == [0, 0, 1, 1, 2, 2]
+    assert weights.tolist() == [0.0, 0.5, 0.0, 0.5, 0.0, 0.0]
+
+
+@pytest.mark.parametrize("speed", [0, -1.0, [(0, 1.0), (5, 0.0)]])
+def test_retime_schedule_invalid_speed(speed):
+    with pytest.raises(ValueError):
+        retime_schedule(frame_count=10, fps=30, speed=speed)
@@ -0,0 +1,69 @@
+# coding: utf-8
+import numpy as np
+import pytest
+
+from veditor.utils.track_utils import (
+    SUPPORTED_EASINGS,
+    cubic_bezier,
+    easing2points,
+    interpolate_keyframes,
+)
+
+
+def _bezier_reference(t, points):
+    """Solve ``x(s) = t`` by bisection and return ``y(s)``."""
+    x1, y1, x2, y2 = points
+
+    def curve(s, p1, p2):
+        return 3 * (1 - s) ** 2 * s * p1 + 3 * (1 - s) * s**2 * p2 + s**3
+
+    lo, hi = (0.0, 1.0)
+    for _ in range(60):
+        mid = (lo + hi) / 2
+        if curve(mid, x1, x2) < t:
+            lo = mid
+        else:
+            hi = mid
+    return curve((lo + hi) / 2, y1, y2)
+
+
+@pytest.mark.parametrize("easing", list(SUPPORTED_EASINGS.keys()))
+def test_cubic_bezier(easing):
+    t = np.linspace(0, 1, 21)
+    actual = cubic_bezier(t, easing=easing)
+    expected = [_bezier_reference(v, SUPPORTED_EASINGS[easing]) for v in t]
+    assert actual[0] == pytest.approx(0) and actual[-1] == pytest.approx(1)
+    assert np.allclose(actual, expected, atol=1e-3)
+    assert np.all(np.diff(actual) >= 0)
+
+
+def test_cubic_bezier_custom_points():
+    points = (0.1, 0.7, 0.9, 0.3)
+    t = np.linspace(0, 1, 11)
+    expected = [_bezier_reference(v, points) for v in t]
+    assert np.allclose(cubic_bezier(t, easing=points), expected, atol=1e-3)
+    with pytest.raises(ValueError):
+        easing2points((1.5, 0, 0.5, 1))
+    with pytest.raises(KeyError):
+        easing2points("bounce")
+
+
+def test_interpolate_keyframes_at_and_between_keyframes():
+    keyframes = [(0, 0.0, "linear"), (10, 100.0, "ease-in"), (20, 50.0, "linear")]
+    values = interpolate_keyframes(keyframes, [0, 5, 10, 15, 20])
+    assert values[[0, 2, 4]].tolist() == [0.0, 100.0, 50.0]
+    assert values[1] == pytest.approx(50.0)
+    # The easing of the earlier keyframe (``ease-in``) is used until the next one.
+    eased = _bezier_reference(0.5, SUPPORTED_EASINGS["ease-in"])
+    assert values[3] == pytest.approx(100.0 - 50.0 * eased, abs=0.1)
+
+
+def test_interpolate_keyframes_clamps_outside_the_range():
+    keyframes = [(10, 1.0, "ease"), (20, 3.0, "ease")]
+    values = interpolate_keyframes(keyframes, [-100, 9, 21, 1000])
+    assert values.tolist() == [1.0, 1.0, 3.0, 3.0]
+    assert interpolate_keyframes([(5, 7.0, "linear")], [0, 5, 10]).tolist() == [
+        7.0,
+        7.0,
+        7.0,
+    ]
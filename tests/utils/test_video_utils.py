@@ -0,0 +1,89 @@
+# coding: utf-8
+import threading
+import time
+
+import cv2
+import numpy as np
+import pytest
+
+from veditor.utils.video_utils import ScrubReader
+
+
+def _read_all(path):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def _wait_until(condition, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            pytest.fail("Timed out.")
+        time.sleep(0.005)
+
+
+@pytest.fixture
+def intra_video(make_video):
+    # Every frame is a keyframe, so seeking by ``OpenCV`` is exact.
+    return make_video("intra.mp4", frames=60, gop=1)
+
+
+def test_scrub_reader_request_and_latest(intra_video, tmp_path):
+    source = _read_all(intra_video)
+    reader = ScrubReader(intra_video, capacity=16, dir=str(tmp_path))
+    assert reader.latest() is None
+    for pos in [10, 40, 3]:
+        reader.request(pos)
+        _wait_until(lambda: (reader.latest() or (None,))[0] == pos)
+        assert np.array_equal(reader.latest()[1], source[pos])
+    assert np.array_equal(reader.read(25), source[25])
+    reader.release()
+
+
+def test_scrub_reader_prefetches_in_the_direction_of_travel(intra_video):
+    reader = ScrubReader(intra_video, capacity=16)
+    reader.request(20)
+    _wait_until(lambda: all(pos in reader.ring for pos in range(21, 29)))
+    reader.request(50)
+    reader.request(45)  # Backwards.
+    _wait_until(lambda: all(pos in reader.ring for pos in range(37, 45)))
+    assert 46 not in reader.ring
+    reader.release()
+
+
+def test_scrub_reader_drops_stale_requests(intra_video):
+    reader = ScrubReader(intra_video, capacity=16)
+    gate = threading.Event()
+    decoded = []
+    decode = reader._decode
+
+    def blocking_decode(cap):
+        gate.wait()
+        decoded.append(int(cap.get(cv2.CAP_PROP_POS_FRAMES)))
+        return decode(cap)
+
+    reader._decode = blocking_decode
+    reader.request(5)
+    _wait_until(lambda: not reader._requested.is_set())
+    # Requested while the worker is busy with the 5th frame.
+    for pos in [20, 30, 40]:
+        reader.request(pos)
+    gate.set()
+    _wait_until(lambda: (reader.latest() or (None,))[0] == 40)
+    reader.release()
+    assert decoded[:2] == [5, 40]
+    assert (20 not in decoded) and (30 not in decoded)
+
+
+def test_scrub_reader_height(make_video):
+    reader = ScrubReader(make_video(size=(160, 120)), capacity=4, height=60)
+    assert reader.frame_size == (80, 60)
+    assert reader.read(0).shape == (60, 80, 3)
+    reader.release()
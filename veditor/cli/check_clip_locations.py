@@ -1,6 +1,7 @@
 # coding: utf-8
 import argparse
 import sys
+import time
 
 import cv2
 import numpy as np
@@ -8,6 +9,8 @@ import numpy as np
 from veditor.cli import cvui
 
 from ..__meta__ import __package_name__
+from ..utils.proxy_utils import get_proxy_manager
+from ..utils.video_utils import ScrubReader
 
 WINDOW_NAME = f"Check Clip Location {__package_name__}"
 
@@ -20,11 +23,44 @@ def check_clip_locations(argv=sys.argv[1:]):
     )
     parser.add_argument("video", type=str, help="Path to the input video file.")
     parser.add_argument("--UI-width", type=int, default=300)
+    parser.add_argument(
+        "--proxy-height",
+        type=int,
+        default=360,
+        help="Height of the low-resolution proxy which is decoded instead of the input video, and of the frames kept for scrubbing.",
+    )
+    parser.add_argument(
+        "--no-proxy", action="store_true", help="Decode the input video directly."
+    )
+    parser.add_argument(
+        "--scrub-cache",
+        type=int,
+        default=256,
+        help="The number of decoded frames to keep for scrubbing.",
+    )
+    parser.add_argument(
+        "--refresh-rate", type=float, default=60.0, help="Refresh rate of the UI."
+    )
     args = parser.parse_args(argv)
     cap = cv2.VideoCapture(args.video)
     count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
     width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
     height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    cap.release()
+    reader = ScrubReader(
+        path=(
+            args.video
+            if args.no_proxy
+            else get_proxy_manager(height=args.proxy_height).get(args.video)
+        ),
+        capacity=args.scrub_cache,
+        # Keep downscaled frames in the scrub cache even with ``--no-proxy``.
+        height=min(args.proxy_height, height),
+    )
+    # Clip locations are always in the coordinates of the input video.
+    # (The width of proxies is rounded, so each axis has its own scale.)
+    disp_width, disp_height = reader.frame_size
+    scale_x, scale_y = (disp_width / width, disp_height / height)
 
     ui_width = args.UI_width
 
@@ -35,15 +71,25 @@ def check_clip_locations(argv=sys.argv[1:]):
     posValue = [0]
 
     curt_pos = 0
-    bg = np.zeros(shape=(height, width + ui_width, 3), dtype=np.uint8)
+    frame = None
+    reader.request(curt_pos)
+    interval = 1 / args.refresh_rate
+    # Fill the background only once, and redraw only changed widgets / video pane.
+    bg = np.full(
+        shape=(max(disp_height, 560), disp_width + ui_width, 3),
+        fill_value=(49, 52, 49),
+        dtype=np.uint8,
+    )
+    pane = None
     cvui.init(WINDOW_NAME)
+    cvui.dirtyRegions(bgColor=0x313431)
     while True:
-        bg[:] = (49, 52, 49)
+        tick = time.perf_counter()
 
         # TrackBar for Video Positions
         cvui.trackbar(
             bg,
-            width + 20,
+            disp_width + 20,
             50,
             ui_width - 100,
             posValue,
@@ -59,30 +105,43 @@ def check_clip_locations(argv=sys.argv[1:]):
                 [topValue, leftValue, rightValue, bottomValue],
             )
         ):
-            cvui.counter(bg, width + 20, 200 + 80 * i, Value, 1)
-            cvui.text(bg, width + 20, 240 + 80 * i, f"Current {name} value: {Value[0]}")
+            cvui.counter(bg, disp_width + 20, 200 + 80 * i, Value, 1)
+            cvui.text(
+                bg, disp_width + 20, 240 + 80 * i, f"Current {name} value: {Value[0]}"
+            )
 
         cvui.update()
 
-        cap.set(cv2.CAP_PROP_POS_FRAMES, posValue[0])
-        ret, frame = cap.read()
+        # Request decoding only when the position changes, and draw the latest ready frame.
+        if posValue[0] != curt_pos:
+            curt_pos = posValue[0]
+            reader.request(curt_pos)
+        ready = reader.latest()
+        if ready is not None:
+            frame_pos, frame = ready
+        updated = False
         if frame is not None:
-            t = max(0, topValue[0])
-            l = max(0, leftValue[0])
-            r = min(width, rightValue[0])
-            b = min(height, bottomValue[0])
-
-            w = r - l
-            h = b - t
-            t_ = (height - h) // 2
-            l_ = (width - w) // 2
-            bg[t_ : t_ + h, l_ : l_ + w, :] = frame[t:b, l:r]
-
-        # Show everything on the screen
-        cv2.imshow(WINDOW_NAME, bg)
+            t = int(round(max(0, topValue[0]) * scale_y))
+            l = int(round(max(0, leftValue[0]) * scale_x))
+            r = min(int(round(min(width, rightValue[0]) * scale_x)), disp_width)
+            b = min(int(round(min(height, bottomValue[0]) * scale_y)), disp_height)
+            # Blit the video pane only when a new frame arrives or the crop changes.
+            if pane != (frame_pos, t, l, r, b):
+                pane = (frame_pos, t, l, r, b)
+                h, w = frame[t:b, l:r].shape[:2]
+                t_ = (disp_height - h) // 2
+                l_ = (disp_width - w) // 2
+                bg[:disp_height, :disp_width, :] = (49, 52, 49)
+                bg[t_ : t_ + h, l_ : l_ + w, :] = frame[t:b, l:r]
+                updated = True
+
+        # Show everything on the screen (only when something is redrawn.)
+        if cvui.redrawn() or updated:
+            cv2.imshow(WINDOW_NAME, bg)
 
         # Check if ESC key was pressed
-        if cv2.waitKey(20) == cvui.ESCAPE:
+        elapsed = time.perf_counter() - tick
+        if cv2.waitKey(max(1, int((interval - elapsed) * 1000))) == cvui.ESCAPE:
             break
     cv2.destroyWindow(WINDOW_NAME)
-    cap.release()
+    reader.release()
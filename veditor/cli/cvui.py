@@ -15,6 +15,7 @@ import cv2
 import numpy as np
 
 from ..utils._colorings import toRED
+from ..utils.cache_utils import LRUCache
 from ..utils.color_utils import choose_text_color, generate_color_series
 from ..utils.generic_utils import NoneType, handleTypeError, now_str
 
@@ -244,6 +245,48 @@ def imshow(windowName, frame):
     cv2.imshow(windowName, frame)
 
 
+def dirtyRegions(enabled=True, bgColor=0x313431):
+    """Enable (or disable) dirty-region redraw.
+
+    By default, cvui draws every component on each call, so the caller clears the whole frame (e.g. ``frame[:] = (49, 52, 49)``) every tick. When dirty-region redraw is enabled, ``cvui.text()``, ``cvui.printf()``, ``cvui.button()``, ``cvui.counter()`` and ``cvui.trackbar()`` remember their state (content, value and interaction with the mouse cursor), and redraw only when it has changed since the previous call. Before redrawing, the previous and the new rectangles of the component are filled with ``bgColor``, so the caller must fill the frame only once and must not clear it every tick.
+
+    Args:
+            enabled (bool) : Whether to enable dirty-region redraw or not.
+            bgColor (uint) : Background color of the frame in the format ``0xRRGGBB``.
+
+    Examples:
+            >>> import cv2
+            >>> import numpy as np
+            >>> from vedirot.cli import cvui
+            ...
+            >>> WINDOW_NAME	= "Dirty Regions"
+            >>> frame = np.full(shape=(100, 200, 3), fill_value=(49, 52, 49), dtype=np.uint8)
+            >>> value = [0]
+            >>> cvui.init(WINDOW_NAME)
+            >>> cvui.dirtyRegions(bgColor=0x313431)
+            ...
+            >>> while (True):
+            ... 	cvui.counter(frame, 10, 10, value)
+            ... 	cvui.update()
+            ... 	if cvui.redrawn():
+            ... 		cv2.imshow(WINDOW_NAME, frame)
+            ... 	if cv2.waitKey(20) == cvui.ESCAPE:
+            ... 		break
+            >>> cv2.destroyWindow(WINDOW_NAME)
+    """
+    __internal.dirtyRegions = enabled
+    __internal.bgColor = bgColor
+    __internal.componentStates = {}
+    __internal.anyRedrawn = True
+
+
+def redrawn():
+    """Return whether any component has been redrawn since the previous call, i.e. whether the frame needs to be shown again. (Always ``True`` unless dirty-region redraw is enabled by ``cvui.dirtyRegions()``.)"""
+    ret = __internal.anyRedrawn or (not __internal.dirtyRegions)
+    __internal.anyRedrawn = False
+    return ret
+
+
 def lastKeyPressed():
     """Return the last key that was pressed. This function will only work if a value greater than zero was passed to ``cvui.init()`` as the delay waitkey parameter."""
     return __internal.lastKeyPressed
@@ -431,6 +474,7 @@ def text(
         thickness,
         lineType,
         updateLayout=True,
+        dirtyCheck=True,
     )
 
 
@@ -503,6 +547,7 @@ def printf(
         thickness,
         lineType,
         updateLayout=True,
+        dirtyCheck=True,
     )
 
 
@@ -1773,6 +1818,10 @@ class Internal:
             screen (Block)            : Block structure.
             stack (list)              : Block stack.
             trackbarMarginX (int)     : X-axis Margin of trackbar.
+            dirtyRegions (bool)       : Whether components are redrawn only when their state has changed. (See ``cvui.dirtyRegions()``)
+            bgColor (uint)            : Background color used to erase components in dirty-region redraw.
+            componentStates (dict)    : The last state and rectangle of each component, indexed by ``(id(where), kind, x, y)``.
+            anyRedrawn (bool)         : Whether any component has been redrawn since the last call of ``cvui.redrawn()``.
             _render (Render)          : contains all rendering methods. ( ``_render._internal = self`` )
     """
 
@@ -1788,6 +1837,11 @@ class Internal:
         self.stack = []
         self.trackbarMarginX = 14
 
+        self.dirtyRegions = False
+        self.bgColor = 0x313431
+        self.componentStates = {}
+        self.anyRedrawn = True
+
         self._render = Render()
         self._render._internal = self
 
@@ -2002,6 +2056,36 @@ class Internal:
             )
         return self.stack.pop()
 
+    def isDirty(self, block, kind, rect, state):
+        """Check whether a component has to be redrawn in dirty-region redraw, and if so, erase its previous and new rectangles.
+
+        Args:
+                block (Block) : A block structure.
+                kind (str)    : Kind of the component.
+                rect (Rect)   : The area of the component.
+                state (tuple) : Everything which affects the appearance of the component.
+
+        Returns:
+                bool : Whether the component has to be (re)drawn.
+        """
+        if not self.dirtyRegions:
+            return True
+        key = (id(block.where), kind, int(rect.x), int(rect.y))
+        previous = self.componentStates.get(key)
+        if (previous is not None) and (previous[0] == state):
+            return False
+        # Antialiased outlines are drawn over the end points (and a pixel beyond them.)
+        aRect = Rect(
+            int(rect.x) - 2, int(rect.y) - 2, int(rect.width) + 4, int(rect.height) + 4
+        )
+        aColor = self.hex2bgr(self.bgColor)[:3]
+        for r in ([previous[1]] if previous is not None else []) + [aRect]:
+            y, x = (max(r.y, 0), max(r.x, 0))
+            block.where[y : r.y + r.height, x : r.x + r.width] = aColor
+        self.componentStates[key] = (state, aRect)
+        self.anyRedrawn = True
+        return True
+
     def createLabel(self, label):
         """Create a Label object.
 
@@ -2037,6 +2121,7 @@ class Internal:
         thickness=1,
         lineType=cv2.LINE_8,
         updateLayout=True,
+        dirtyCheck=False,
     ):
         """Display a piece of text.
 
@@ -2051,24 +2136,31 @@ class Internal:
                 thickness (int)     : Thickness of the lines used to draw a text.
                 lineType (int)      : Line type. (default= ``cv2.LINE_8`` )
                 updateLayout (bool) : Whether updates layot or not.
+                dirtyCheck (bool)   : Whether to skip drawing when nothing has changed in dirty-region redraw.
         """
-        (text_width, text_height), _ = cv2.getTextSize(
+        (text_width, text_height), baseline = self._render.getTextSize(
             text=text, fontFace=fontFace, fontScale=fontScale, thickness=thickness
         )
 
         text_size = Size(text_width, text_height)
         aPos = Point(x, y + text_size.height)
 
-        self._render.text(
+        if (not dirtyCheck) or self.isDirty(
             block,
-            text,
-            aPos,
-            fontFace=fontFace,
-            fontScale=fontScale,
-            color=color,
-            thickness=thickness,
-            lineType=lineType,
-        )
+            "text",
+            Rect(x, y, text_width + thickness, text_height + baseline + thickness),
+            (text, fontFace, fontScale, color, thickness, lineType),
+        ):
+            self._render.text(
+                block,
+                text,
+                aPos,
+                fontFace=fontFace,
+                fontScale=fontScale,
+                color=color,
+                thickness=thickness,
+                lineType=lineType,
+            )
 
         if updateLayout:
             # Add an extra pixel to the height to overcome OpenCV font size problems.
@@ -2090,6 +2182,17 @@ class Internal:
                 value (number) : Number that corresponds to the current value of the counter.
         """
         aContentArea = Rect(x + 22, y, 48, 22)
+        aDirty = self.isDirty(
+            block,
+            "counter",
+            Rect(x, y, 22 * 2 + aContentArea.width, aContentArea.height),
+            (
+                value[0],
+                fmt,
+                self.iarea(x, y, 22, 22),
+                self.iarea(aContentArea.x + aContentArea.width, y, 22, 22),
+            ),
+        )
 
         if self.buttonWH(
             block=block,
@@ -2100,11 +2203,13 @@ class Internal:
             label="-",
             color=(209, 198, 138),
             updateLayout=False,
+            render=aDirty,
         ):
             value[0] -= step
 
         aText = fmt % value[0]
-        self._render.counter(block, aContentArea, aText)
+        if aDirty:
+            self._render.counter(block, aContentArea, aText)
 
         if self.buttonWH(
             block=block,
@@ -2115,6 +2220,7 @@ class Internal:
             label="+",
             color=(185, 182, 255),
             updateLayout=False,
+            render=aDirty,
         ):
             value[0] += step
 
@@ -2127,7 +2233,7 @@ class Internal:
     def checkbox(self, block, x, y, label, state, color):
         mouse = self.getContext().mouse
         aRect = Rect(x, y, 15, 15)
-        (text_width, text_height), _ = cv2.getTextSize(
+        (text_width, text_height), _ = self._render.getTextSize(
             label, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1
         )
         text_size = Rect(0, 0, text_width, text_height)
@@ -2170,7 +2276,7 @@ class Internal:
         width = 0
         for i, label in enumerate(labels):
             aRect = Rect(x, y + i * 20, 15, 15)
-            (text_width, text_height), _ = cv2.getTextSize(
+            (text_width, text_height), _ = self._render.getTextSize(
                 label, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1
             )
             text_size = Rect(0, 0, text_width, text_height)
@@ -2239,9 +2345,28 @@ class Internal:
         aValue = value[0]
 
         state = OVER if mouseIsOver else OUT, aContentArea
-        self._render.trackbar(
-            block=block, state=state, shape=aContentArea, value=value[0], params=params
-        )
+        if self.isDirty(
+            block,
+            "trackbar",
+            Rect(x, y, width, aContentArea.height + 3),
+            (
+                value[0],
+                mouseIsOver,
+                params.min,
+                params.max,
+                params.step,
+                params.segments,
+                params.labelfmt,
+                params.options,
+            ),
+        ):
+            self._render.trackbar(
+                block=block,
+                state=state,
+                shape=aContentArea,
+                value=value[0],
+                params=params,
+            )
 
         if mouse.anyButton.pressed and mouseIsOver:
             value[0] = self.trackbarXPixelToValue(
@@ -2395,7 +2520,16 @@ class Internal:
         return ret
 
     def buttonWH(
-        self, block, x, y, width, height, label, color=(50, 50, 50), updateLayout=True
+        self,
+        block,
+        x,
+        y,
+        width,
+        height,
+        label,
+        color=(50, 50, 50),
+        updateLayout=True,
+        render=None,
     ):
         """Create a bottun using ``width`` and ``height`` .
 
@@ -2408,12 +2542,13 @@ class Internal:
                 label (str)         : Text displayed inside the button.
                 color (tuple)       : Button color.
                 updateLayout (bool) : Whether updates layot or not.
+                render (bool)       : Whether to draw the button. If ``None``, draw it when it is dirty. (See ``cvui.dirtyRegions()``)
 
         Returns:
                 bool: Whether the button was clicked or not.
         """
         # Calculate the space that the label will fill
-        (text_width, text_height), _ = cv2.getTextSize(
+        (text_width, text_height), _ = self._render.getTextSize(
             label, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1
         )
         text_size = Rect(0, 0, text_width, text_height)
@@ -2424,15 +2559,18 @@ class Internal:
         # Render the button according to mouse interaction, e.g. OVER, DOWN, OUT.
         aStatus = self.iarea(x, y, aRect.width, aRect.height)
         button_bgr = self.hex2bgr(color)
-        self._render.button(block, aStatus, aRect, label, color=button_bgr)
-        self._render.buttonLabel(
-            block,
-            aStatus,
-            aRect,
-            label,
-            text_size,
-            color=choose_text_color(color=button_bgr, max_val=255, is_bgr=True),
-        )
+        if render is None:
+            render = self.isDirty(block, "button", aRect, (label, button_bgr, aStatus))
+        if render:
+            self._render.button(block, aStatus, aRect, label, color=button_bgr)
+            self._render.buttonLabel(
+                block,
+                aStatus,
+                aRect,
+                label,
+                text_size,
+                color=choose_text_color(color=button_bgr, max_val=255, is_bgr=True),
+            )
 
         # Update the layout flow according to button size
         # if we were told to update.
@@ -2465,7 +2603,7 @@ class Internal:
                 bool: Whether the button was clicked or not.
         """
         # Calculate the space that the label will fill
-        (text_width, text_height), _ = cv2.getTextSize(
+        (text_width, text_height), _ = self._render.getTextSize(
             label, cv2.FONT_HERSHEY_SIMPLEX, 0.4, 1
         )
         text_size = Rect(0, 0, text_width, text_height)
@@ -2762,9 +2900,139 @@ class Internal:
 
 
 class Render:
-    """Class that contains all rendering methods."""
+    """Class that contains all rendering methods.
+
+    Attributes:
+            textSizes (LRUCache) : Cached results of ``cv2.getTextSize``, indexed by ``(text, fontFace, fontScale, thickness)``.
+            labels (LRUCache)    : Cached label sprites, indexed by ``(text, fontFace, fontScale, color, thickness, lineType)``. (See ``Render.labelSprite()``)
+    """
 
     _internal = None
+    textSizes = LRUCache(maxsize=1024)
+    labels = LRUCache(maxsize=512)
+
+    def getTextSize(self, text, fontFace, fontScale, thickness):
+        """Same as ``cv2.getTextSize``, but the results are cached because labels rarely change between frames."""
+        key = (text, fontFace, fontScale, thickness)
+        if key not in self.textSizes:
+            self.textSizes[key] = cv2.getTextSize(
+                text=text, fontFace=fontFace, fontScale=fontScale, thickness=thickness
+            )
+        return self.textSizes[key]
+
+    def labelSprite(self, text, fontFace, fontScale, color, thickness, lineType):
+        """Rasterize a label once, and return it as a sprite which can be blended into any background.
+
+        Args:
+                text (str)        : Text of the label.
+                fontFace (int)    : Font type.
+                fontScale (float) : Font scale factor.
+                color (tuple)     : BGR color of the label.
+                thickness (int)   : Thickness of the lines used to draw the text.
+                lineType (int)    : Line type.
+
+        Returns:
+                tuple : ``(dx, dy, premultiplied, inverseAlpha)`` (See ``Render.layer()``), where ``(dx, dy)`` is the offset from the origin of the text (bottom-left corner).
+        """
+        (text_width, text_height), baseline = self.getTextSize(
+            text, fontFace, fontScale, thickness
+        )
+        # Leave room for the stroke (and antialiasing) around the glyphs.
+        aPad = thickness + 2
+        dx, dy, aPremultiplied, aInverseAlpha = self.layer(
+            key=("label", text, fontFace, fontScale, color, thickness, lineType),
+            width=text_width + 2 * aPad,
+            height=text_height + baseline + 2 * aPad,
+            draw=lambda aBlock: cv2.putText(
+                aBlock.where,
+                text,
+                (aPad, aPad + text_height),
+                fontFace,
+                fontScale,
+                color,
+                thickness,
+                lineType,
+            ),
+        )
+        return (dx - aPad, dy - aPad - text_height, aPremultiplied, aInverseAlpha)
+
+    def putLabel(
+        self,
+        where,
+        text,
+        org,
+        fontFace=cv2.FONT_HERSHEY_SIMPLEX,
+        fontScale=0.4,
+        color=(0xCE, 0xCE, 0xCE),
+        thickness=1,
+        lineType=cv2.LINE_8,
+    ):
+        """Same as ``cv2.putText``, but the label is blitted from a cached sprite. (See ``Render.labelSprite()``)"""
+        color = self._internal.hex2bgr(color)
+        if (where.ndim != 3) or (where.shape[2] != 3) or (where.dtype != np.uint8):
+            cv2.putText(
+                where, text, org, fontFace, fontScale, color, thickness, lineType
+            )
+            return
+        dx, dy, aPremultiplied, aInverseAlpha = self.labelSprite(
+            text, fontFace, fontScale, tuple(color[:3]), thickness, lineType
+        )
+        self.blend(
+            where, int(org[0]) + dx, int(org[1]) + dy, aPremultiplied, aInverseAlpha
+        )
+
+    def layer(self, key, width, height, draw):
+        """Draw something once onto a transparent layer, and cache it as a sprite.
+
+        The layer is drawn twice, onto black and white canvases, so that the coverage (alpha) and the color of every pixel can be recovered without knowing how it was drawn. The sprite is cropped to the drawn pixels.
+
+        Args:
+                key (tuple)     : Cache key, which must contain everything which affects the appearance of the layer.
+                width (int)     : Width of the layer.
+                height (int)    : Height of the layer.
+                draw (function) : Function which receives a ``Block`` whose ``where`` is the canvas to draw the layer.
+
+        Returns:
+                tuple : ``(dx, dy, premultiplied, inverseAlpha)``, where ``(dx, dy)`` is the offset of the sprite in the layer, ``premultiplied`` is the color multiplied by the coverage, and ``inverseAlpha`` is ``255 - coverage`` (per channel.)
+        """
+        if key not in self.labels:
+            aCanvases = []
+            for aValue in [0, 255]:
+                aBlock = Block()
+                aBlock.where = np.full(
+                    shape=(height, width, 3), fill_value=aValue, dtype=np.uint8
+                )
+                draw(aBlock)
+                aCanvases.append(aBlock.where)
+            aBlack, aWhite = aCanvases
+            aInverseAlpha = aWhite - aBlack
+            ys, xs = np.nonzero((aInverseAlpha < 255).any(axis=2))
+            if len(ys) == 0:
+                ys, xs = (np.zeros(1, dtype=int), np.zeros(1, dtype=int))
+            aSlice = (slice(ys.min(), ys.max() + 1), slice(xs.min(), xs.max() + 1))
+            self.labels[key] = (
+                int(xs.min()),
+                int(ys.min()),
+                np.ascontiguousarray(aBlack[aSlice]),
+                np.ascontiguousarray(aInverseAlpha[aSlice]),
+            )
+        return self.labels[key]
+
+    def blend(self, where, x, y, premultiplied, inverseAlpha):
+        """Blend a sprite into ``where`` at ``(x, y)``. (See ``Render.layer()``)"""
+        h, w = inverseAlpha.shape[:2]
+        # Clip the sprite to the canvas.
+        x0, y0 = (max(x, 0), max(y, 0))
+        x1, y1 = (min(x + w, where.shape[1]), min(y + h, where.shape[0]))
+        if (x0 >= x1) or (y0 >= y1):
+            return
+        aRoi = where[y0:y1, x0:x1]
+        aSlice = (slice(y0 - y, y1 - y), slice(x0 - x, x1 - x))
+        cv2.add(
+            cv2.multiply(aRoi, inverseAlpha[aSlice], scale=1 / 255),
+            premultiplied[aSlice],
+            dst=aRoi,
+        )
 
     def rectangle(self, where, shape, color, thickness=1, LineType=CVUI_ANTIALISED):
         aStartPoint = (int(shape.x), int(shape.y))
@@ -2784,8 +3052,8 @@ class Render:
         lineType=cv2.LINE_8,
     ):
         aPosition = (int(position.x), int(position.y))
-        cv2.putText(
-            img=block.where,
+        self.putLabel(
+            where=block.where,
             text=text,
             org=aPosition,
             fontFace=fontFace,
@@ -2809,7 +3077,7 @@ class Render:
         self.rectangle(block.where, shape, (0x29, 0x29, 0x29), CVUI_FILLED)  # fill
         self.rectangle(block.where, shape, (0x45, 0x45, 0x45))  # border
 
-        (text_width, text_height), _ = cv2.getTextSize(
+        (text_width, text_height), _ = self.getTextSize(
             text=value, fontFace=fontFace, fontScale=fontScale, thickness=thickness
         )
         text_size = Rect(0, 0, text_width, text_height)
@@ -2818,7 +3086,7 @@ class Render:
             shape.x + shape.width / 2 - text_size.width / 2,
             shape.y + text_size.height / 2 + shape.height / 2,
         )
-        cv2.putText(
+        self.putLabel(
             block.where,
             value,
             (int(aPos.x), int(aPos.y)),
@@ -2869,7 +3137,7 @@ class Render:
         if text != "":
             afontScale = 0.39 if state == DOWN else 0.4
             aPosition = (int(position.x), int(position.y))
-            cv2.putText(
+            self.putLabel(
                 block.where,
                 text,
                 aPosition,
@@ -2879,7 +3147,7 @@ class Render:
                 1,
                 CVUI_ANTIALISED,
             )
-            (text_width, _), _ = cv2.getTextSize(
+            (text_width, _), _ = self.getTextSize(
                 text, cv2.FONT_HERSHEY_SIMPLEX, afontScale, 1
             )
         return text_width
@@ -2887,12 +3155,12 @@ class Render:
     def putTextCentered(self, block, position, text):
         afontScale = 0.3
 
-        (text_width, text_height), _ = cv2.getTextSize(
+        (text_width, text_height), _ = self.getTextSize(
             text, cv2.FONT_HERSHEY_SIMPLEX, afontScale, 1
         )
         text_size = Rect(0, 0, text_width, text_height)
         aPositionDecentered = Point(position.x - text_size.width / 2, position.y)
-        cv2.putText(
+        self.putLabel(
             block.where,
             text,
             (int(aPositionDecentered.x), int(aPositionDecentered.y)),
@@ -3066,11 +3334,47 @@ class Render:
             self._internal.bitsetHas(params.options, TRACKBAR_HIDE_STEP_SCALE) == False
         )
 
-        if aShowSteps and aHideAllLabels == False:
-            self.trackbarSteps(block, state, shape, value, params, aWorkingArea)
-
         if aHideAllLabels == False:
-            self.trackbarSegments(block, state, shape, value, params, aWorkingArea)
+            # The scale (steps, segments and their labels) does not depend on the value,
+            # so it is drawn once and blitted from the cache.
+            aPad = 40
+            aShape = Rect(aPad, 0, shape.width, shape.height)
+            aArea = Rect(
+                aWorkingArea.x - shape.x + aPad,
+                aWorkingArea.y - shape.y,
+                aWorkingArea.width,
+                aWorkingArea.height,
+            )
+
+            def drawScale(aBlock):
+                if aShowSteps:
+                    self.trackbarSteps(aBlock, state, aShape, value, params, aArea)
+                self.trackbarSegments(aBlock, state, aShape, value, params, aArea)
+
+            dx, dy, aPremultiplied, aInverseAlpha = self.layer(
+                key=(
+                    "trackbarScale",
+                    aShape.width,
+                    aShape.height,
+                    params.min,
+                    params.max,
+                    params.step,
+                    params.segments,
+                    params.labelfmt,
+                    params.options,
+                    self._internal.trackbarMarginX,
+                ),
+                width=shape.width + 2 * aPad,
+                height=shape.height,
+                draw=drawScale,
+            )
+            self.blend(
+                block.where,
+                shape.x - aPad + dx,
+                shape.y + dy,
+                aPremultiplied,
+                aInverseAlpha,
+            )
 
         self.trackbarHandle(block, state, shape, value, params, aWorkingArea)
 
@@ -3128,7 +3432,7 @@ class Render:
 
         # Render title text.
         aPos = Point(titleBar.x + 5, titleBar.y + 12)
-        cv2.putText(
+        self.putLabel(
             block.where,
             title,
             (int(aPos.x), int(aPos.y)),
@@ -0,0 +1,93 @@
+# coding: utf-8
+import argparse
+import json
+import os
+import re
+import sys
+from multiprocessing import Pool
+
+from tqdm import tqdm
+
+from ..utils.video_utils import VIDEO_EXTENSIONS, detect_clip_locations
+
+
+def _detect(kwargs):
+    try:
+        return detect_clip_locations(**kwargs)
+    except Exception as e:
+        # Drop ANSI colors from the message, as it is written into JSON.
+        msg = re.sub(r"\x1b\[[0-9;]*m", "", str(e))
+        return dict(path=kwargs["path"], error=f"{e.__class__.__name__}: {msg}")
+
+
+def detect_clip_locations_cli(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        prog="detect-clip-locations",
+        description="Find out where to clip the videos automatically (without UI.)",
+        add_help=True,
+    )
+    parser.add_argument(
+        "paths",
+        type=str,
+        nargs="+",
+        help="Paths to the input video files, or directories which contain them.",
+    )
+    parser.add_argument(
+        "--samples",
+        type=int,
+        default=16,
+        help="The number of (key)frames to sample from each video.",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=8.0,
+        help="The maximum standard deviation of rows / columns in the borders.",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=os.cpu_count(),
+        help="The number of worker processes.",
+    )
+    parser.add_argument(
+        "-O", "--output", type=str, default=None, help="Path to the output JSON file."
+    )
+    parser.add_argument("--quiet", action="store_true", help="Hide the progress bar.")
+    args = parser.parse_args(argv)
+
+    paths = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            for root, _, fns in sorted(os.walk(path)):
+                paths.extend(
+                    os.path.join(root, fn)
+                    for fn in sorted(fns)
+                    if os.path.splitext(fn)[1].lower() in VIDEO_EXTENSIONS
+                )
+        else:
+            paths.append(path)
+    tasks = [
+        dict(path=path, samples=args.samples, threshold=args.threshold)
+        for path in paths
+    ]
+
+    # Each video is decoded independently, so they are processed in parallel.
+    with Pool(processes=max(1, min(args.jobs, len(tasks)))) as pool:
+        results = list(
+            tqdm(
+                pool.imap(_detect, tasks),
+                total=len(tasks),
+                desc="detect-clip-locations",
+                disable=args.quiet,
+            )
+        )
+
+    if args.output is None:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+    else:
+        with open(args.output, mode="w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    if any("error" in result for result in results):
+        sys.exit(1)
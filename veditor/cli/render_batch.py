@@ -0,0 +1,278 @@
+# coding: utf-8
+import argparse
+import json
+import multiprocessing as mp
+import os
+import re
+import sys
+import time
+import traceback
+from multiprocessing.connection import Connection, wait
+from typing import Any, Dict, List, Optional
+
+from ..scene import Scene, load_document
+from ..utils._colorings import toBLUE, toGREEN, toRED
+from ..utils._loggers import get_logger
+
+logger = get_logger(name=__name__)
+
+
+def load_manifest(path: str) -> List[Dict[str, Any]]:
+    """Load jobs from a manifest file (``.json``, ``.yaml`` / ``.yml`` or ``.msgpack``. See :func:`load_document <veditor.scene.load_document>`)
+
+    A manifest is a list of jobs, or a dictionary with ``"jobs"`` (and ``"defaults"`` which are merged into each job.) Each job has
+
+    - ``"id"`` (optional): Identifier of the job. Defaults to its index.
+    - ``"scene"`` : A :class:`Scene <veditor.scene.Scene>`, or the path to a scene file. (Instead, ``"editor"`` and ``"elements"`` of a scene can be given in the job.)
+    - ``"export"`` : Keyword arguments of :meth:`export <veditor.editor.VEditor.export>`.
+
+    Args:
+        path (str) : Path to the manifest file.
+
+    Returns:
+        List[Dict[str, Any]]: Jobs.
+    """
+    manifest = load_document(path)
+    if isinstance(manifest, list):
+        manifest = dict(jobs=manifest)
+    defaults = manifest.get("defaults", {})
+    jobs = []
+    for i, job in enumerate(manifest["jobs"]):
+        job = {**defaults, **job}
+        for name in ["editor", "export"]:
+            job[name] = {**defaults.get(name, {}), **job.get(name, {})}
+        job.setdefault("id", str(i))
+        jobs.append(job)
+    return jobs
+
+
+def job2scene(job: Dict[str, Any]) -> Scene:
+    """Create the :class:`Scene <veditor.scene.Scene>` of a job in a manifest. (See :func:`load_manifest <veditor.cli.render_batch.load_manifest>`)"""
+    scene = job.get("scene")
+    if isinstance(scene, str):
+        return Scene.load(scene)
+    if isinstance(scene, dict):
+        return Scene.from_dict(scene)
+    return Scene(editor=job.get("editor"), elements=job.get("elements"))
+
+
+def run_job(job: Dict[str, Any]) -> str:
+    """Render a job in a manifest, and return the path to the output video."""
+    editor = job2scene(job).build(validate=False)
+    return editor.export(**{"open": False, **job.get("export", {})})
+
+
+def _worker(inbox: mp.Queue, outbox: Connection) -> None:
+    """Render jobs one by one in a long-lived process, so in-process caches (fonts, glyph atlases, sprites, proxy managers) are shared by its jobs.
+
+    Results are sent through a pipe owned by this worker (not a queue shared by all workers), so killing this worker in the middle of sending cannot corrupt the results of the others.
+    """
+    while True:
+        task = inbox.get()
+        if task is None:
+            break
+        idx, job = task
+        start = time.time()
+        try:
+            out_path = run_job(job)
+            outbox.send((idx, "succeeded", out_path, None, time.time() - start))
+        except Exception:
+            outbox.send(
+                (idx, "failed", None, traceback.format_exc(), time.time() - start)
+            )
+
+
+def default_workers(job_memory: int = 2 * (1 << 30)) -> int:
+    """The number of workers which fits both CPU cores and available memory.
+
+    Args:
+        job_memory (int, optional) : Expected peak memory of one job in bytes. Defaults to ``2 * (1 << 30)``. (2GB)
+
+    Returns:
+        int: The number of workers.
+    """
+    workers = os.cpu_count() or 1
+    try:
+        available = os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+        workers = min(workers, available // job_memory)
+    except (ValueError, OSError, AttributeError):
+        pass  # Not available on this platform.
+    return max(1, int(workers))
+
+
+def run_jobs(
+    jobs: List[Dict[str, Any]],
+    workers: int = 1,
+    retries: int = 0,
+    timeout: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Render ``jobs`` over a pool of worker processes.
+
+    Each worker process renders one job at a time. When a job exceeds ``timeout``, its worker is killed and replaced. Failed (or timed out) jobs are retried up to ``retries`` times.
+
+    Args:
+        jobs (List[Dict[str, Any]])       : Jobs. (See :func:`load_manifest <veditor.cli.render_batch.load_manifest>`)
+        workers (int, optional)           : The number of worker processes. Defaults to ``1``.
+        retries (int, optional)           : The maximum number of retries of each job. Defaults to ``0``.
+        timeout (Optional[float], optional) : Timeout of each attempt in seconds. Defaults to ``None``.
+
+    Returns:
+        List[Dict[str, Any]]: Results of jobs in order, with ``id``, ``status`` (``"succeeded"``, ``"failed"``, ``"timeout"`` or ``"invalid"``), ``out_path``, ``attempts``, ``elapsed``, ``error`` and ``scene_hash``.
+    """
+    results = [
+        dict(
+            id=job["id"],
+            status=None,
+            out_path=None,
+            attempts=0,
+            elapsed=0.0,
+            error=None,
+            scene_hash=None,
+        )
+        for job in jobs
+    ]
+    # Validate all scenes before rendering (without opening any asset), so that
+    # broken jobs fail fast without occupying workers.
+    pending = []
+    for idx, job in enumerate(jobs):
+        try:
+            results[idx]["scene_hash"] = job2scene(job).validate().hash()
+            pending.append(idx)
+        except Exception as e:
+            # Malformed jobs raise any kind of errors (e.g. ``AttributeError`` or ``TypeError``)
+            # while building their scenes. Drop ANSI colors from the message, as it is written into JSON.
+            msg = re.sub(r"\x1b\[[0-9;]*m", "", f"{e.__class__.__name__}: {e}")
+            results[idx].update(status="invalid", error=msg)
+            logger.info(f"The job {toBLUE(job['id'])} is {toRED('invalid')}.")
+
+    def spawn() -> list:
+        """Start a worker as [process, inbox, (idx, started) of the current job or None, outbox]."""
+        inbox = mp.Queue()
+        outbox, sender = mp.Pipe(duplex=False)
+        process = mp.Process(target=_worker, args=(inbox, sender), daemon=True)
+        process.start()
+        sender.close()  # Only the worker sends, so ``recv`` fails once it exits.
+        return [process, inbox, None, outbox]
+
+    def replace(i: int) -> None:
+        """Discard the ``i``-th worker (with its pipe, which may be broken) and start a new one."""
+        pool[i][0].kill()
+        pool[i][3].close()
+        pool[i] = spawn()
+
+    def finish(
+        idx: int,
+        status: str,
+        out_path: Optional[str],
+        error: Optional[str],
+        elapsed: float,
+    ):
+        result = results[idx]
+        result.update(status=status, out_path=out_path, error=error)
+        result["elapsed"] += elapsed
+        if (status != "succeeded") and (result["attempts"] <= retries):
+            logger.info(f"Retrying the job {toBLUE(result['id'])} ({status})")
+            pending.append(idx)
+        else:
+            color = toGREEN if status == "succeeded" else toRED
+            logger.info(f"The job {toBLUE(result['id'])} {color(status)}.")
+
+    pool = [spawn() for _ in range(max(1, min(workers, len(jobs))))]
+    while (len(pending) > 0) or any(worker[2] is not None for worker in pool):
+        for worker in pool:
+            if (worker[2] is None) and (len(pending) > 0):
+                idx = pending.pop(0)
+                results[idx]["attempts"] += 1
+                worker[1].put((idx, jobs[idx]))
+                worker[2] = (idx, time.time())
+        busy = [worker for worker in pool if worker[2] is not None]
+        ready = wait([worker[3] for worker in busy], timeout=0.5)
+        for worker in busy:
+            if worker[3] in ready:
+                try:
+                    idx, status, out_path, error, elapsed = worker[3].recv()
+                except EOFError:
+                    continue  # The worker exited (handled below.)
+                worker[2] = None
+                finish(idx, status, out_path, error, elapsed)
+        for i, worker in enumerate(pool):
+            if worker[2] is None:
+                continue
+            idx, started = worker[2]
+            elapsed = time.time() - started
+            if (timeout is not None) and (elapsed > timeout):
+                replace(i)
+                finish(idx, "timeout", None, f"Timed out after {timeout}[s]", elapsed)
+            elif not worker[0].is_alive():
+                replace(i)
+                finish(idx, "failed", None, f"Exit code {worker[0].exitcode}", elapsed)
+    for worker in pool:
+        worker[1].put(None)
+    for worker in pool:
+        worker[0].join()
+        worker[3].close()
+    return results
+
+
+def render_batch(argv=sys.argv[1:]):
+    parser = argparse.ArgumentParser(
+        prog="render-batch",
+        description="Render many videos from a manifest of jobs with a pool of workers.",
+        add_help=True,
+    )
+    parser.add_argument(
+        "manifest", type=str, help="Path to the manifest (.json / .yaml)"
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="The number of worker processes. Defaults to the number which fits CPU cores and available memory.",
+    )
+    parser.add_argument(
+        "--job-memory",
+        type=float,
+        default=2.0,
+        help="Expected peak memory of one job in GB (used to size the pool.)",
+    )
+    parser.add_argument(
+        "--retries", type=int, default=0, help="Retries of each failed job."
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=None, help="Timeout of each job in seconds."
+    )
+    parser.add_argument(
+        "-O",
+        "--summary",
+        type=str,
+        default=None,
+        help="Path to the results summary (.json). Defaults to ``<manifest>.results.json``.",
+    )
+    args = parser.parse_args(argv)
+
+    jobs = load_manifest(args.manifest)
+    workers = args.jobs or default_workers(job_memory=int(args.job_memory * (1 << 30)))
+    logger.info(f"Rendering {toGREEN(len(jobs))} jobs with {toGREEN(workers)} workers.")
+    start = time.time()
+    results = run_jobs(
+        jobs=jobs, workers=workers, retries=args.retries, timeout=args.timeout
+    )
+    summary = dict(
+        manifest=args.manifest,
+        elapsed=time.time() - start,
+        workers=workers,
+        counts={
+            status: sum(result["status"] == status for result in results)
+            for status in ["succeeded", "failed", "timeout", "invalid"]
+        },
+        results=results,
+    )
+    summary_path = args.summary or os.path.splitext(args.manifest)[0] + ".results.json"
+    with open(summary_path, mode="w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+    logger.info(
+        f"{toGREEN(summary['counts']['succeeded'])} / {toGREEN(len(jobs))} jobs succeeded. The summary is saved at {toBLUE(summary_path)}"
+    )
+    if summary["counts"]["succeeded"] < len(jobs):
+        sys.exit(1)
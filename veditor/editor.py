@@ -1,6 +1,10 @@
 # coding: utf-8
+import copy
+import math
 import os
-from typing import List, Optional, Tuple, Union
+import shutil
+import tempfile
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 
 import cv2
 import numpy as np
@@ -8,25 +12,59 @@ import numpy.typing as npt
 from PIL import Image
 from tqdm import tqdm
 
-from .elements import BaseElement
+from .elements import BaseElement, LayoutGraph
 from .utils._colorings import toBLUE, toGREEN
 from .utils._loggers import get_logger
 from .utils.audio_utils import synthesize_audio
+from .utils.cache_utils import RenderCache
+from .utils.generic_utils import file_fingerprint, handleKeyError, now_str, openf
 from .utils.image_utils import arr2pil, pil2arr
-from .utils.video_utils import capture2writor
+from .utils.media_utils import probe_media
+from .utils.proxy_utils import ProxyManager, get_proxy_manager
+from .utils.timing_utils import retime_schedule
+from .utils.video_utils import (
+    PREVIEW_CODEC,
+    SMART_CUT_ENCODERS,
+    FFmpegVideoReader,
+    FFmpegVideoWriter,
+    concat_videos,
+    copy_video_range,
+    createVideoWritor,
+    probe_keyframes,
+    probe_video_stream,
+    vcodec2ext,
+)
 
 
 class VEditor(BaseElement):
+    _TRANSIENT: Set[str] = {"proxy_path", "decode_path"}
+
     def __init__(
         self,
         elements: List[BaseElement] = [],
         width: Optional[int] = None,
         height: Optional[int] = None,
         bgRGB: Optional[Tuple[int, int, int]] = (0, 0, 0),
+        video_path: Optional[str] = None,
+        fps: float = 30.0,
+        crop: Optional[Dict[str, int]] = None,
     ):
-        self.elements = elements
+        """Editor which renders all ``elements`` (on the base video at ``video_path``.)
+
+        Args:
+            elements (List[BaseElement], optional)                 : Elements to render. Defaults to ``[]``.
+            width (Optional[int], optional)                        : The editor width. Defaults to ``None``. (Width of the bounding box of ``elements``.)
+            height (Optional[int], optional)                       : The editor height. Defaults to ``None``. (Height of the bounding box of ``elements``.)
+            bgRGB (Optional[Tuple[int, int, int]], optional)       : Background color of the editor. Defaults to ``(0, 0, 0)``.
+            video_path (Optional[str], optional)                   : Path to the base video. Defaults to ``None``. (Render ``elements`` on the background color.)
+            fps (float, optional)                                  : Frame rate of the output when there is no base video. Defaults to ``30.0``.
+            crop (Optional[Dict[str, int]], optional)              : Region (``top``, ``left``, ``right`` and ``bottom``) of the base video to keep, e.g. the result of :func:`detect_clip_locations <veditor.utils.video_utils.detect_clip_locations>`. Defaults to ``None``. (The whole frame.)
+        """
+        self.elements = list(elements)
         super().__init__(pos_frames=(None, None))
-        self.set_element_attributes(bgRGB=bgRGB)
+        self.layout = LayoutGraph(elements=self.elements)
+        self.set_element_attributes(width=width, height=height, bgRGB=bgRGB)
+        self.set_video_attributes(video_path=video_path, fps=fps, crop=crop)
 
     def set_element_attributes(
         self,
@@ -40,30 +78,147 @@ class VEditor(BaseElement):
         self.set_pos_frames()
         self.set_trbl()
 
-    def set_trbl(self):
-        w = self._width
-        h = self._height
-        top, right, bottom, left = (1e5, -1, -1, 1e5)
+    def set_video_attributes(
+        self,
+        video_path: Optional[str] = None,
+        fps: float = 30.0,
+        crop: Optional[Dict[str, int]] = None,
+    ) -> None:
+        """Set attributes for the base video.
+
+        When ``crop`` is given, the output (and the canvas of elements) is the region of the base video, and only the region is decoded into frames. (See :meth:`read_frames <veditor.editor.VEditor.read_frames>`)
+
+        Args:
+            video_path (Optional[str], optional)      : Path to the base video. Defaults to ``None``.
+            fps (float, optional)                     : Frame rate of the output when there is no base video. Defaults to ``30.0``.
+            crop (Optional[Dict[str, int]], optional) : Region (``top``, ``left``, ``right`` and ``bottom``) of the base video to keep. Other keys are ignored. Defaults to ``None``.
+
+        Raises:
+            ValueError: When ``crop`` is given without ``video_path``, or it is not a region in the base video.
+        """
+        frame_size = None
+        frame_count = None
+        if video_path is not None:
+            info = probe_media(video_path)
+            fps = info["fps"]
+            frame_count = info["frame_count"]
+            frame_size = (info["width"], info["height"])
+        if crop is not None:
+            if frame_size is None:
+                raise ValueError(
+                    f"{toGREEN('crop')} requires the base video {toGREEN('video_path')}."
+                )
+            W, H = frame_size
+            crop = dict(
+                top=int(crop.get("top") or 0),
+                left=int(crop.get("left") or 0),
+                right=int(W if crop.get("right") is None else crop["right"]),
+                bottom=int(H if crop.get("bottom") is None else crop["bottom"]),
+            )
+            if not (
+                (0 <= crop["left"] < crop["right"] <= W)
+                and (0 <= crop["top"] < crop["bottom"] <= H)
+            ):
+                raise ValueError(f"{crop} is not a region in the base video ({W}x{H}).")
+            frame_size = (crop["right"] - crop["left"], crop["bottom"] - crop["top"])
+        self.set_attribute(name="video_path", value=video_path)
+        self.set_attribute(name="decode_path", value=video_path)
+        self.set_attribute(name="proxy_path", value=None)
+        self.set_attribute(name="fps", value=fps)
+        self.set_attribute(name="video_frame_count", value=frame_count)
+        self.set_attribute(name="video_frame_size", value=frame_size)
+        self.set_attribute(name="crop", value=crop)
+
+    def set_proxy(self, proxy_path: Optional[str], decode: bool = False) -> None:
+        """Set the low-resolution proxy of the base video which is decoded in preview rendering.
+
+        Args:
+            proxy_path (Optional[str]) : Path to the proxy video. If ``None``, previews decode ``video_path``.
+            decode (bool, optional)    : Whether to decode the proxy right away (for a scaled copy.) Defaults to ``False``. (Only scaled copies created after this call decode it.)
+        """
+        self.set_attribute(name="proxy_path", value=proxy_path)
+        if decode:
+            self.decode_path = proxy_path or self.video_path
+
+    def use_proxies(
+        self, manager: Optional[ProxyManager] = None, decode: bool = False
+    ) -> None:
+        """Set proxies of the base video and all :class:`VideoElement <veditor.elements.video.VideoElement>` s (transcoding them at the first call.)
+
+        Proxies are decoded only by scaled copies (:meth:`scaled <veditor.editor.VEditor.scaled>`), and :meth:`export <veditor.editor.VEditor.export>` at the original resolution always decodes the originals.
+
+        Args:
+            manager (Optional[ProxyManager], optional) : Proxy manager. Defaults to ``None``. (The shared one.)
+            decode (bool, optional)                    : Whether to decode the proxies right away (for a scaled copy.) Defaults to ``False``.
+        """
+        manager = manager or get_proxy_manager()
+        if self.video_path is not None:
+            self.set_proxy(proxy_path=manager.get(self.video_path), decode=decode)
         for element in self.elements:
+            if hasattr(element, "set_proxy"):
+                element.set_proxy(
+                    proxy_path=manager.get(element.video_path), decode=decode
+                )
+
+    @property
+    def frame_size(self) -> Tuple[int, int]:
+        """The size of output frames (``width``, ``height``). If there is no base video, the canvas covers all elements."""
+        if self.video_frame_size is not None:
+            return self.video_frame_size
+        return (self.right, self.bottom)
+
+    @property
+    def frame_count(self) -> int:
+        """The number of output frames."""
+        if self.video_frame_count is not None:
+            return self.video_frame_count
+        return (self.end_pos or 0) + 1
+
+    def set_trbl(self, elements: Optional[List[BaseElement]] = None) -> None:
+        """Set the bounding box (``top``, ``left``, ``width``, ``height``) of all elements.
+
+        Args:
+            elements (Optional[List[BaseElement]], optional) : Newly added elements. If given, the current bounding box is only extended by them instead of rescanning all elements. Defaults to ``None``.
+        """
+        if elements is None:
+            elements = self.elements
+            top, right, bottom, left = (None, None, None, None)
+        else:
+            top, right, bottom, left = self._trbl
+        for element in elements:
             t, r, b, l = element.locations
-            if t < top:
+            if (top is None) or (t < top):
                 top = t
-            if r > right:
+            if (right is None) or (r > right):
                 right = r
-            if b > bottom:
+            if (bottom is None) or (b > bottom):
                 bottom = b
-            if l < left:
+            if (left is None) or (l < left):
                 left = l
+        self._trbl = (top, right, bottom, left)
+        w = self._width
+        h = self._height
         if w is None:
-            w = r - l
+            w = 0 if left is None else right - left
         if h is None:
-            h = b - t
-        self.set_size(width=w, height=h)
-        self.set_locations(top=top, right=right, left=left, bottom=bottom)
+            h = 0 if top is None else bottom - top
+        self.set_attribute(name="width", value=w)
+        self.set_attribute(name="height", value=h)
+        self.set_attribute(name="top", value=top or 0)
+        self.set_attribute(name="left", value=left or 0)
 
-    def set_pos_frames(self) -> None:
-        start_pos, end_pos = (None, None)
-        for element in self.elements:
+    def set_pos_frames(self, elements: Optional[List[BaseElement]] = None) -> None:
+        """Set the positions (``start_pos`` and ``end_pos``) which cover all elements.
+
+        Args:
+            elements (Optional[List[BaseElement]], optional) : Newly added elements. If given, the current positions are only extended by them. Defaults to ``None``.
+        """
+        if elements is None:
+            elements = self.elements
+            start_pos, end_pos = (None, None)
+        else:
+            start_pos, end_pos = (self.start_pos, self.end_pos)
+        for element in elements:
             s = element.start_pos
             e = element.end_pos
             if (start_pos is None) or ((s is not None) and (s < start_pos)):
@@ -80,9 +235,41 @@ class VEditor(BaseElement):
             element (BaseElement) : An instance of  :class:`BaseElement <veditor.elements.base.BaseElement>`.
         """
         self.elements.append(element)
-        self.set_pos_frames()
+        self.layout.add(element)
+        self.set_pos_frames(elements=[element])
+        self.set_trbl(elements=[element])
+
+    def relayout(self, element: Optional[BaseElement] = None) -> None:
+        """Re-solve the locations of elements after some of them are moved or resized.
+
+        Args:
+            element (Optional[BaseElement], optional) : The changed element. If given, only ``element`` and elements which refer to it are re-solved. Defaults to ``None``. (Re-solve all elements.)
+        """
+        if element is None:
+            self.layout.solve()
+        else:
+            self.layout.update(element)
         self.set_trbl()
 
+    def prepare_tracks(self, start: int = 0, end: Optional[int] = None) -> None:
+        """Precompute the keyframed tracks of animated elements for positions in ``[start, end)``. (See :meth:`prepare_tracks <veditor.elements.base.FixedElement.prepare_tracks>`)
+
+        Args:
+            start (int, optional)         : The first position. Defaults to ``0``.
+            end (Optional[int], optional) : The last position (exclusive.) Defaults to ``None``. (``frame_count``.)
+        """
+        end = self.frame_count if end is None else end
+        for element in self.elements:
+            if getattr(element, "animated", False):
+                element.prepare_tracks(
+                    start=max(start, element.start_pos),
+                    end=(
+                        end
+                        if element.end_pos is None
+                        else min(end, element.end_pos + 1)
+                    ),
+                )
+
     def edit(self, frame: npt.NDArray[np.uint8], pos: int) -> npt.NDArray[np.uint8]:
         """Edit a ``pos``-th frame in the video ``vide_path``.
 
@@ -103,36 +290,164 @@ class VEditor(BaseElement):
             frame = element.edit(frame=frame, pos=pos)
         return frame
 
+    def scaled(self, scale: float) -> "VEditor":
+        """Create a copy of this editor whose geometry (including all elements) is scaled by ``scale``.
+
+        The copy decodes the proxy of the base video (and of :class:`VideoElement <veditor.elements.video.VideoElement>` s) if it is set. This editor and its elements are not changed.
+
+        Args:
+            scale (float) : Scale factor (e.g. ``0.5`` renders at half the resolution.)
+
+        Returns:
+            VEditor: A scaled copy of this editor.
+        """
+        editor = copy.copy(self)
+        memo: Dict[int, BaseElement] = {}
+        editor.elements = [
+            (
+                element.scaled(scale=scale, memo=memo)
+                if hasattr(element, "scaled")
+                else element
+            )
+            for element in self.elements
+        ]
+        for name in ["top", "left"]:
+            setattr(editor, name, int(round(getattr(self, name) * scale)))
+        for name in ["width", "height"]:
+            setattr(editor, name, max(1, int(round(getattr(self, name) * scale))))
+        if self.video_frame_size is not None:
+            editor.video_frame_size = tuple(
+                max(1, int(round(v * scale))) for v in self.video_frame_size
+            )
+        editor.decode_path = self.proxy_path or self.video_path
+        # The layout of this editor refers to the original elements.
+        editor.layout = LayoutGraph(elements=editor.elements)
+        return editor
+
+    def read_frame(self, pos: int) -> npt.NDArray[np.uint8]:
+        """Read the ``pos``-th base frame (before editing.)
+
+        Args:
+            pos (int) : The position in the video.
+
+        Returns:
+            npt.NDArray[np.uint8]: The ``pos``-th frame of the base video, or a frame filled with the background color.
+        """
+        if self.decode_path is None:
+            return self._blank_frame()
+        cap, roi = self._open_capture(start=pos)
+        is_ok, frame = cap.read()
+        cap.release()
+        if (not is_ok) or (frame is None):
+            return self._blank_frame()
+        return self._fit_frame(frame if roi is None else frame[roi])
+
+    def read_frames(
+        self, start: int = 0, end: Optional[int] = None
+    ) -> Iterator[Tuple[int, npt.NDArray[np.uint8]]]:
+        """Read base frames (before editing) sequentially.
+
+        With ``crop``, frames are cropped by ``ffmpeg`` while decoding (See :class:`FFmpegVideoReader <veditor.utils.video_utils.FFmpegVideoReader>`), or sliced as views without copying full frames if ``ffmpeg`` is not available.
+
+        Args:
+            start (int, optional)         : The first position to read. Defaults to ``0``.
+            end (Optional[int], optional) : The position to stop reading (exclusive.) Defaults to ``None``. (The last frame.)
+
+        Yields:
+            Tuple[int, npt.NDArray[np.uint8]]: The position and the base frame.
+        """
+        end = self.frame_count if end is None else min(end, self.frame_count)
+        if self.decode_path is None:
+            for pos in range(start, end):
+                yield (pos, self._blank_frame())
+        else:
+            cap, roi = self._open_capture(start=start)
+            for pos in range(start, end):
+                is_ok, frame = cap.read()
+                if (not is_ok) or (frame is None):
+                    break
+                yield (pos, self._fit_frame(frame if roi is None else frame[roi]))
+            cap.release()
+
+    def _open_capture(
+        self, start: int = 0
+    ) -> Tuple[
+        Union[cv2.VideoCapture, FFmpegVideoReader], Optional[Tuple[slice, slice]]
+    ]:
+        """Open ``decode_path`` at ``start``, and return the capture and the slices of ``crop`` which are left to apply to its frames (``None`` if frames are already cropped.)"""
+        roi = None
+        if self.crop is not None:
+            # Scale the region to the resolution of the decoded video (e.g. a proxy.)
+            decoded, original = (
+                probe_media(self.decode_path),
+                probe_media(self.video_path),
+            )
+            sx = decoded["width"] / original["width"]
+            sy = decoded["height"] / original["height"]
+            top, bottom = (int(round(self.crop[k] * sy)) for k in ["top", "bottom"])
+            left, right = (int(round(self.crop[k] * sx)) for k in ["left", "right"])
+            if shutil.which("ffmpeg") is not None:
+                reader = FFmpegVideoReader(
+                    self.decode_path,
+                    top=top,
+                    left=left,
+                    right=right,
+                    bottom=bottom,
+                    start=start,
+                    fps=self.fps,
+                )
+                return (reader, None)
+            roi = (slice(top, bottom), slice(left, right))
+        cap = cv2.VideoCapture(self.decode_path)
+        if start > 0:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        return (cap, roi)
+
+    def _blank_frame(self) -> npt.NDArray[np.uint8]:
+        W, H = self.frame_size
+        return np.full(shape=(H, W, 3), fill_value=self.bgRGB or 0, dtype=np.uint8)
+
+    def _fit_frame(self, frame: npt.NDArray[np.uint8]) -> npt.NDArray[np.uint8]:
+        W, H = self.frame_size
+        if frame.shape[:2] != (H, W):
+            frame = cv2.resize(frame, dsize=(W, H), interpolation=cv2.INTER_AREA)
+        return frame
+
     def check_work(
         self,
         pos: int,
         frame: Optional[npt.NDArray[np.uint8]] = None,
         as_pil: bool = True,
+        scale: float = 1.0,
     ) -> Union[npt.NDArray[np.uint8], Image.Image]:
         """Check the editing result for ``pos`` frame in video at ``video_path`` of this editor.
 
         Args:
             pos (int)                                         : The position in the video.
-            frame (Optional[npt.NDArray[np.uint8]], optional) : [description]. Defaults to ``None``
+            frame (Optional[npt.NDArray[np.uint8]], optional) : The base frame. Defaults to ``None``. (Read from the base video, or filled with ``bgRGB``.)
             as_pil (bool, optional)                           : Whether to return object as ``Image.Image`` or ``npt.NDArray[npt.uint8]``. Defaults to ``True``.
+            scale (float, optional)                           : Scale factor of the preview resolution. Defaults to ``1.0``.
 
         Raises:
-            ValueError: When ``bgRGB`` is not set, and ``frame`` is ``None``.
+            ValueError: When ``bgRGB`` and ``video_path`` are not set, and ``frame`` is ``None``.
 
         Returns:
             Union[npt.NDArray[np.uint8], Image.Image]: An editing result for the ``pos``-th frame.
         """
+        if scale != 1:
+            if frame is not None:
+                frame = cv2.resize(
+                    frame, dsize=None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA
+                )
+            return self.scaled(scale=scale).check_work(
+                pos=pos, frame=frame, as_pil=as_pil
+            )
         if frame is None:
-            if self.bgRGB is None:
+            if (self.bgRGB is None) and (self.decode_path is None):
                 raise ValueError(
-                    f"If background color {toGREEN('bgRGB')} is not set, please specify an argument {toBLUE('frame')}."
-                )
-            else:
-                frame = np.full(
-                    shape=(self.height, self.width, 3),
-                    fill_value=self.bgRGB,
-                    dtype=np.uint8,
+                    f"If background color {toGREEN('bgRGB')} or base video {toGREEN('video_path')} is not set, please specify an argument {toBLUE('frame')}."
                 )
+            frame = self.read_frame(pos=pos)
         frame = self.edit(frame=frame, pos=pos)
         if as_pil:
             return arr2pil(frame)
@@ -142,23 +457,48 @@ class VEditor(BaseElement):
     def check_works(
         self,
         out_path: Optional[str] = None,
-        codec: str = "H264",
+        codec: str = PREVIEW_CODEC,
         fps: Optional[float] = None,
         open: bool = True,
+        scale: float = 0.5,
+        proxy: bool = True,
         **kwargs,
     ) -> str:
-        """Check the editing results of this editor.
+        """Check the editing results of this editor with a quick preview.
+
+        The preview is rendered at a fraction (``scale``) of the resolution with scaled element geometry, decodes proxies where available, and is encoded with a fast intra-only codec. Use :meth:`export <veditor.editor.VEditor.export>` for the final output.
 
         Args:
             out_path (Optional[str], optional) : Path to the created video. Defaults to ``None``.
-            codec (str, optional)              : Video codec for the created video. Defaults to ``"H264"``.
+            codec (str, optional)              : Video codec for the created video. Defaults to ``"MJPG"``.
             fps (Optional[float], optional)    : Frame rate of the output video. Defaults to ``None``.
             open (bool, optional)              : Whether to open output file or not. Defaults to ``True``.
+            scale (float, optional)            : Scale factor of the preview resolution (e.g. ``0.5`` or ``0.25``). Defaults to ``0.5``.
+            proxy (bool, optional)             : Whether to decode low-resolution proxies (as tall as the preview) of the source videos. This editor is not changed. (See :meth:`use_proxies <veditor.editor.VEditor.use_proxies>`) Defaults to ``True``.
 
         Returns:
             str: The path to the created video.
         """
-        return self.export(out_path=out_path, codec=codec, fps=fps, open=open, **kwargs)
+        if not (proxy and (scale < 1)):
+            return self.export(
+                out_path=out_path,
+                codec=codec,
+                fps=fps,
+                open=open,
+                scale=scale,
+                **kwargs,
+            )
+        preview = self.scaled(scale=scale)
+        # Proxies are set only on the copy (so this editor keeps decoding the originals), and are as
+        # tall as the preview renders the base video (or the canvas if it is taller.)
+        height = self.height
+        if self.video_path is not None:
+            height = max(height, probe_media(self.video_path)["height"])
+        height = max(2, int(math.ceil(scale * height / 2)) * 2)
+        preview.use_proxies(manager=get_proxy_manager(height=height), decode=True)
+        return preview.export(
+            out_path=out_path, codec=codec, fps=fps, open=open, **kwargs
+        )
 
     def export(
         self,
@@ -166,44 +506,308 @@ class VEditor(BaseElement):
         codec: str = "H264",
         fps: Optional[float] = None,
         open: bool = True,
+        scale: float = 1.0,
+        cache: Union[bool, RenderCache] = False,
+        smart_cut: bool = False,
+        speed: Union[float, List[Tuple]] = 1.0,
+        blend: bool = False,
         **kwargs,
     ) -> str:
         """Create a video with each element in ``elements``.
 
+        When ``fps`` differs from the frame rate of the timeline, or ``speed`` / ``blend`` is given, the output is retimed: the timeline frame (or the pair of frames to blend) of each output frame is precomputed by :func:`retime_schedule <veditor.utils.timing_utils.retime_schedule>`, and the timeline is decoded and edited in one sequential pass. (See :meth:`retimed_frames <veditor.editor.VEditor.retimed_frames>`)
+
         Args:
             out_path (Optional[str], optional) : Path to the output video. Defaults to ``None``.
             codec (str, optional)              : Video codec for the output video. Defaults to ``"H264"``.
             fps (Optional[float], optional)    : Frame rate of the output video. Defaults to ``None``.
             open (bool, optional)              : Whether to open the created video file. Defaults to ``True``.
+            scale (float, optional)            : Scale factor of the output resolution. Defaults to ``1.0``.
+            cache (Union[bool, RenderCache], optional) : Render cache for incremental exports. If ``True``, use the default one. (See :meth:`render_segments <veditor.editor.VEditor.render_segments>`) Defaults to ``False``.
+            smart_cut (bool, optional)         : Whether to stream-copy the ranges of the base video which no element touches. (See :meth:`smart_cut <veditor.editor.VEditor.smart_cut>`) Defaults to ``False``.
+            speed (Union[float, List[Tuple]], optional) : Playback speed, or keyframes of a speed ramp as ``(pos, speed)`` or ``(pos, speed, easing)``. Defaults to ``1.0``.
+            blend (bool, optional)             : Whether to blend neighbouring frames for output frames between two timeline frames. Defaults to ``False``.
+
+        Raises:
+            ValueError: When the output is retimed with ``cache`` or ``smart_cut``.
 
         Returns:
             str: The path to the created video file.
         """
-        cap = cv2.VideoCapture(self.video_path)
-        cap.set(cv2.CAP_PROP_FPS, self.fps)
-        out, out_path = capture2writor(
-            cap=cap,
-            out_path=out_path,
-            codec=codec,
-            H=self.height,
-            W=self.width,
-            fps=fps,
+        if scale != 1:
+            return self.scaled(scale=scale).export(
+                out_path=out_path,
+                codec=codec,
+                fps=fps,
+                open=open,
+                cache=cache,
+                smart_cut=smart_cut,
+                speed=speed,
+                blend=blend,
+                **kwargs,
+            )
+        retimed = (fps not in (None, self.fps)) or (speed != 1) or blend
+        if retimed and (cache or smart_cut):
+            raise ValueError(
+                f"Retiming ({toGREEN('fps')}, {toGREEN('speed')} or {toGREEN('blend')}) can not be combined with {toGREEN('cache')} or {toGREEN('smart_cut')}."
+            )
+        self.prepare_tracks()
+        if smart_cut:
+            out_path = self.smart_cut(out_path=out_path, fps=fps)
+            return self.synthesize_audio(out_path=out_path, open=open)
+        if cache:
+            if not isinstance(cache, RenderCache):
+                cache = RenderCache()
+            if out_path is None:
+                out_path = now_str() + vcodec2ext(codec)
+            segment_paths = self.render_segments(cache=cache, codec=codec, fps=fps)
+            concat_videos(paths=segment_paths, out_path=out_path)
+            cache.evict()
+            return self.synthesize_audio(out_path=out_path, open=open)
+        W, H = self.frame_size
+        out, out_path = createVideoWritor(
+            H=H, W=W, fps=fps or self.fps, codec=codec, out_path=out_path
         )
-        for i in tqdm(
-            range(int(cap.get(cv2.CAP_PROP_FRAME_COUNT))), desc=self.video_filename
-        ):
-            ret, frame = cap.read()
-            if (not ret) or (frame is None):
-                break
-            frame = self.edit(frame=frame, pos=i)
+        if retimed:
+            idx, weights = retime_schedule(
+                frame_count=self.frame_count,
+                fps=self.fps,
+                out_fps=fps,
+                speed=speed,
+                blend=blend,
+            )
+            frames = self.retimed_frames(idx=idx, weights=weights)
+        else:
+            idx = np.arange(self.frame_count)
+            frames = (
+                self.edit(frame=frame, pos=pos) for pos, frame in self.read_frames()
+            )
+        for frame in tqdm(frames, total=len(idx), desc=self.element_name):
             out.write(frame)
         out.release()
-        cap.release()
 
+        if speed != 1:
+            self.logger.warning(
+                f"The audio is not attached, as it can not follow {toGREEN('speed')}."
+            )
+            if open:
+                openf(out_path)
+            return out_path
         return self.synthesize_audio(out_path=out_path, open=open)
 
+    def retimed_frames(
+        self, idx: npt.NDArray[np.int64], weights: npt.NDArray[np.float64]
+    ) -> Iterator[npt.NDArray[np.uint8]]:
+        """Render output frames from a retiming schedule. (See :func:`retime_schedule <veditor.utils.timing_utils.retime_schedule>`)
+
+        The base video is read sequentially once. Only the timeline frames which feed the output are edited, and each of them only once (the last two edited frames are kept for duplicates and blends.)
+
+        Args:
+            idx (npt.NDArray[np.int64])       : The (earlier) timeline frame of each output frame. (Non-decreasing.)
+            weights (npt.NDArray[np.float64]) : The weight of the next timeline frame of each output frame.
+
+        Yields:
+            npt.NDArray[np.uint8]: Output frames.
+        """
+        reader = self.read_frames()
+        edited = {}  # pos -> edited frame.
+        last = (-1, None)
+
+        def fetch(pos: int) -> Optional[npt.NDArray[np.uint8]]:
+            nonlocal last
+            if pos not in edited:
+                while last[0] < pos:
+                    last = next(reader, (pos, None))
+                    if last[1] is None:
+                        break
+                if last[1] is None:  # Hold the last frame after the end of the video.
+                    return edited[max(edited)] if len(edited) > 0 else None
+                for p in [p for p in edited if p < pos - 1]:
+                    del edited[p]
+                edited[pos] = self.edit(frame=last[1], pos=pos)
+            return edited[pos]
+
+        for pos, weight in zip(idx.tolist(), weights.tolist()):
+            frame = fetch(pos)
+            if weight > 0:
+                frame_next = fetch(pos + 1)
+                if frame_next is not None:
+                    frame = cv2.addWeighted(frame, 1 - weight, frame_next, weight, 0)
+            if frame is not None:
+                yield frame
+
+    def edited_mask(self) -> npt.NDArray[np.bool_]:
+        """Find the positions where at least one element is in charge, from ``pos_frames`` of ``elements``.
+
+        Since :meth:`edit <veditor.editor.VEditor.edit>` fills the region of this editor with ``bgRGB`` at every position, all positions are edited unless ``bgRGB`` is ``None`` or the region is empty.
+
+        Returns:
+            npt.NDArray[np.bool_]: A boolean mask whose length is ``frame_count``.
+        """
+        count = self.frame_count
+        if (self.bgRGB is not None) and (self.width > 0) and (self.height > 0):
+            return np.ones(shape=count, dtype=np.bool_)
+        diff = np.zeros(shape=count + 1, dtype=np.int64)
+        for element in self.elements:
+            start = max(element.start_pos, 0)
+            end = count if element.end_pos is None else min(element.end_pos + 1, count)
+            if start < end:
+                diff[start] += 1
+                diff[end] -= 1
+        return np.cumsum(diff[:-1]) > 0
+
+    def smart_cut_ranges(
+        self, keyframes: npt.NDArray[np.int64]
+    ) -> List[Tuple[int, int, bool]]:
+        """Split the timeline at ``keyframes`` into ranges which are edited or not.
+
+        A group of pictures (from a keyframe to the next one) which contains at least one edited position is edited as a whole, and consecutive groups with the same state are merged. Therefore, every range starts at a keyframe.
+
+        Args:
+            keyframes (npt.NDArray[np.int64]) : Sorted positions of keyframes in the base video.
+
+        Returns:
+            List[Tuple[int, int, bool]]: Ranges as (``start``, ``end`` (exclusive), ``edited``).
+        """
+        count = self.frame_count
+        starts = np.union1d([0], keyframes[(keyframes > 0) & (keyframes < count)])
+        ends = np.append(starts[1:], count)
+        edited = np.logical_or.reduceat(self.edited_mask(), starts)
+        ranges: List[Tuple[int, int, bool]] = []
+        for start, end, is_edited in zip(starts, ends, edited):
+            if (len(ranges) > 0) and (ranges[-1][2] == is_edited):
+                ranges[-1] = (ranges[-1][0], int(end), bool(is_edited))
+            else:
+                ranges.append((int(start), int(end), bool(is_edited)))
+        return ranges
+
+    def smart_cut(
+        self, out_path: Optional[str] = None, fps: Optional[float] = None
+    ) -> str:
+        """Create a video by re-encoding only the ranges which elements touch, and stream-copying the others from the base video.
+
+        Edited ranges are expanded to the boundaries of groups of pictures (See :meth:`smart_cut_ranges <veditor.editor.VEditor.smart_cut_ranges>`), rendered and encoded with the encoder matching the codec of the base video, and all ranges are stitched by stream-copy. So, the export time is proportional to the amount of edited content. The output has the codec and the container of the base video. Set ``bgRGB=None`` to leave the ranges which no element touches untouched, as the background otherwise covers every position. (See :meth:`edited_mask <veditor.editor.VEditor.edited_mask>`)
+
+        Args:
+            out_path (Optional[str], optional) : Path to the output video. Defaults to ``None``.
+            fps (Optional[float], optional)    : Frame rate of the output video. Must be ``None`` or the frame rate of the base video. Defaults to ``None``.
+
+        Raises:
+            ValueError: When the base video is not set (or cropped), ``fps`` differs from the base video, or the codec of the base video is not supported.
+
+        Returns:
+            str: The path to the created video file.
+        """
+        if (
+            (self.video_path is None)
+            or (fps not in (None, self.fps))
+            or (self.crop is not None)
+        ):
+            raise ValueError(
+                f"Smart cut requires the base video {toGREEN('video_path')} without {toGREEN('crop')}, and {toGREEN('fps')} must be the same as it."
+            )
+        stream = probe_video_stream(self.video_path)
+        handleKeyError(
+            lst=list(SMART_CUT_ENCODERS.keys()), codec_name=stream["codec_name"]
+        )
+        if out_path is None:
+            out_path = now_str() + os.path.splitext(self.video_path)[1]
+        W, H = self.frame_size
+        ranges = self.smart_cut_ranges(
+            keyframes=probe_keyframes(self.video_path, fps=self.fps)
+        )
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            paths: List[str] = []
+            for i, (start, end, edited) in enumerate(
+                tqdm(ranges, desc=self.element_name)
+            ):
+                path = os.path.join(tmp_dir, f"{i:05d}.mkv")
+                if edited:
+                    out = FFmpegVideoWriter(
+                        out_path=path,
+                        W=W,
+                        H=H,
+                        fps=stream["r_frame_rate"],
+                        vcodec=SMART_CUT_ENCODERS[stream["codec_name"]],
+                        pix_fmt=stream["pix_fmt"],
+                    )
+                    for pos, frame in self.read_frames(start=start, end=end):
+                        out.write(self.edit(frame=frame, pos=pos))
+                    out.release()
+                else:
+                    copy_video_range(
+                        path=self.video_path,
+                        out_path=path,
+                        start=start,
+                        end=end,
+                        fps=self.fps,
+                    )
+                paths.append(path)
+            concat_videos(paths=paths, out_path=out_path)
+        num_edited = sum(end - start for start, end, edited in ranges if edited)
+        self.logger.info(
+            f"Re-encoded {toGREEN(num_edited)} / {toGREEN(self.frame_count)} frames, and stream-copied the others."
+        )
+        return out_path
+
+    def render_segments(
+        self, cache: RenderCache, codec: str = "H264", fps: Optional[float] = None
+    ) -> List[str]:
+        """Render the timeline as independently encoded segments, reusing the cached ones.
+
+        Each segment is keyed by the output settings, the identity of the source frames (the content of the base video and the frame range), and the :meth:`fingerprints <veditor.elements.base.BaseElement.fingerprint>` of the elements in charge of the range. Therefore, tweaking one element re-renders only the segments it covers, and the others are reused (and stream-copied by :func:`concat_videos <veditor.utils.video_utils.concat_videos>`.)
+
+        The segments of this call are protected from eviction while it runs, even if they exceed ``max_bytes`` of ``cache``.
+
+        Args:
+            cache (RenderCache)             : Render cache.
+            codec (str, optional)           : Video codec for the segments. Defaults to ``"H264"``.
+            fps (Optional[float], optional) : Frame rate of the segments. Defaults to ``None``.
+
+        Returns:
+            List[str]: Paths to the segments in order.
+        """
+        fps = fps or self.fps
+        W, H = self.frame_size
+        source = (
+            None if self.decode_path is None else file_fingerprint(self.decode_path)
+        )
+        settings = (codec, fps, W, H, self.bgRGB, source, self.crop)
+        fingerprints = [element.fingerprint() for element in self.elements]
+        segment_paths: List[str] = []
+        num_rendered = 0
+        for start, end in tqdm(
+            cache.segments(frame_count=self.frame_count), desc=self.element_name
+        ):
+            key = cache.key(
+                settings,
+                (start, end),
+                [
+                    fingerprint
+                    for element, fingerprint in zip(self.elements, fingerprints)
+                    if element.inChargeBetween(start=start, end=end)
+                ],
+                ext=vcodec2ext(codec),
+            )
+            segment_path = cache.get(key)
+            if segment_path is None:
+                out, tmp_path = createVideoWritor(
+                    H=H, W=W, fps=fps, codec=codec, out_path=cache.tmp_path(key)
+                )
+                for pos, frame in self.read_frames(start=start, end=end):
+                    out.write(self.edit(frame=frame, pos=pos))
+                out.release()
+                # Segments of this export must survive until they are concatenated.
+                segment_path = cache.put(key=key, path=tmp_path, keep=segment_paths)
+                num_rendered += 1
+            segment_paths.append(segment_path)
+        self.logger.info(
+            f"Rendered {toGREEN(num_rendered)} / {toGREEN(len(segment_paths))} segments."
+        )
+        return segment_paths
+
     def synthesize_audio(self, out_path: str, open: bool = True) -> str:
-        """Create audio with each editor in ``editors`` and attach it to the video at ``out_path``.
+        """Create audio with each element in ``elements`` and attach it to the video at ``out_path``.
 
         Args:
             out_path (str)        : The path to the output video.
@@ -212,19 +816,23 @@ class VEditor(BaseElement):
         Returns:
             str: The path to the created video file.
         """
-        audio_path = self.video_path
-        for element in self.elements:
-            audio_path = element.overlayed_audio_create(
-                video_path=audio_path, fps=self.fps
-            )
+        if self.video_path is None:
+            if open:
+                openf(out_path)
+            return out_path
+        audio_path = self.overlay_audio(
+            base_media_path=self.video_path, frame_rate=self.fps
+        )
         synthesized_video_path = synthesize_audio(
             video_path=out_path,
             audio_path=audio_path,
             open=open,
         )
-        return synthesize_audio
+        return synthesized_video_path
 
-    def overlayed_audio_create(self, video_path: str, fps: float) -> str:
+    def overlay_audio(self, base_media_path: str, frame_rate: float) -> str:
         for element in self.elements:
-            video_path = element.overlayed_audio_create(video_path=video_path, fps=fps)
-        return video_path
+            base_media_path = element.overlay_audio(
+                base_media_path=base_media_path, frame_rate=frame_rate
+            )
+        return base_media_path
@@ -3,5 +3,9 @@
 from .animation import AnimationElement
 from .base import BaseElement, FixedElement
 from .image import ImageElement
-from .text import TextElement
+from .layout import LayoutGraph
+from .sequence import SequenceElement
+from .subtitle import SubtitleTrackElement
+from .text import DynamicTextElement, TextElement
+from .transition import TransitionElement
 from .video import VideoElement
@@ -1,6 +1,5 @@
 # coding: utf-8
 import copy
-import math
 import os
 from typing import List, Optional, Tuple, Union
 
@@ -12,7 +11,17 @@ from PIL import Image
 from tqdm import tqdm
 
 from ..utils.audio_utils import synthesize_audio
-from ..utils.image_utils import alpha_composite, arr2pil, pil2arr
+from ..utils.cache_utils import get_asset_pool
+from ..utils.image_utils import (
+    alpha_composite,
+    arr2pil,
+    pil2arr,
+    pil2bgra,
+    premultiply_alpha,
+    resize_images,
+)
+from ..utils.media_utils import probe_media
+from ..utils.timing_utils import frame_schedule, probe_frame_times
 from ..utils.video_utils import capture2writor, show_frames
 from .base import BaseElement, FixedElement
 
@@ -30,8 +39,9 @@ class AnimationElement(FixedElement):
         right: Optional[Union[BaseElement, int]] = None,
         left: Optional[Union[BaseElement, int]] = 0,
         bottom: Optional[Union[BaseElement, int]] = None,
+        upscale_filter: str = "cubic",
+        timeline_fps: Optional[float] = None,
     ):
-        cap = cv2.VideoCapture(animation_path)
         super().__init__(
             pos_frames=pos_frames,
             margin=margin,
@@ -43,7 +53,12 @@ class AnimationElement(FixedElement):
             bottom=bottom,
             **dict(animation_path=animation_path),  # kwargs
         )
-        self.set_animation_attributes(animation_path=animation_path, period=period)
+        self.set_animation_attributes(
+            animation_path=animation_path,
+            period=period,
+            upscale_filter=upscale_filter,
+            timeline_fps=timeline_fps,
+        )
 
     def calc_element_size(
         self,
@@ -52,18 +67,33 @@ class AnimationElement(FixedElement):
         height: Optional[int] = None,
         **kwargs,
     ) -> Tuple[int, int]:
-        cap = cv2.VideoCapture(animation_path)
+        info = probe_media(animation_path)  # Read from the header (without decoding.)
         if width is None:
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            width = info["width"]
         if height is None:
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            height = info["height"]
         return (width, height)
 
     def set_animation_attributes(
-        self, animation_path: str, period: Optional[int] = None
+        self,
+        animation_path: str,
+        period: Optional[int] = None,
+        upscale_filter: str = "cubic",
+        timeline_fps: Optional[float] = None,
     ) -> None:
-        arr_images = self.get_all_arr(animation_path=animation_path)
-        pil_images = self.get_all_pil(animation_path=animation_path)
+        """Set attributes of the animation.
+
+        The frame shown at each position in a period is precomputed as ``schedule`` by :func:`frame_schedule <veditor.utils.timing_utils.frame_schedule>`, so that looking up a frame is a single index. Without ``timeline_fps``, frames are spread evenly over ``period`` positions. With ``timeline_fps`` (the frame rate of the base video), frames keep their own durations (See :func:`probe_frame_times <veditor.utils.timing_utils.probe_frame_times>`), and ``period`` defaults to the real duration of the animation.
+
+        Args:
+            animation_path (str)                     : Path to the animation.
+            period (Optional[int], optional)         : The number of positions of one loop. Defaults to ``None``.
+            upscale_filter (str, optional)           : Filter for upscales. Defaults to ``"cubic"``.
+            timeline_fps (Optional[float], optional) : Frame rate of the timeline. Defaults to ``None``.
+        """
+        self.set_attribute(name="animation_path", value=animation_path)
+        self.set_attribute(name="upscale_filter", value=upscale_filter)
+        arr_images, pil_images = self.load_frames()
         self.set_attribute(
             name="arr_images",
             value=arr_images,
@@ -74,10 +104,55 @@ class AnimationElement(FixedElement):
             value=pil_images,
             msg=f"{len(pil_images)} images were saved.",
         )
-        self.set_attribute(name="animation_path", value=animation_path)
-        self.set_attribute(name="period", value=period or self.pil_frame_count)
+        if timeline_fps is None:
+            times = np.arange(self.pil_frame_count + 1, dtype=np.float64)
+            period = period or self.pil_frame_count
+        else:
+            times = probe_frame_times(animation_path)
+            period = period or max(int(round(times[-1] * timeline_fps)), 1)
+        self.set_attribute(name="timeline_fps", value=timeline_fps)
+        self.set_attribute(name="period", value=period)
+        self.schedule = np.minimum(
+            frame_schedule(times, fps=period / times[-1]), self.pil_frame_count - 1
+        )
         self.set_attribute(name="mode", value=pil_images[-1].mode)
 
+    def load_frames(
+        self,
+    ) -> Tuple[Tuple[npt.NDArray[np.uint8], ...], Tuple[Image.Image, ...]]:
+        """Load the frames of ``animation_path`` resized to the element size.
+
+        Both the decoded frames and the resized frames are shared (read-only) through the :class:`AssetPool <veditor.utils.cache_utils.AssetPool>`, so the animation is decoded once and resized once per size. Frames are resized in parallel by :func:`resize_images <veditor.utils.image_utils.resize_images>`.
+
+        Returns:
+            Tuple[Tuple[npt.NDArray[np.uint8], ...], Tuple[Image.Image, ...]]: Frames as ``npt.NDArray`` and as ``Image.Image``.
+        """
+        dsize = (self.width, self.height)
+        pool = get_asset_pool()
+        key = pool.key(self.animation_path, None, None)
+        arr_images, pil_images = pool.acquire(
+            key=key,
+            create=lambda: (
+                tuple(self.get_all_arr(animation_path=self.animation_path)),
+                tuple(self.get_all_pil(animation_path=self.animation_path)),
+            ),
+        )
+        try:
+            return pool.acquire(
+                key=pool.key(self.animation_path, dsize, self.upscale_filter),
+                create=lambda: tuple(
+                    tuple(
+                        resize_images(
+                            images, dsize=dsize, upscale_filter=self.upscale_filter
+                        )
+                    )
+                    for images in [arr_images, pil_images]
+                ),
+                owner=self,
+            )
+        finally:
+            pool.release(key)  # Decoded frames are kept only while the pool has room.
+
     @property
     def arr_frame_count(self):
         return len(self.arr_images)
@@ -109,20 +184,13 @@ class AnimationElement(FixedElement):
         return arr_images
 
     def get_pos_pil(self, pos: int) -> Image.Image:
-        return self.pil_images[
-            math.floor(
-                math.modf((pos - self.start_pos) / self.period)[0]
-                * self.pil_frame_count
-            )
-        ]
+        return self.pil_images[self.schedule[(pos - self.start_pos) % self.period]]
 
     def get_pos_arr(self, pos: int) -> npt.NDArray[np.uint8]:
-        return self.arr_images[
-            math.floor(
-                math.modf((pos - self.start_pos) / self.period)[0]
-                * self.pil_frame_count
-            )
-        ]
+        return self.arr_images[self.schedule[(pos - self.start_pos) % self.period]]
+
+    def rescale(self, scale: float) -> None:
+        self.arr_images, self.pil_images = self.load_frames()
 
     def show_all_frames(
         self,
@@ -156,7 +224,13 @@ class AnimationElement(FixedElement):
             npt.NDArray[np.uint8]: An editied frame.
         """
         if self.inCharge(pos):
-            if self.mode == "RGBA":
+            if self.animated:
+                if self.mode == "RGBA":
+                    sprite = premultiply_alpha(pil2bgra(self.get_pos_pil(pos)))
+                else:
+                    sprite = (self.get_pos_arr(pos), None)
+                frame = self.paste_sprite(frame, pos, *sprite)
+            elif self.mode == "RGBA":
                 img = arr2pil(frame)
                 paste = self.get_pos_pil(pos)
                 img = alpha_composite(bg=img, paste=paste, box=(self.left, self.top))
@@ -1,8 +1,9 @@
 # coding: utf-8
+import copy
 import os
 from abc import ABC, abstractmethod
 from numbers import Number
-from typing import Dict, List, Optional, Tuple, Union
+from typing import Dict, List, Optional, Set, Tuple, Union
 
 import cv2
 import numpy as np
@@ -14,13 +15,58 @@ from tqdm import tqdm
 from ..utils._colorings import toBLUE, toGREEN
 from ..utils._loggers import get_logger
 from ..utils.audio_utils import overlay_audio, synthesize_audio
-from ..utils.generic_utils import assign_trbl
-from ..utils.image_utils import arr2pil, cv2plot, pil2arr
+from ..utils.generic_utils import (
+    _trbl,
+    assign_trbl,
+    handleKeyError,
+    object_fingerprint,
+)
+from ..utils.image_utils import arr2pil, cv2plot, overlay_premultiplied, pil2arr
+from ..utils.track_utils import Easing, easing2points, interpolate_keyframes
 from ..utils.video_utils import capture2writor
 
+# Properties of FixedElement which can be animated by keyframes. (See FixedElement.animate)
+TRACK_PROPERTIES: List[str] = ["left", "top", "width", "height", "opacity", "rotation"]
+
+
+class OmittedArgument:
+    def __init__(self, value: object):
+        """Placeholder of a constructor argument which is not remembered by elements (e.g. a large array.) See :class:`Scene <veditor.scene.Scene>`.
+
+        Args:
+            value (object) : The omitted argument.
+        """
+        self.type_name = type(value).__name__
+        self.shape = getattr(value, "shape", getattr(value, "size", None))
+
+    def __repr__(self):
+        return f"<{self.type_name} {self.shape}>"
+
+
+def _omit_unserializable(value: object) -> object:
+    """Replace arrays and images in a constructor argument (recursively) by :class:`OmittedArgument <veditor.elements.base.OmittedArgument>`."""
+    if isinstance(value, (np.ndarray, Image.Image)):
+        return OmittedArgument(value)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_omit_unserializable(v) for v in value)
+    return value
+
 
 class BaseElement(ABC):
     ELEMENT_IDX: int = 0
+    # Attributes which do not affect the output (caches, decoders, proxies, ...), and are
+    # excluded from ``fingerprint``. Subclasses add theirs, which are merged along the MRO.
+    _TRANSIENT: Set[str] = {"logger", "_init_args", "_track_range", "_track_values"}
+
+    def __new__(cls, *args, **kwargs):
+        # Remember the constructor arguments, so that elements can be serialized (by Scene.)
+        # Arrays and images are replaced by placeholders, so that they are not kept alive after preparation.
+        self = super().__new__(cls)
+        self._init_args = (
+            tuple(_omit_unserializable(v) for v in args),
+            {k: _omit_unserializable(v) for k, v in kwargs.items()},
+        )
+        return self
 
     def __init__(self, pos_frames: Tuple[int, Optional[int]] = (0, None)):
         self.logger = get_logger(name=self.element_name)
@@ -56,6 +102,30 @@ class BaseElement(ABC):
             (self.end_pos is None) or (pos <= self.end_pos)
         )
 
+    def inChargeBetween(self, start: int, end: int) -> bool:
+        """Find out if this element is in charge of any position in ``[start, end)``."""
+        return (self.start_pos < end) and (
+            (self.end_pos is None) or (start <= self.end_pos)
+        )
+
+    def fingerprint(self) -> str:
+        """Fingerprint of the parameters of this element, which changes whenever they change. (See :func:`object_fingerprint <veditor.utils.generic_utils.object_fingerprint>`)
+
+        Returns:
+            str: A SHA-1 hex digest.
+        """
+        transient = set().union(
+            *[vars(cls).get("_TRANSIENT", set()) for cls in type(self).__mro__]
+        )
+        return object_fingerprint(
+            self.__class__.__name__,
+            {
+                name: value
+                for name, value in vars(self).items()
+                if name not in transient
+            },
+        )
+
     def set_attribute(self, name: str, value: str, msg: Optional[str] = None) -> None:
         """Set attribute to this class with logs using ``setattr``.
 
@@ -232,6 +302,7 @@ class FixedElement(BaseElement):
         width, height = self.calc_element_size(width=width, height=height, **kwargs)
         self.set_size(width=width, height=height)
         self.set_locations(top=top, right=right, left=left, bottom=bottom)
+        self.set_attribute(name="tracks", value={})
 
     def calc_element_size(
         self, width: Optional[int] = None, height: Optional[int] = None, **kwargs
@@ -299,9 +370,21 @@ class FixedElement(BaseElement):
             left (Optional[Union[BaseElement, int]], optional)   : Reference element or absolute value at the left. Defaults to ``None``.
             bottom (Optional[Union[BaseElement, int]], optional) : Reference element or absolute value at the bottom. Defaults to ``None``.
         """
+        self.constraints: Dict[str, Optional[Union[BaseElement, int]]] = dict(
+            top=top, right=right, bottom=bottom, left=left
+        )
         self.set_location(lb=top, ub=bottom, direction="vertical")
         self.set_location(lb=left, ub=right, direction="horizontal")
 
+    @property
+    def references(self) -> List[BaseElement]:
+        """Elements referred to by ``top/right/bottom/left`` constraints."""
+        return [
+            ref
+            for ref in getattr(self, "constraints", {}).values()
+            if isinstance(ref, BaseElement)
+        ]
+
     def set_location(
         self,
         lb: Optional[Union[BaseElement, int]] = None,
@@ -321,6 +404,9 @@ class FixedElement(BaseElement):
             lb_name, ub_name, size_name = ("top", "bottom", "height")
         else:
             lb_name, ub_name, size_name = ("left", "right", "width")
+        if not hasattr(self, "constraint_ratio"):
+            self.constraint_ratio: Dict[str, Tuple[Number, Number]] = {}
+        self.constraint_ratio[lb_name] = ratio
         if lb is None:
             if ub is None:
                 self.logger.error(
@@ -368,6 +454,160 @@ class FixedElement(BaseElement):
         """
         return frame
 
+    def animate(
+        self, name: str, keyframes: List[Tuple], easing: Easing = "linear"
+    ) -> "FixedElement":
+        """Animate a property (one of ``TRACK_PROPERTIES``) of this element with keyframes.
+
+        ``left``, ``top``, ``width`` and ``height`` are in pixels, ``opacity`` is in ``[0, 1]`` and ``rotation`` is in degrees (counterclockwise, around the center.) Properties without a track keep their fixed values.
+
+        Args:
+            name (str)                 : The property name.
+            keyframes (List[Tuple])    : Keyframes as ``(pos, value)`` or ``(pos, value, easing)``. The easing of a keyframe is used until the next keyframe.
+            easing (Easing, optional)  : Default easing (one of ``SUPPORTED_EASINGS``, or control points ``(x1, y1, x2, y2)`` of a cubic bezier curve.) Defaults to ``"linear"``.
+
+        Returns:
+            FixedElement: This element.
+
+        Examples:
+            >>> from veditor.elements import ImageElement
+            >>> from veditor.utils import SampleData
+            >>> element = ImageElement(x=SampleData().IMAGE_PATH, top=0, left=0)
+            >>> element = element.animate("left", [(0, 0), (30, 200, "ease-out")])
+            >>> float(element.transform_at(pos=15)["left"])
+            100.0
+        """
+        handleKeyError(lst=TRACK_PROPERTIES, name=name)
+        keyframes = sorted(
+            (int(k[0]), float(k[1]), k[2] if len(k) > 2 else easing) for k in keyframes
+        )
+        if len(keyframes) == 0:
+            raise ValueError(f"Please give at least one keyframe for {toGREEN(name)}.")
+        for keyframe in keyframes:
+            easing2points(keyframe[2])  # Validate.
+        self.set_attribute(
+            name="tracks",
+            value={**self.tracks, name: keyframes},
+            msg=f"{toGREEN(name)} is animated with {len(keyframes)} keyframes.",
+        )
+        self._track_values = None
+        return self
+
+    @property
+    def animated(self) -> bool:
+        """Whether any property of this element is animated."""
+        return len(getattr(self, "tracks", {})) > 0
+
+    def prepare_tracks(self, start: int, end: int) -> None:
+        """Precompute the values of all tracks for positions in ``[start, end)``, so that :meth:`transform_at <veditor.elements.base.FixedElement.transform_at>` is ``O(1)`` there.
+
+        Args:
+            start (int) : The first position.
+            end (int)   : The last position (exclusive.)
+        """
+        positions = np.arange(start, end)
+        self._track_range = (start, end)
+        self._track_values = {
+            name: interpolate_keyframes(keyframes, positions)
+            for name, keyframes in self.tracks.items()
+        }
+
+    def transform_at(self, pos: int) -> Dict[str, float]:
+        """The properties (``TRACK_PROPERTIES``) of this element at ``pos``.
+
+        Args:
+            pos (int) : The position.
+
+        Returns:
+            Dict[str, float]: Values of ``left``, ``top``, ``width``, ``height``, ``opacity`` and ``rotation``.
+        """
+        transform = dict(
+            left=self.left,
+            top=self.top,
+            width=self.width,
+            height=self.height,
+            opacity=1.0,
+            rotation=0.0,
+        )
+        start, end = getattr(self, "_track_range", (0, 0))
+        if (getattr(self, "_track_values", None) is not None) and (start <= pos < end):
+            for name, values in self._track_values.items():
+                transform[name] = values[pos - start]
+        else:
+            for name, keyframes in getattr(self, "tracks", {}).items():
+                transform[name] = interpolate_keyframes(keyframes, [pos])[0]
+        return transform
+
+    def paste_sprite(
+        self,
+        frame: npt.NDArray[np.uint8],
+        pos: int,
+        premultiplied: npt.NDArray[np.uint8],
+        inverse_alpha: Optional[npt.NDArray[np.uint8]] = None,
+    ) -> npt.NDArray[np.uint8]:
+        """Paste a sprite of this element (split by :func:`premultiply_alpha <veditor.utils.image_utils.premultiply_alpha>`) to ``frame`` with the properties at ``pos``.
+
+        When the element is not animated, the sprite is pasted at (``left``, ``top``) as it is. Otherwise, it is scaled, rotated, faded and moved by one affine warp whose output covers only the bounding box of the sprite in ``frame``.
+
+        Args:
+            frame (npt.NDArray[np.uint8])                             : The current frame (BGR image.)
+            pos (int)                                                 : The current position.
+            premultiplied (npt.NDArray[np.uint8])                     : The premultiplied colors of the sprite.
+            inverse_alpha (Optional[npt.NDArray[np.uint8]], optional) : The inverse alpha of the sprite. Defaults to ``None``. (Opaque.)
+
+        Returns:
+            npt.NDArray[np.uint8]: An editied frame.
+        """
+        if not self.animated:
+            return overlay_premultiplied(
+                frame, premultiplied, inverse_alpha, top=self.top, left=self.left
+            )
+        t = self.transform_at(pos)
+        h, w = premultiplied.shape[:2]
+        width, height = (max(t["width"], 1), max(t["height"], 1))
+        opacity = min(max(t["opacity"], 0.0), 1.0)
+        if opacity <= 0:
+            return frame
+        if (
+            (t["rotation"] % 360 == 0)
+            and (opacity == 1)
+            and ((round(width), round(height)) == (w, h))
+        ):
+            return overlay_premultiplied(
+                frame,
+                premultiplied,
+                inverse_alpha,
+                top=int(round(t["top"])),
+                left=int(round(t["left"])),
+            )
+        # src -> dst: scale to (width, height), rotate around the center, and move to (left, top).
+        M = cv2.getRotationMatrix2D((width / 2, height / 2), t["rotation"], 1.0)
+        M[:, :2] = M[:, :2] @ np.diag([width / w, height / h])
+        M[:, 2] += (t["left"], t["top"])
+        corners = np.array([[0, 0, 1], [w, 0, 1], [0, h, 1], [w, h, 1]]) @ M.T
+        H, W = frame.shape[:2]
+        x0, y0 = np.maximum(np.floor(corners.min(axis=0)).astype(int), 0)
+        x1, y1 = np.minimum(np.ceil(corners.max(axis=0)).astype(int), (W, H))
+        if (x0 >= x1) or (y0 >= y1):
+            return frame
+        M[:, 2] -= (x0, y0)
+        dsize = (int(x1 - x0), int(y1 - y0))
+        alpha = (
+            np.full_like(premultiplied, 255)
+            if inverse_alpha is None
+            else 255 - inverse_alpha
+        )
+        premultiplied, alpha = [
+            cv2.warpAffine(img, M, dsize=dsize, flags=cv2.INTER_LINEAR)
+            for img in [premultiplied, alpha]
+        ]
+        if opacity < 1:
+            premultiplied = cv2.convertScaleAbs(premultiplied, alpha=opacity)
+            alpha = cv2.convertScaleAbs(alpha, alpha=opacity)
+        return overlay_premultiplied(
+            frame, premultiplied, 255 - alpha, top=int(y0), left=int(x0)
+        )
+
     def calc_dsize(
         self,
         dsize: Optional[Tuple[int, int]] = None,
@@ -418,6 +658,59 @@ class FixedElement(BaseElement):
         width, height = self.calc_dsize(dsize=dsize, width=width, height=height)
         self.set_size(width=width, height=height)
 
+    def scaled(
+        self, scale: float, memo: Optional[Dict[int, "FixedElement"]] = None
+    ) -> "FixedElement":
+        """Create a copy of this element whose geometry is scaled by ``scale`` (for preview rendering.)
+
+        Locations, sizes and margins which are already solved are scaled, so the layout of the copy is the same as this element's one. Size-dependent resources are rebuilt by :meth:`rescale <veditor.elements.base.FixedElement.rescale>`, and this element is not changed.
+
+        Args:
+            scale (float)                                      : Scale factor (e.g. ``0.5`` renders at half the resolution.)
+            memo (Optional[Dict[int, FixedElement]], optional) : Copies which are already created, keyed by ``id`` of their originals (as ``memo`` of ``copy.deepcopy``), so that elements referring to the same element share one copy. Defaults to ``None``.
+
+        Returns:
+            FixedElement: A scaled copy of this element.
+        """
+        if memo is None:
+            memo = {}
+        if id(self) in memo:
+            return memo[id(self)]
+        element = copy.copy(self)
+        memo[id(self)] = element
+        # Refer to the copies, so re-solving the layout of the copy never moves the originals.
+        element.constraints = {}
+        for name, ref in getattr(self, "constraints", {}).items():
+            if isinstance(ref, FixedElement):
+                ref = ref.scaled(scale=scale, memo=memo)
+            elif isinstance(ref, Number):
+                ref = int(round(ref * scale))
+            element.constraints[name] = ref
+        element.constraint_ratio = dict(getattr(self, "constraint_ratio", {}))
+        for name in ["top", "left"] + [f"margin_{s}" for s in _trbl]:
+            setattr(element, name, int(round(getattr(self, name) * scale)))
+        for name in ["width", "height"]:
+            setattr(element, name, max(1, int(round(getattr(self, name) * scale))))
+        element.tracks = {
+            name: [
+                (p, v * scale if name in TRACK_PROPERTIES[:4] else v, e)
+                for p, v, e in keyframes
+            ]
+            for name, keyframes in getattr(self, "tracks", {}).items()
+        }
+        element._track_values = None
+        element.rescale(scale=scale)
+        return element
+
+    def rescale(self, scale: float) -> None:
+        """Rebuild size-dependent resources of a copy created by :meth:`scaled <veditor.elements.base.FixedElement.scaled>`.
+
+        Subclasses override this method if they have such resources (resized images, fonts, ...). Do not modify shared objects in place, but replace the attributes.
+
+        Args:
+            scale (float) : Scale factor.
+        """
+
     def check_work(
         self, video_path: str, pos: int, as_pil: bool = True
     ) -> Union[npt.NDArray[np.uint8], Image.Image]:
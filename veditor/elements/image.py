@@ -8,13 +8,35 @@ import cv2
 import numpy as np
 import numpy.typing as npt
 from matplotlib.axes import Axes
-from PIL import Image
 
 from ..utils._colorings import toBLUE, toGREEN
-from ..utils.image_utils import alpha_composite, arr2pil, cv2plot, pil2arr
+from ..utils.cache_utils import get_asset_pool
+from ..utils.image_utils import (
+    cv2plot,
+    image_size,
+    premultiply_alpha,
+    resize_image,
+)
+from ..utils.media_utils import probe_media
 from .base import BaseElement, FixedElement
 
 
+def _imread(path: str) -> npt.NDArray[np.uint8]:
+    """Decode the image at ``path`` (keeping the alpha channel if it has one.)"""
+    # Only images with alpha are read "unchanged" (which ignores the EXIF orientation.)
+    flags = cv2.IMREAD_UNCHANGED if probe_media(path)["has_alpha"] else cv2.IMREAD_COLOR
+    return cv2.imread(path, flags)
+
+
+def _prepare_image(
+    x: npt.NDArray[np.uint8], dsize: Tuple[int, int], upscale_filter: str
+) -> Tuple[npt.NDArray[np.uint8], Optional[npt.NDArray[np.uint8]]]:
+    """Resize ``x`` to ``dsize`` and split it by :func:`premultiply_alpha <veditor.utils.image_utils.premultiply_alpha>`."""
+    return premultiply_alpha(
+        resize_image(x, dsize=dsize, upscale_filter=upscale_filter)
+    )
+
+
 class ImageElement(FixedElement):
     def __init__(
         self,
@@ -27,6 +49,7 @@ class ImageElement(FixedElement):
         right: Optional[Union[BaseElement, int]] = None,
         left: Optional[Union[BaseElement, int]] = None,
         bottom: Optional[Union[BaseElement, int]] = None,
+        upscale_filter: str = "cubic",
     ):
         """Image Elements.
 
@@ -40,6 +63,7 @@ class ImageElement(FixedElement):
             right (Optional[Union[BaseElement, int]], optional)  : Reference element or absolute value at the right. Defaults to ``None``.
             left (Optional[Union[BaseElement, int]], optional)   : Reference element or absolute value at the left. Defaults to ``None``.
             bottom (Optional[Union[BaseElement, int]], optional) : Reference element or absolute value at the bottom. Defaults to ``None``.
+            upscale_filter (str, optional)                       : Filter used when the image is enlarged. (See :func:`resize_image <veditor.utils.image_utils.resize_image>`) Defaults to ``"cubic"``.
 
         .. plot::
             :class: popup-img
@@ -67,7 +91,7 @@ class ImageElement(FixedElement):
             bottom=bottom,
             **dict(x=x),  # kwargs
         )
-        self.set_image_attributes(x=x)
+        self.set_image_attributes(x=x, upscale_filter=upscale_filter)
 
     def calc_element_size(
         self,
@@ -79,8 +103,9 @@ class ImageElement(FixedElement):
         if isinstance(x, str):
             if not os.path.exists(x):
                 raise FileNotFoundError(f"{toBLUE(x)} is not found.")
-            x = cv2.imread(x)
-        h, w = x.shape[:2]
+            w, h = image_size(x)  # Read from the header (without decoding.)
+        else:
+            h, w = x.shape[:2]
         if width is None:
             width = w
         if height is None:
@@ -90,13 +115,15 @@ class ImageElement(FixedElement):
     def set_image_attributes(
         self,
         x: Union[str, npt.NDArray[np.uint8]],
+        upscale_filter: str = "cubic",
     ) -> None:
         """Set attributes for an image.
 
+        The image is decoded only once (keeping the alpha channel), and stored as the colors premultiplied by alpha (``arr``) and the inverse alpha (``inverse_alpha``, ``None`` for opaque images), so that :meth:`edit <veditor.elements.image.ImageElement.edit>` blends only the covered region of the frame.
+
         Args:
-            x (Union[str, npt.NDArray[np.uint8]])                    : An image like array or the path to the image file.
-            margin (Optional[Union[Number, List[Number]]], optional) : Margin. Defaults to ``None``.
-            margin_default (Number, optional)                        : Default value for margin. Defaults to ``0``.
+            x (Union[str, npt.NDArray[np.uint8]]) : An image like array (Gray, BGR or BGRA) or the path to the image file.
+            upscale_filter (str, optional)        : Filter used when the image is enlarged. Defaults to ``"cubic"``.
 
         Raises:
             FileNotFoundError: When file is not found.
@@ -105,27 +132,59 @@ class ImageElement(FixedElement):
             >>> from veditor.utils import SampleData
             >>> from veditor.elements import ImageElement
             >>> element = ImageElement(x=SampleData().IMAGE_PATH)
-            >>> hasattr(element, "arr") and hasattr(element, "pil")
+            >>> hasattr(element, "arr") and hasattr(element, "inverse_alpha")
             True
         """
+        self.set_attribute(name="upscale_filter", value=upscale_filter)
         if isinstance(x, str):
             if not os.path.exists(x):
                 raise FileNotFoundError(f"{toBLUE(x)} is not found.")
-            img_pil = Image.open(x)
-            x = cv2.imread(x)
+            self.set_attribute(name="image_path", value=x)
+            premultiplied, inverse_alpha = self.load_image(path=x)
         else:
-            img_pil = arr2pil(x)
+            self.set_attribute(name="image_path", value=None)
+            premultiplied, inverse_alpha = _prepare_image(
+                x, dsize=(self.width, self.height), upscale_filter=upscale_filter
+            )
         self.set_attribute(
-            name="pil",
-            value=img_pil.resize((self.width, self.height)),
-            msg=f"size={img_pil.size}",
+            name="arr", value=premultiplied, msg=f"shape={premultiplied.shape}"
         )
         self.set_attribute(
-            name="arr",
-            value=cv2.resize(x, dsize=(self.width, self.height)),
-            msg=f"shape={x.shape}",
+            name="inverse_alpha",
+            value=inverse_alpha,
+            msg="opaque" if inverse_alpha is None else "with alpha",
         )
 
+    def load_image(
+        self, path: str
+    ) -> Tuple[npt.NDArray[np.uint8], Optional[npt.NDArray[np.uint8]]]:
+        """Load the image at ``path`` resized to the element size from the shared :class:`AssetPool <veditor.utils.cache_utils.AssetPool>`, so that elements which show the same image at the same size share one (read-only) copy.
+
+        Args:
+            path (str) : Path to the image file.
+
+        Returns:
+            Tuple[npt.NDArray[np.uint8], Optional[npt.NDArray[np.uint8]]]: The premultiplied colors and the inverse alpha. (See :func:`premultiply_alpha <veditor.utils.image_utils.premultiply_alpha>`)
+        """
+        dsize = (self.width, self.height)
+        pool = get_asset_pool()
+        return pool.acquire(
+            key=pool.key(path, dsize, self.upscale_filter),
+            create=lambda: _prepare_image(
+                _imread(path), dsize=dsize, upscale_filter=self.upscale_filter
+            ),
+            owner=self,
+        )
+
+    def rescale(self, scale: float) -> None:
+        if self.image_path is not None:
+            self.arr, self.inverse_alpha = self.load_image(path=self.image_path)
+        else:
+            dsize = (self.width, self.height)
+            self.arr = resize_image(self.arr, dsize=dsize)
+            if self.inverse_alpha is not None:
+                self.inverse_alpha = resize_image(self.inverse_alpha, dsize=dsize)
+
     def edit(self, frame: npt.NDArray[np.uint8], pos: int) -> npt.NDArray[np.uint8]:
         """Edit a ``pos``-th frame in the video ``vide_path``.
 
@@ -136,15 +195,10 @@ class ImageElement(FixedElement):
         Returns:
             npt.NDArray[np.uint8]: An editied frame.
         """
-        if self.arr.ndim == 3:
-            frame[self.top : self.bottom, self.left : self.right, :] = self.arr[
-                :, :, :3
-            ]
-        else:
-            img = alpha_composite(
-                bg=arr2pil(frame), paste=self.pil, box=(self.left, self.top)
+        if self.inCharge(pos):
+            frame = self.paste_sprite(
+                frame, pos=pos, premultiplied=self.arr, inverse_alpha=self.inverse_alpha
             )
-            frame = pil2arr(img)
         return frame
 
     def show_image_arr(self, ax: Optional[Axes] = None) -> Axes:
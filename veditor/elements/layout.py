@@ -0,0 +1,218 @@
+# coding: utf-8
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..utils._colorings import toBLUE, toGREEN
+from ..utils._loggers import get_logger
+from .base import BaseElement, FixedElement
+
+_AXES: Tuple[Tuple[str, str, str, str], ...] = (
+    # (constraint name of lower bound, upper bound, location name, size name)
+    ("top", "bottom", "top", "height"),
+    ("left", "right", "left", "width"),
+)
+
+
+class LayoutGraph:
+    def __init__(self, elements: Optional[List[BaseElement]] = None):
+        """Constraint graph of :class:`FixedElement <veditor.elements.base.FixedElement>` references.
+
+        Each element is a node, and each ``top/right/bottom/left`` argument which refers to another element is an edge. Elements are solved level by level in topological order, and all elements in the same level are solved at once with ``numpy``, so the whole layout is determined in one pass. When an element is moved or resized, only the element and its (transitive) dependents are re-solved by :meth:`update <veditor.elements.layout.LayoutGraph.update>`.
+
+        Args:
+            elements (Optional[List[BaseElement]], optional) : Elements to be laid out. Defaults to ``None``. (No elements.)
+
+        Examples:
+            >>> import numpy as np
+            >>> from veditor.elements import ImageElement, LayoutGraph
+            >>> a = ImageElement(x=np.zeros((10, 20, 3), dtype=np.uint8), top=0, left=0)
+            >>> b = ImageElement(x=np.zeros((10, 20, 3), dtype=np.uint8), top=a, left=a)
+            >>> graph = LayoutGraph(elements=[a, b])
+            >>> a.resize(width=40, height=20)
+            >>> graph.update(a)
+            >>> b.locations
+            (20, 60, 30, 40)
+        """
+        self.logger = get_logger(name=self.__class__.__name__)
+        self.elements: List[FixedElement] = []
+        self.index: Dict[int, int] = {}
+        self.dependents: Dict[int, List[FixedElement]] = defaultdict(list)
+        for element in elements or []:
+            self.add(element)
+
+    def __len__(self) -> int:
+        return len(self.elements)
+
+    def __contains__(self, element: BaseElement) -> bool:
+        return id(element) in self.index
+
+    def add(self, element: BaseElement) -> None:
+        """Add an element (node) and its references (edges) to this graph.
+
+        Elements which do not have layout constraints (e.g. :class:`BaseElement <veditor.elements.base.BaseElement>` without location) are ignored.
+
+        Args:
+            element (BaseElement) : An element to add.
+        """
+        if (not isinstance(element, FixedElement)) or (element in self):
+            return
+        self.index[id(element)] = len(self.elements)
+        self.elements.append(element)
+        for ref in element.references:
+            self.dependents[id(ref)].append(element)
+
+    def descendants(self, element: BaseElement) -> List[FixedElement]:
+        """Collect ``element`` and all elements which (transitively) refer to it.
+
+        Args:
+            element (BaseElement) : The changed element.
+
+        Returns:
+            List[FixedElement]: Affected elements (including ``element`` itself if it is in this graph.)
+        """
+        affected: List[FixedElement] = []
+        seen = set()
+        stack = [element]
+        while len(stack) > 0:
+            e = stack.pop()
+            if id(e) in seen:
+                continue
+            seen.add(id(e))
+            if e in self:
+                affected.append(e)
+            stack.extend(self.dependents.get(id(e), []))
+        return affected
+
+    def levels(
+        self, elements: Optional[List[FixedElement]] = None
+    ) -> List[List[FixedElement]]:
+        """Sort ``elements`` topologically (Kahn's algorithm) and group them by depth.
+
+        References to elements which are not in ``elements`` are regarded as already solved.
+
+        Args:
+            elements (Optional[List[FixedElement]], optional) : Elements to sort. Defaults to ``None``. (All elements in this graph.)
+
+        Raises:
+            ValueError: When references are circular.
+
+        Returns:
+            List[List[FixedElement]]: Elements for each depth. Elements in ``levels[i]`` only refer to elements in ``levels[:i]`` (or outside of ``elements``.)
+        """
+        if elements is None:
+            elements = self.elements
+        targets = {id(e): e for e in elements}
+        indegree: Dict[int, int] = {
+            k: sum(id(ref) in targets for ref in e.references)
+            for k, e in targets.items()
+        }
+        level = [e for k, e in targets.items() if indegree[k] == 0]
+        levels: List[List[FixedElement]] = []
+        num_sorted = 0
+        while len(level) > 0:
+            levels.append(level)
+            num_sorted += len(level)
+            next_level: List[FixedElement] = []
+            for e in level:
+                for dep in self.dependents.get(id(e), []):
+                    k = id(dep)
+                    if k in targets:
+                        indegree[k] -= 1
+                        if indegree[k] == 0:
+                            next_level.append(dep)
+            level = next_level
+        if num_sorted < len(targets):
+            circular = [
+                toGREEN(e.element_name) for k, e in targets.items() if indegree[k] > 0
+            ]
+            raise ValueError(
+                f"Couldn't solve the layout because references are circular among {', '.join(circular)}"
+            )
+        return levels
+
+    def solve(self, elements: Optional[List[FixedElement]] = None) -> None:
+        """Solve the locations (``top`` and ``left``) of ``elements`` in one pass.
+
+        Args:
+            elements (Optional[List[FixedElement]], optional) : Elements to solve. Defaults to ``None``. (All elements in this graph.)
+        """
+        levels = self.levels(elements=elements)
+        for level in levels:
+            for lb_name, ub_name, loc_name, size_name in _AXES:
+                values = self._solve_axis(
+                    level=level,
+                    lb_name=lb_name,
+                    ub_name=ub_name,
+                    loc_name=loc_name,
+                    size_name=size_name,
+                )
+                for element, value in zip(level, values.tolist()):
+                    setattr(element, loc_name, value)
+        self.logger.info(
+            f"Solved the locations of {toBLUE(sum(len(level) for level in levels))} elements in {toBLUE(len(levels))} levels."
+        )
+
+    def update(self, element: BaseElement) -> None:
+        """Re-solve only the subgraph affected by the change of ``element``.
+
+        Args:
+            element (BaseElement) : The moved or resized element.
+        """
+        self.solve(elements=self.descendants(element))
+
+    @staticmethod
+    def _solve_axis(
+        level: List[FixedElement],
+        lb_name: str,
+        ub_name: str,
+        loc_name: str,
+        size_name: str,
+    ) -> np.ndarray:
+        """Vectorized version of :meth:`FixedElement.set_location <veditor.elements.base.FixedElement.set_location>` for all elements in ``level``."""
+        n = len(level)
+        size = np.asarray([getattr(e, size_name) for e in level], dtype=float)
+        margin_lb = np.asarray(
+            [getattr(e, f"margin_{lb_name}") for e in level], dtype=float
+        )
+        margin_ub = np.asarray(
+            [getattr(e, f"margin_{ub_name}") for e in level], dtype=float
+        )
+        ratio = np.asarray(
+            [e.constraint_ratio.get(loc_name, (1, 1)) for e in level], dtype=float
+        )
+        # Resolve each bound to absolute values (NaN means "not specified").
+        lb = np.full(shape=n, fill_value=np.nan)
+        ub = np.full(shape=n, fill_value=np.nan)
+        for i, e in enumerate(level):
+            lb_ref = e.constraints.get(lb_name)
+            ub_ref = e.constraints.get(ub_name)
+            if isinstance(lb_ref, BaseElement):
+                lb[i] = getattr(lb_ref, ub_name) + getattr(lb_ref, f"margin_{ub_name}")
+            elif lb_ref is not None:
+                lb[i] = lb_ref
+            if isinstance(ub_ref, BaseElement):
+                ub[i] = getattr(ub_ref, lb_name) - getattr(ub_ref, f"margin_{lb_name}")
+            elif ub_ref is not None:
+                ub[i] = ub_ref
+        is_lb_ref = np.asarray(
+            [isinstance(e.constraints.get(lb_name), BaseElement) for e in level]
+        )
+        is_ub_ref = np.asarray(
+            [isinstance(e.constraints.get(ub_name), BaseElement) for e in level]
+        )
+        lb = np.where(is_lb_ref, lb + margin_lb, lb)
+        ub = np.where(is_ub_ref, ub - margin_ub, ub)
+
+        has_lb = ~np.isnan(lb)
+        has_ub = ~np.isnan(ub)
+        loc = np.where(has_ub, ub - size, margin_lb)
+        loc = np.where(has_lb, lb, loc)
+        both = has_lb & has_ub
+        loc[both] = lb[both] + np.trunc(
+            (ub[both] - lb[both] - size[both])
+            / ratio[both].sum(axis=1)
+            * ratio[both, 0]
+        )
+        return loc.astype(int)
@@ -0,0 +1,149 @@
+# coding: utf-8
+import threading
+from typing import List, Optional, Set, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from ..utils.media_utils import probe_media
+from ..utils.video_utils import SequentialReader
+from .base import BaseElement, FixedElement
+
+
+class SequenceElement(FixedElement):
+    _TRANSIENT: Set[str] = {"_reader", "_prefetch"}
+
+    def __init__(
+        self,
+        video_paths: List[str],
+        start_pos: int = 0,
+        prefetch: int = 15,
+        margin: Union[int, List[int]] = 0,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        top: Optional[Union[BaseElement, int]] = 0,
+        right: Optional[Union[BaseElement, int]] = None,
+        left: Optional[Union[BaseElement, int]] = 0,
+        bottom: Optional[Union[BaseElement, int]] = None,
+    ):
+        """Clips played one after another (e.g. a montage of many short videos.)
+
+        Unlike one :class:`VideoElement <veditor.elements.video.VideoElement>` per clip, only one decoder is open at a time, and the clip of a position is found by a binary search over the cumulative frame counts (``offsets``) instead of checking every clip. ``prefetch`` frames before the end of a clip, the next clip is opened (and its first frame is decoded) in a background thread, so the boundary does not stall rendering.
+
+        Args:
+            video_paths (List[str])                              : Paths to the clips in order.
+            start_pos (int, optional)                            : The position where the first clip starts. Defaults to ``0``.
+            prefetch (int, optional)                             : The number of frames before the end of a clip to start opening the next one. Defaults to ``15``.
+            margin (Union[int, List[int]], optional)             : Margin. Defaults to ``0``.
+            width (Optional[int], optional)                      : The element width. Defaults to ``None``. (Same as the first clip.)
+            height (Optional[int], optional)                     : The element height. Defaults to ``None``. (Same as the first clip.)
+            top (Optional[Union[BaseElement, int]], optional)    : Reference element or absolute value at the top. Defaults to ``0``.
+            right (Optional[Union[BaseElement, int]], optional)  : Reference element or absolute value at the right. Defaults to ``None``.
+            left (Optional[Union[BaseElement, int]], optional)   : Reference element or absolute value at the left. Defaults to ``0``.
+            bottom (Optional[Union[BaseElement, int]], optional) : Reference element or absolute value at the bottom. Defaults to ``None``.
+
+        Raises:
+            ValueError: When no clip is given.
+        """
+        if len(video_paths) == 0:
+            raise ValueError("Please specify at least one clip.")
+        infos = [probe_media(path) for path in video_paths]  # Headers only.
+        offsets = start_pos + np.cumsum([0] + [info["frame_count"] for info in infos])
+        super().__init__(
+            pos_frames=(start_pos, int(offsets[-1])),
+            margin=margin,
+            width=width or infos[0]["width"],
+            height=height or infos[0]["height"],
+            top=top,
+            right=right,
+            left=left,
+            bottom=bottom,
+        )
+        self.set_attribute(name="video_paths", value=list(video_paths))
+        self.set_attribute(name="prefetch", value=prefetch)
+        self.offsets = offsets
+        self._reader: Optional[Tuple[int, SequentialReader]] = None
+        self._prefetch: Optional[Tuple[int, SequentialReader, threading.Thread]] = None
+
+    def rescale(self, scale: float) -> None:
+        # Do not share decoders with the original element.
+        self._reader = None
+        self._prefetch = None
+
+    def clip_at(self, pos: int) -> Tuple[int, int]:
+        """The index of the clip shown at ``pos`` and the position in the clip.
+
+        Args:
+            pos (int) : The current position in the video.
+
+        Returns:
+            Tuple[int, int]: The index of the clip and the position in the clip.
+        """
+        idx = int(np.searchsorted(self.offsets, pos, side="right")) - 1
+        idx = min(max(idx, 0), len(self.video_paths) - 1)
+        return (idx, pos - int(self.offsets[idx]))
+
+    def open(self, idx: int) -> SequentialReader:
+        """Make the ``idx``-th clip the current one, closing the previous decoder (and taking the prefetched one if it is the clip.)"""
+        if (self._reader is not None) and (self._reader[0] == idx):
+            return self._reader[1]
+        if self._reader is not None:
+            self._reader[1].release()
+        reader = None
+        if self._prefetch is not None:
+            prefetched_idx, prefetched, thread = self._prefetch
+            thread.join()
+            if prefetched_idx == idx:
+                reader = prefetched
+            else:
+                prefetched.release()
+            self._prefetch = None
+        if reader is None:
+            reader = SequentialReader(
+                path=self.video_paths[idx], dsize=(self.width, self.height)
+            )
+        self._reader = (idx, reader)
+        return reader
+
+    def prefetch_next(self, idx: int) -> None:
+        """Open the ``idx``-th clip and decode its first frame in a background thread."""
+        if (idx >= len(self.video_paths)) or (self._prefetch is not None):
+            return
+        reader = SequentialReader(
+            path=self.video_paths[idx], dsize=(self.width, self.height)
+        )
+        thread = threading.Thread(target=reader.read, args=(0,), daemon=True)
+        thread.start()
+        self._prefetch = (idx, reader, thread)
+
+    def read(self, pos: int) -> Optional[npt.NDArray[np.uint8]]:
+        """Read the frame of the clip which is shown at ``pos``, resized to the element size.
+
+        Args:
+            pos (int) : The current position in the video.
+
+        Returns:
+            Optional[npt.NDArray[np.uint8]]: The frame, or ``None`` if this element is not in charge of ``pos`` or the frame cannot be read.
+        """
+        if not self.inCharge(pos):
+            return None
+        idx, clip_pos = self.clip_at(pos)
+        frame = self.open(idx).read(pos=clip_pos)
+        if pos >= self.offsets[idx + 1] - self.prefetch:
+            self.prefetch_next(idx + 1)
+        return frame
+
+    def edit(self, frame: npt.NDArray[np.uint8], pos: int) -> npt.NDArray[np.uint8]:
+        """Paste the frame of the clip which is shown at ``pos``.
+
+        Args:
+            frame (npt.NDArray[np.uint8]) : The current frame (BGR image) in the video.
+            pos (int)                     : The current position in the video.
+
+        Returns:
+            npt.NDArray[np.uint8]: An editied frame.
+        """
+        clip_frame = self.read(pos=pos)
+        if clip_frame is not None:
+            frame = self.paste_sprite(frame=frame, pos=pos, premultiplied=clip_frame)
+        return frame
@@ -0,0 +1,309 @@
+# coding: utf-8
+import math
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+from PIL import Image, ImageDraw, ImageFont
+
+from ..utils.cache_utils import LRUCache
+from ..utils.image_utils import overlay_bgra, pil2bgra
+from ..utils.subtitle_utils import load_subtitles, merge_cues
+from .base import BaseElement, FixedElement
+
+
+def measure_text(
+    text: str,
+    font: ImageFont.FreeTypeFont,
+    spacing: int = 4,
+    align: str = "left",
+    stroke_width: int = 0,
+) -> Tuple[int, int]:
+    """Calculate the size of (multiline) ``text`` without rasterizing it.
+
+    Args:
+        text (str)                   : Text to be measured.
+        font (ImageFont.FreeTypeFont) : A font object.
+        spacing (int, optional)      : The number of pixels between lines. Defaults to ``4``.
+        align (str, optional)        : Determines the relative alignment of lines. Defaults to ``"left"``.
+        stroke_width (int, optional) : The width of the text stroke. Defaults to ``0``.
+
+    Returns:
+        Tuple[int, int]: The size of ``text`` (``width``, ``height``)
+    """
+    draw = ImageDraw.Draw(Image.new(mode="L", size=(1, 1)))
+    x0, y0, x1, y1 = draw.multiline_textbbox(
+        xy=(0, 0),
+        text=text,
+        font=font,
+        spacing=spacing,
+        align=align,
+        stroke_width=stroke_width,
+    )
+    return (math.ceil(x1 - min(x0, 0)), math.ceil(y1 - min(y0, 0)))
+
+
+class SubtitleTrackElement(FixedElement):
+    def __init__(
+        self,
+        subtitles: Union[str, List[Tuple[int, int, str]]],
+        ttfontname: str,
+        fps: float = 30.0,
+        start_pos: int = 0,
+        margin: Union[int, List[int]] = 0,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        top: Optional[Union[BaseElement, int]] = None,
+        right: Optional[Union[BaseElement, int]] = None,
+        left: Optional[Union[BaseElement, int]] = None,
+        bottom: Optional[Union[BaseElement, int]] = None,
+        textRGB: Union[str, Tuple] = "white",
+        fontsize: int = 16,
+        spacing: int = 4,
+        align: str = "center",
+        stroke_width: int = 0,
+        stroke_fill: Optional[Union[str, Tuple]] = None,
+        bgRGBA: Optional[Tuple[int, int, int, int]] = None,
+        cache_size: int = 64,
+    ):
+        """Subtitle track which renders timed cues (SRT / WebVTT) with one element.
+
+        Overlapping cues are merged into non-overlapping ones (See :func:`merge_cues <veditor.utils.subtitle_utils.merge_cues>`), and they are indexed by their start positions, so the active cue is found by binary search (``O(log n)``). Each distinct cue text is rasterized only once into a BGRA sprite and kept in an LRU cache, and only the active sprite is blended into the region of interest for each frame.
+
+        Args:
+            subtitles (Union[str, List[Tuple[int, int, str]]])   : Path to the subtitle file (``.srt`` or ``.vtt``), or a list of cues (``start [ms]``, ``end [ms]``, ``text``).
+            ttfontname (str)                                     : A filename or file-like object containing a TrueType font.
+            fps (float, optional)                                : Frame rate used to convert cue timestamps into positions. Defaults to ``30.0``.
+            start_pos (int, optional)                            : The position where the subtitle timestamps start. Defaults to ``0``.
+            margin (Optional[Union[int, List[int]]], optional)   : Margin. Defaults to ``None``.
+            width (Optional[int], optional)                      : The element width. Defaults to ``None``. (The widest cue.)
+            height (Optional[int], optional)                     : The element height. Defaults to ``None``. (The tallest cue.)
+            top (Optional[Union[BaseElement, int]], optional)    : Reference element or absolute value at the top. Defaults to ``None``.
+            right (Optional[Union[BaseElement, int]], optional)  : Reference element or absolute value at the right. Defaults to ``None``.
+            left (Optional[Union[BaseElement, int]], optional)   : Reference element or absolute value at the left. Defaults to ``None``.
+            bottom (Optional[Union[BaseElement, int]], optional) : Reference element or absolute value at the bottom. Defaults to ``None``.
+            textRGB (Union[str, Tuple], optional)                : The color of text. Defaults to ``"white"``.
+            fontsize (int, optional)                             : The font size. Defaults to ``16``.
+            spacing (int, optional)                              : The number of pixels between lines. Defaults to ``4``.
+            align (str, optional)                                : Determines the relative alignment of lines. Defaults to ``"center"``.
+            stroke_width (int, optional)                         : The width of the text stroke. Defaults to ``0``.
+            stroke_fill (Optional[Union[str, Tuple]], optional)  : Color to use for the text stroke. Defaults to ``None``.
+            bgRGBA (Optional[Tuple[int, int, int, int]], optional) : The color of the box behind each cue. Defaults to ``None``. (Transparent.)
+            cache_size (int, optional)                           : The maximum number of cue sprites to keep. Defaults to ``64``.
+
+        Examples:
+            >>> from veditor.elements import SubtitleTrackElement
+            >>> from veditor.utils import SampleData
+            >>> element = SubtitleTrackElement(
+            ...     subtitles=[(0, 1000, "Hello"), (1000, 2000, "World")],
+            ...     ttfontname=SampleData().FONT_POKEFONT_PATH,
+            ...     fps=30, left=0, bottom=360,
+            ... )
+            >>> element.get_cue(pos=45)
+            'World'
+        """
+        if isinstance(subtitles, str):
+            subtitles = load_subtitles(subtitles)
+        cues = merge_cues(subtitles)
+        end_pos = start_pos
+        if len(cues) > 0:
+            end_pos += int(round(max(e for _, e, _ in cues) * fps / 1000))
+        super().__init__(
+            pos_frames=(start_pos, end_pos),
+            margin=margin,
+            width=width,
+            height=height,
+            top=top,
+            right=right,
+            left=left,
+            bottom=bottom,
+            **dict(
+                cues=cues,
+                ttfontname=ttfontname,
+                fontsize=fontsize,
+                spacing=spacing,
+                align=align,
+                stroke_width=stroke_width,
+            ),  # kwargs
+        )
+        self.set_subtitle_attributes(
+            cues=cues,
+            fps=fps,
+            ttfontname=ttfontname,
+            textRGB=textRGB,
+            fontsize=fontsize,
+            spacing=spacing,
+            align=align,
+            stroke_width=stroke_width,
+            stroke_fill=stroke_fill,
+            bgRGBA=bgRGBA,
+            cache_size=cache_size,
+        )
+
+    def set_subtitle_attributes(
+        self,
+        cues: List[Tuple[int, int, str]],
+        fps: float,
+        ttfontname: str,
+        textRGB: Union[str, Tuple] = "white",
+        fontsize: int = 16,
+        spacing: int = 4,
+        align: str = "center",
+        stroke_width: int = 0,
+        stroke_fill: Optional[Union[str, Tuple]] = None,
+        bgRGBA: Optional[Tuple[int, int, int, int]] = None,
+        cache_size: int = 64,
+    ) -> None:
+        """Set attributes for a subtitle track, and build the cue index.
+
+        Args:
+            cues (List[Tuple[int, int, str]]) : Non-overlapping cues sorted by start time.
+            fps (float)                       : Frame rate used to convert cue timestamps into positions.
+
+        Other arguments are the same as :class:`SubtitleTrackElement <veditor.elements.subtitle.SubtitleTrackElement>`.
+        """
+        msec2pos = lambda msec: self.start_pos + int(round(msec * fps / 1000))
+        self.set_attribute(name="fps", value=fps)
+        self.set_attribute(
+            name="cue_starts",
+            value=np.asarray([msec2pos(s) for s, _, _ in cues], dtype=np.int64),
+            msg=f"{len(cues)} cues are indexed.",
+        )
+        self.set_attribute(
+            name="cue_ends",
+            value=np.asarray([msec2pos(e) for _, e, _ in cues], dtype=np.int64),
+            msg=f"{len(cues)} cues are indexed.",
+        )
+        self.set_attribute(
+            name="cue_texts", value=[text for _, _, text in cues], msg=""
+        )
+        self.set_attribute(name="ttfontname", value=ttfontname)
+        self.set_attribute(
+            name="font", value=ImageFont.truetype(font=ttfontname, size=int(fontsize))
+        )
+        self.set_attribute(name="textRGB", value=textRGB)
+        self.set_attribute(name="fontsize", value=fontsize)
+        self.set_attribute(name="spacing", value=spacing)
+        self.set_attribute(name="align", value=align)
+        self.set_attribute(name="stroke_width", value=stroke_width)
+        self.set_attribute(name="stroke_fill", value=stroke_fill)
+        self.set_attribute(name="bgRGBA", value=bgRGBA)
+        self.set_attribute(name="sprites", value=LRUCache(maxsize=cache_size))
+
+    def calc_element_size(
+        self,
+        cues: List[Tuple[int, int, str]],
+        ttfontname: str,
+        fontsize: int = 16,
+        spacing: int = 4,
+        align: str = "center",
+        stroke_width: int = 0,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        **kwargs,
+    ) -> Tuple[int, int]:
+        if (width is None) or (height is None):
+            font = ImageFont.truetype(font=ttfontname, size=int(fontsize))
+            sizes = [
+                measure_text(
+                    text=text,
+                    font=font,
+                    spacing=spacing,
+                    align=align,
+                    stroke_width=stroke_width,
+                )
+                for text in set(text for _, _, text in cues)
+            ] or [(0, 0)]
+            if width is None:
+                width = max(w for w, _ in sizes)
+            if height is None:
+                height = max(h for _, h in sizes)
+        return (width, height)
+
+    def get_cue(self, pos: int) -> Optional[str]:
+        """Find the cue which is active at ``pos`` by binary search.
+
+        Args:
+            pos (int) : The current position (in the video)
+
+        Returns:
+            Optional[str]: The text of the active cue. If no cue is active, return ``None``.
+        """
+        i = int(np.searchsorted(self.cue_starts, pos, side="right")) - 1
+        if (i >= 0) and (pos < self.cue_ends[i]):
+            return self.cue_texts[i]
+        return None
+
+    def rasterize(self, text: str) -> npt.NDArray[np.uint8]:
+        """Rasterize ``text`` into a BGRA sprite.
+
+        Args:
+            text (str) : A cue text.
+
+        Returns:
+            npt.NDArray[np.uint8]: A BGRA sprite.
+        """
+        w, h = measure_text(
+            text=text,
+            font=self.font,
+            spacing=self.spacing,
+            align=self.align,
+            stroke_width=self.stroke_width,
+        )
+        img = Image.new(
+            mode="RGBA", size=(max(w, 1), max(h, 1)), color=self.bgRGBA or (0, 0, 0, 0)
+        )
+        ImageDraw.Draw(img).multiline_text(
+            xy=(0, 0),
+            text=text,
+            fill=self.textRGB,
+            font=self.font,
+            spacing=self.spacing,
+            align=self.align,
+            stroke_width=self.stroke_width,
+            stroke_fill=self.stroke_fill,
+        )
+        return pil2bgra(img)
+
+    def get_sprite(self, text: str) -> npt.NDArray[np.uint8]:
+        """Return the (cached) BGRA sprite of ``text``.
+
+        Args:
+            text (str) : A cue text.
+
+        Returns:
+            npt.NDArray[np.uint8]: A BGRA sprite.
+        """
+        return self.sprites.get_or_create(key=text, create=lambda: self.rasterize(text))
+
+    def rescale(self, scale: float) -> None:
+        self.fontsize = max(1, int(round(self.fontsize * scale)))
+        self.font = ImageFont.truetype(font=self.ttfontname, size=self.fontsize)
+        self.spacing = int(round(self.spacing * scale))
+        self.stroke_width = int(round(self.stroke_width * scale))
+        self.sprites = LRUCache(maxsize=self.sprites.maxsize)
+
+    def edit(
+        self, frame: npt.NDArray[np.uint8], pos: int, **kwargs
+    ) -> npt.NDArray[np.uint8]:
+        """Blend the active cue into a ``pos``-th frame. Cues are aligned to the bottom center of this element.
+
+        Args:
+            frame (npt.NDArray[np.uint8]) : The current frame (BGR image) (in the video)
+            pos (int)                     : The current position (in the video)
+
+        Returns:
+            npt.NDArray[np.uint8]: An editied frame.
+        """
+        if self.inCharge(pos):
+            text = self.get_cue(pos)
+            if text is not None:
+                sprite = self.get_sprite(text)
+                h, w = sprite.shape[:2]
+                frame = overlay_bgra(
+                    frame=frame,
+                    paste=sprite,
+                    top=self.bottom - h,
+                    left=self.left + (self.width - w) // 2,
+                )
+        return frame
@@ -1,11 +1,12 @@
 # coding: utf-8
-from typing import List, Optional, Tuple, Union
+from typing import Callable, List, Optional, Tuple, Union
 
 import numpy as np
 import numpy.typing as npt
 from PIL import Image
 
-from ..utils.image_utils import arr2pil, draw_text_in_pil, pil2arr
+from ..utils.glyph_utils import get_glyph_atlas
+from ..utils.image_utils import arr2pil, draw_text_in_pil, overlay_bgra, pil2arr
 from .base import BaseElement, FixedElement
 
 
@@ -128,6 +129,14 @@ class TextElement(FixedElement):
             **kwargs,
         )
 
+    def rescale(self, scale: float) -> None:
+        self.fontsize = max(1, int(round(self.fontsize * scale)))
+        self.xy = tuple(int(round(v * scale)) for v in self.xy)
+        self.drawKwargs = {
+            k: int(round(v * scale)) if k in ["stroke_width", "spacing"] else v
+            for k, v in self.drawKwargs.items()
+        }
+
     def edit(
         self, frame: npt.NDArray[np.uint8], pos: int, **kwargs
     ) -> npt.NDArray[np.uint8]:
@@ -145,3 +154,203 @@ class TextElement(FixedElement):
             img, _ = self.draw_text(img)
             frame = pil2arr(img)
         return frame
+
+
+class DynamicTextElement(FixedElement):
+    def __init__(
+        self,
+        text: Union[str, Callable[[int], str]],
+        ttfontname: str,
+        pos_frames: Tuple[int, Optional[int]] = (0, None),
+        fps: float = 30.0,
+        margin: Union[int, List[int]] = 0,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        top: Optional[Union[BaseElement, int]] = None,
+        right: Optional[Union[BaseElement, int]] = None,
+        left: Optional[Union[BaseElement, int]] = None,
+        bottom: Optional[Union[BaseElement, int]] = None,
+        textRGB: Union[str, Tuple] = "black",
+        fontsize: int = 16,
+        spacing: int = 4,
+        stroke_width: int = 0,
+        stroke_fill: Optional[Union[str, Tuple]] = None,
+    ):
+        """Text element whose text changes every frame (counters, timers, scoreboards, ...)
+
+        Text is composed from the shared :class:`GlyphAtlas <veditor.utils.glyph_utils.GlyphAtlas>`, so each frame only costs copies of glyph quads instead of a full drawing by ``PIL``.
+
+        Args:
+            text (Union[str, Callable[[int], str]])              : A format string (``pos`` and ``sec`` relative to the start position are available. e.g. ``"{pos:05d}"``), or a function which receives the current position and returns the text.
+            ttfontname (str)                                     : A filename or file-like object containing a TrueType font.
+            pos_frames (Tuple[int, Optional[int]], optional)     : Start and end positions. Defaults to ``(0, None)``.
+            fps (float, optional)                                : Frame rate used to calculate ``sec``. Defaults to ``30.0``.
+            margin (Optional[Union[int, List[int]]], optional)   : Margin. Defaults to ``None``.
+            width (Optional[int], optional)                      : The element width. Defaults to ``None``. (The width of the widest text over ``pos_frames``.)
+            height (Optional[int], optional)                     : The element height. Defaults to ``None``. (The height of the tallest text over ``pos_frames``.)
+            top (Optional[Union[BaseElement, int]], optional)    : Reference element or absolute value at the top. Defaults to ``None``.
+            right (Optional[Union[BaseElement, int]], optional)  : Reference element or absolute value at the right. Defaults to ``None``.
+            left (Optional[Union[BaseElement, int]], optional)   : Reference element or absolute value at the left. Defaults to ``None``.
+            bottom (Optional[Union[BaseElement, int]], optional) : Reference element or absolute value at the bottom. Defaults to ``None``.
+            textRGB (Union[str, Tuple], optional)                : The color of text. Defaults to ``"black"``.
+            fontsize (int, optional)                             : The font size. Defaults to ``16``.
+            spacing (int, optional)                              : The number of pixels between lines. Defaults to ``4``.
+            stroke_width (int, optional)                         : The width of the text stroke. Defaults to ``0``.
+            stroke_fill (Optional[Union[str, Tuple]], optional)  : Color to use for the text stroke. Defaults to ``None``.
+
+        Raises:
+            ValueError: When ``width`` or ``height`` is omitted and the end position is ``None``.
+
+        Examples:
+            >>> from veditor.elements import DynamicTextElement
+            >>> from veditor.utils import SampleData
+            >>> element = DynamicTextElement(text="{sec:.1f}[s]", ttfontname=SampleData().FONT_POKEFONT_PATH, pos_frames=(0, 300), fps=30, top=0, left=0)
+            >>> element.get_text(pos=45)
+            '1.5[s]'
+        """
+        super().__init__(
+            pos_frames=pos_frames,
+            margin=margin,
+            width=width,
+            height=height,
+            top=top,
+            right=right,
+            left=left,
+            bottom=bottom,
+            **dict(
+                text=text,
+                fps=fps,
+                start_pos=pos_frames[0],
+                end_pos=pos_frames[1],
+                ttfontname=ttfontname,
+                fontsize=fontsize,
+                spacing=spacing,
+                stroke_width=stroke_width,
+            ),  # kwargs
+        )
+        self.set_text_attributes(
+            text=text,
+            fps=fps,
+            ttfontname=ttfontname,
+            textRGB=textRGB,
+            fontsize=fontsize,
+            spacing=spacing,
+            stroke_width=stroke_width,
+            stroke_fill=stroke_fill,
+        )
+
+    def set_text_attributes(
+        self,
+        text: Union[str, Callable[[int], str]],
+        fps: float,
+        ttfontname: str,
+        textRGB: Union[str, Tuple] = "black",
+        fontsize: int = 16,
+        spacing: int = 4,
+        stroke_width: int = 0,
+        stroke_fill: Optional[Union[str, Tuple]] = None,
+    ) -> None:
+        """Set attributes for a dynamic text element.
+
+        Arguments are the same as :class:`DynamicTextElement <veditor.elements.text.DynamicTextElement>`.
+        """
+        self.set_attribute(name="text", value=text)
+        self.set_attribute(name="fps", value=fps)
+        self.set_attribute(name="ttfontname", value=ttfontname)
+        self.set_attribute(name="textRGB", value=textRGB)
+        self.set_attribute(name="fontsize", value=fontsize)
+        self.set_attribute(name="spacing", value=spacing)
+        self.set_attribute(name="stroke_fill", value=stroke_fill)
+        self.set_attribute(
+            name="atlas",
+            value=get_glyph_atlas(
+                ttfontname=ttfontname, fontsize=fontsize, stroke_width=stroke_width
+            ),
+        )
+
+    @staticmethod
+    def format_text(
+        text: Union[str, Callable[[int], str]], pos: int, start_pos: int, fps: float
+    ) -> str:
+        """Create the text for ``pos``."""
+        if callable(text):
+            return text(pos)
+        return text.format(pos=pos - start_pos, sec=(pos - start_pos) / fps)
+
+    def get_text(self, pos: int) -> str:
+        """Return the text which is drawn at ``pos``.
+
+        Args:
+            pos (int) : The current position (in the video)
+
+        Returns:
+            str: The text for ``pos``.
+        """
+        return self.format_text(
+            text=self.text, pos=pos, start_pos=self.start_pos, fps=self.fps
+        )
+
+    def calc_element_size(
+        self,
+        text: Union[str, Callable[[int], str]],
+        fps: float,
+        start_pos: int,
+        end_pos: Optional[int],
+        ttfontname: str,
+        fontsize: int = 16,
+        spacing: int = 4,
+        stroke_width: int = 0,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        **kwargs,
+    ) -> Tuple[int, int]:
+        if (width is None) or (height is None):
+            if end_pos is None:
+                raise ValueError(
+                    "The size of the text can not be measured over an open-ended range. Specify the end position, or both width and height."
+                )
+            atlas = get_glyph_atlas(
+                ttfontname=ttfontname, fontsize=fontsize, stroke_width=stroke_width
+            )
+            # Every text which is drawn must fit in the element, so measure the widest and tallest one.
+            texts = {
+                self.format_text(text=text, pos=pos, start_pos=start_pos, fps=fps)
+                for pos in range(start_pos, end_pos + 1)
+            }
+            sizes = [atlas.measure(text=t, spacing=spacing) for t in texts]
+            width = width or max(w for w, _ in sizes)
+            height = height or max(h for _, h in sizes)
+        return (width, height)
+
+    def rescale(self, scale: float) -> None:
+        self.fontsize = max(1, int(round(self.fontsize * scale)))
+        self.spacing = int(round(self.spacing * scale))
+        self.atlas = get_glyph_atlas(
+            ttfontname=self.ttfontname,
+            fontsize=self.fontsize,
+            stroke_width=int(round(self.atlas.stroke_width * scale)),
+        )
+
+    def edit(
+        self, frame: npt.NDArray[np.uint8], pos: int, **kwargs
+    ) -> npt.NDArray[np.uint8]:
+        """Draw the text for ``pos`` by blitting glyph quads.
+
+        Args:
+            frame (npt.NDArray[np.uint8]) : The current frame (BGR image) (in the video)
+            pos (int)                     : The current position (in the video)
+
+        Returns:
+            npt.NDArray[np.uint8]: An editied frame.
+        """
+        if self.inCharge(pos):
+            sprite = self.atlas.render(
+                text=self.get_text(pos),
+                textRGB=self.textRGB,
+                stroke_fill=self.stroke_fill,
+                spacing=self.spacing,
+            )
+            frame = overlay_bgra(
+                frame=frame, paste=sprite, top=self.top, left=self.left
+            )
+        return frame
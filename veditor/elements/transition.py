@@ -0,0 +1,160 @@
+# coding: utf-8
+from typing import Dict, List, Optional, Tuple, Union
+
+import cv2
+import numpy as np
+import numpy.typing as npt
+
+from ..utils.generic_utils import handleKeyError, object_fingerprint
+from ..utils.image_utils import resize_image
+from ..utils.track_utils import Easing, cubic_bezier
+from .base import BaseElement, FixedElement
+from .video import VideoElement
+
+SUPPORTED_TRANSITIONS: List[str] = ["crossfade", "wipe", "slide"]
+# Direction in which the boundary between clips moves.
+SUPPORTED_DIRECTIONS: List[str] = ["left", "right", "up", "down"]
+
+
+class TransitionElement(FixedElement):
+    def __init__(
+        self,
+        a: VideoElement,
+        b: VideoElement,
+        pos_frames: Optional[Tuple[int, int]] = None,
+        kind: str = "crossfade",
+        direction: str = "left",
+        easing: Easing = "linear",
+        margin: Union[int, List[int]] = 0,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+        top: Optional[Union[BaseElement, int]] = None,
+        right: Optional[Union[BaseElement, int]] = None,
+        left: Optional[Union[BaseElement, int]] = None,
+        bottom: Optional[Union[BaseElement, int]] = None,
+    ):
+        """Transition from the video ``a`` to the video ``b``.
+
+        Frames of ``a`` and ``b`` are read through :meth:`VideoElement.read <veditor.elements.video.VideoElement.read>`, so each video is decoded forward by one decoder, and the frames which ``a`` and ``b`` themselves paste at the same position are not decoded again. The transition is blended in place into the region of the frame (no full-frame buffer is allocated), and the progress of all positions is precomputed once.
+
+        Args:
+            a (VideoElement)                                     : The outgoing video.
+            b (VideoElement)                                     : The incoming video.
+            pos_frames (Optional[Tuple[int, int]], optional)     : Start and end positions. Defaults to ``None``. (The overlap of ``a`` and ``b``.)
+            kind (str, optional)                                 : Kind of the transition. (See ``SUPPORTED_TRANSITIONS``) Defaults to ``"crossfade"``.
+            direction (str, optional)                            : Direction in which the boundary moves in ``"wipe"`` and ``"slide"``. (See ``SUPPORTED_DIRECTIONS``) Defaults to ``"left"``.
+            easing (Easing, optional)                            : Easing of the progress. (See :func:`cubic_bezier <veditor.utils.track_utils.cubic_bezier>`) Defaults to ``"linear"``.
+            margin (Union[int, List[int]], optional)             : Margin. Defaults to ``0``.
+            width (Optional[int], optional)                      : The element width. Defaults to ``None``. (Same as ``a``.)
+            height (Optional[int], optional)                     : The element height. Defaults to ``None``. (Same as ``a``.)
+            top (Optional[Union[BaseElement, int]], optional)    : Reference element or absolute value at the top. Defaults to ``None``. (Same as ``a``.)
+            right (Optional[Union[BaseElement, int]], optional)  : Reference element or absolute value at the right. Defaults to ``None``.
+            left (Optional[Union[BaseElement, int]], optional)   : Reference element or absolute value at the left. Defaults to ``None``. (Same as ``a``.)
+            bottom (Optional[Union[BaseElement, int]], optional) : Reference element or absolute value at the bottom. Defaults to ``None``.
+
+        Raises:
+            ValueError: When the transition has no length.
+        """
+        handleKeyError(lst=SUPPORTED_TRANSITIONS, kind=kind)
+        handleKeyError(lst=SUPPORTED_DIRECTIONS, direction=direction)
+        if pos_frames is None:
+            pos_frames = (b.start_pos, a.end_pos)
+        start, end = pos_frames
+        if (end is None) or (end <= start):
+            raise ValueError(
+                f"The transition must end after it starts, but got pos_frames={pos_frames}."
+            )
+        if (top is None) and (bottom is None):
+            top = a.top
+        if (left is None) and (right is None):
+            left = a.left
+        super().__init__(
+            pos_frames=pos_frames,
+            margin=margin,
+            width=width or a.width,
+            height=height or a.height,
+            top=top,
+            right=right,
+            left=left,
+            bottom=bottom,
+        )
+        self.set_attribute(name="a", value=a)
+        self.set_attribute(name="b", value=b)
+        self.set_attribute(name="kind", value=kind)
+        self.set_attribute(name="direction", value=direction)
+        self.set_attribute(name="easing", value=easing)
+        # Eased progress of each position in the transition.
+        self.progress = cubic_bezier(np.linspace(0, 1, end - start + 1), easing=easing)
+
+    def fingerprint(self) -> str:
+        # Other elements contribute only their type names to ``object_fingerprint``.
+        return object_fingerprint(
+            super().fingerprint(), self.a.fingerprint(), self.b.fingerprint()
+        )
+
+    def scaled(
+        self, scale: float, memo: Optional[Dict[int, FixedElement]] = None
+    ) -> "TransitionElement":
+        # Share the copies of ``a`` and ``b`` with the scaled editor (one decoder per video.)
+        memo = {} if memo is None else memo
+        element = super().scaled(scale=scale, memo=memo)
+        element.a = self.a.scaled(scale=scale, memo=memo)
+        element.b = self.b.scaled(scale=scale, memo=memo)
+        return element
+
+    def read(self, element: VideoElement, pos: int) -> Optional[npt.NDArray[np.uint8]]:
+        """Read the frame of ``element`` at ``pos`` in the size of this element."""
+        frame = element.read(pos=pos)
+        if frame is not None:
+            frame = resize_image(frame, dsize=(self.width, self.height))
+        return frame
+
+    def edit(self, frame: npt.NDArray[np.uint8], pos: int) -> npt.NDArray[np.uint8]:
+        """Blend the frames of ``a`` and ``b`` at ``pos`` into ``frame``.
+
+        Args:
+            frame (npt.NDArray[np.uint8]) : The current frame (BGR image) in the video.
+            pos (int)                     : The current position in the video.
+
+        Returns:
+            npt.NDArray[np.uint8]: An editied frame.
+        """
+        if not self.inCharge(pos):
+            return frame
+        frame_a = self.read(self.a, pos=pos)
+        frame_b = self.read(self.b, pos=pos)
+        if (frame_a is None) and (frame_b is None):
+            return frame
+        roi = frame[
+            self.top : self.top + self.height, self.left : self.left + self.width
+        ]
+        if (frame_a is None) or (frame_b is None):
+            src = frame_b if frame_a is None else frame_a
+            roi[:] = src[: roi.shape[0], : roi.shape[1]]
+            return frame
+        frame_a = frame_a[: roi.shape[0], : roi.shape[1]]
+        frame_b = frame_b[: roi.shape[0], : roi.shape[1]]
+        p = float(self.progress[pos - self.start_pos])
+        if self.kind == "crossfade":
+            roi[:] = cv2.addWeighted(frame_a, 1 - p, frame_b, p, 0)
+            return frame
+        # Vertical transitions are the horizontal ones on transposed views.
+        if self.direction in ["up", "down"]:
+            roi, frame_a, frame_b = [x.swapaxes(0, 1) for x in (roi, frame_a, frame_b)]
+        w = roi.shape[1]
+        x = int(round(p * w))
+        if self.direction in ["left", "up"]:
+            if self.kind == "wipe":
+                roi[:, : w - x] = frame_a[:, : w - x]
+                roi[:, w - x :] = frame_b[:, w - x :]
+            else:
+                roi[:, : w - x] = frame_a[:, x:]
+                roi[:, w - x :] = frame_b[:, :x]
+        else:
+            if self.kind == "wipe":
+                roi[:, :x] = frame_b[:, :x]
+                roi[:, x:] = frame_a[:, x:]
+            else:
+                roi[:, :x] = frame_b[:, w - x :]
+                roi[:, x:] = frame_a[:, : w - x]
+        return frame
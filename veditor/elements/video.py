@@ -1,6 +1,6 @@
 # coding: utf-8
 import os
-from typing import List, Optional, Tuple, Union
+from typing import List, Optional, Set, Tuple, Union
 
 import cv2
 import numpy as np
@@ -9,11 +9,15 @@ from PIL import Image
 from tqdm import tqdm
 
 from ..utils.audio_utils import synthesize_audio
-from ..utils.video_utils import capture2writor
+from ..utils.media_utils import probe_media
+from ..utils.timing_utils import frame_schedule, probe_frame_times
+from ..utils.video_utils import SequentialReader, capture2writor, keyframe_index
 from .base import BaseElement, FixedElement
 
 
 class VideoElement(FixedElement):
+    _TRANSIENT: Set[str] = {"_reader", "proxy_path", "decode_path"}
+
     def __init__(
         self,
         video_path: str,
@@ -25,10 +29,51 @@ class VideoElement(FixedElement):
         right: Optional[Union[BaseElement, int]] = None,
         left: Optional[Union[BaseElement, int]] = 0,
         bottom: Optional[Union[BaseElement, int]] = None,
+        in_pos: int = 0,
+        out_pos: Optional[int] = None,
+        timeline_fps: Optional[float] = None,
     ):
-        cap = cv2.VideoCapture(video_path)
+        """Video pasted from ``start_pos``.
+
+        Only the subclip ``[in_pos, out_pos)`` of the source is played. Its first frame is reached by one seek to the preceding keyframe (See :func:`keyframe_index <veditor.utils.video_utils.keyframe_index>`) and decoding forward, and then frames are streamed sequentially, so the rest of the source is never decoded.
+
+        When ``timeline_fps`` differs from the frame rate of the source, source frames are duplicated or dropped by their presentation timestamps (See :func:`frame_schedule <veditor.utils.timing_utils.frame_schedule>`), so the video plays at its real speed. The source frame of each position is precomputed as ``schedule``.
+
+        Args:
+            video_path (str)                                     : Path to the video.
+            start_pos (int, optional)                            : The position where the video starts. Defaults to ``0``.
+            margin (Union[int, List[int]], optional)             : Margin. Defaults to ``0``.
+            width (Optional[int], optional)                      : The element width. Defaults to ``None``. (Same as the video.)
+            height (Optional[int], optional)                     : The element height. Defaults to ``None``. (Same as the video.)
+            top (Optional[Union[BaseElement, int]], optional)    : Reference element or absolute value at the top. Defaults to ``0``.
+            right (Optional[Union[BaseElement, int]], optional)  : Reference element or absolute value at the right. Defaults to ``None``.
+            left (Optional[Union[BaseElement, int]], optional)   : Reference element or absolute value at the left. Defaults to ``0``.
+            bottom (Optional[Union[BaseElement, int]], optional) : Reference element or absolute value at the bottom. Defaults to ``None``.
+            in_pos (int, optional)                               : The first frame of the source to play. Defaults to ``0``.
+            out_pos (Optional[int], optional)                    : The frame of the source to stop at (exclusive.) Defaults to ``None``. (The end of the source.)
+            timeline_fps (Optional[float], optional)             : Frame rate of the timeline (the base video.) Defaults to ``None``. (Same as the source.)
+
+        Raises:
+            ValueError: When ``[in_pos, out_pos)`` is not a non-empty range in the video.
+        """
+        frame_count = probe_media(video_path)["frame_count"]
+        if out_pos is None:
+            out_pos = frame_count
+        if not (0 <= in_pos < out_pos <= frame_count):
+            raise ValueError(
+                f"The subclip must be in [0, {frame_count}], but got [{in_pos}, {out_pos})."
+            )
+        if timeline_fps is None:
+            schedule = np.arange(in_pos, out_pos, dtype=np.int64)
+        else:
+            schedule = frame_schedule(
+                probe_frame_times(video_path),
+                fps=timeline_fps,
+                start=in_pos,
+                end=out_pos,
+            )
         super().__init__(
-            pos_frames=(start_pos, start_pos + int(cap.get(cv2.CAP_PROP_FRAME_COUNT))),
+            pos_frames=(start_pos, start_pos + len(schedule)),
             margin=margin,
             width=width,
             height=height,
@@ -40,6 +85,10 @@ class VideoElement(FixedElement):
         )
         self.set_video_attributes(video_path=video_path)
         self.set_attribute(name="video_start_pos", value=start_pos)
+        self.set_attribute(name="in_pos", value=in_pos)
+        self.set_attribute(name="out_pos", value=out_pos)
+        self.set_attribute(name="timeline_fps", value=timeline_fps)
+        self.schedule = schedule
 
     def calc_element_size(
         self,
@@ -48,20 +97,37 @@ class VideoElement(FixedElement):
         height: Optional[int] = None,
         **kwargs,
     ) -> Tuple[int, int]:
-        cap = cv2.VideoCapture(video_path)
+        info = probe_media(video_path)  # Read from the header (without decoding.)
         if width is None:
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            width = info["width"]
         if height is None:
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            height = info["height"]
         return (width, height)
 
     def set_video_attributes(self, video_path: str) -> None:
-        cap = cv2.VideoCapture(video_path)
-        self.set_attribute(
-            name="frame_count", value=int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        )
-        self.set_attribute(name="fps", value=cap.get(cv2.CAP_PROP_FPS))
+        info = probe_media(video_path)
+        self.set_attribute(name="frame_count", value=info["frame_count"])
+        self.set_attribute(name="fps", value=info["fps"])
         self.set_attribute(name="video_path", value=video_path)
+        self.set_attribute(name="decode_path", value=video_path)
+        self.set_attribute(name="proxy_path", value=None)
+        self._reader: Optional[SequentialReader] = None
+
+    def set_proxy(self, proxy_path: Optional[str], decode: bool = False) -> None:
+        """Set the low-resolution proxy of ``video_path`` which is decoded in preview rendering.
+
+        Args:
+            proxy_path (Optional[str]) : Path to the proxy video. If ``None``, previews decode ``video_path``.
+            decode (bool, optional)    : Whether to decode the proxy right away (for a scaled copy.) Defaults to ``False``. (Only scaled copies created after this call decode it.)
+        """
+        self.set_attribute(name="proxy_path", value=proxy_path)
+        if decode:
+            self.decode_path = proxy_path or self.video_path
+            self._reader = None
+
+    def rescale(self, scale: float) -> None:
+        self.decode_path = self.proxy_path or self.video_path
+        self._reader = None  # Do not share the decoder with the original element.
 
     def set_fps(self, fps: float) -> None:
         self.set_attribute(name="fps", value=fps, msg=f"Changed fps to {fps}")
@@ -89,14 +155,35 @@ class VideoElement(FixedElement):
         Returns:
             npt.NDArray[np.uint8]: An editied frame.
         """
-        if self.inCharge(pos):
-            cap = cv2.VideoCapture(self.video_path)
-            cap.set(cv2.CAP_PROP_POS_FRAMES, pos - self.pos)
-            ret, video_frame = cap.read()
-            if video_frame is not None:
-                frame[self.top : self.bottom, self.left : self.right, :] = video_frame
+        video_frame = self.read(pos=pos)
+        if video_frame is not None:
+            frame = self.paste_sprite(frame=frame, pos=pos, premultiplied=video_frame)
         return frame
 
+    def read(self, pos: int) -> Optional[npt.NDArray[np.uint8]]:
+        """Read the frame of ``decode_path`` which is shown at ``pos``, resized to the element size.
+
+        One decoder is kept open and read forward (See :class:`SequentialReader <veditor.utils.video_utils.SequentialReader>`), so rendering consecutive positions decodes each frame once instead of reopening and seeking the video every frame. Reading the same ``pos`` again returns the same frame without decoding (e.g. when a :class:`TransitionElement <veditor.elements.transition.TransitionElement>` also reads this element.) Do not modify the returned frame in place.
+
+        Args:
+            pos (int) : The current position in the video.
+
+        Returns:
+            Optional[npt.NDArray[np.uint8]]: The frame, or ``None`` if this element is not in charge of ``pos`` or the frame cannot be read.
+        """
+        if not (self.start_pos <= pos < self.end_pos):
+            return None
+        dsize = (self.width, self.height)
+        if (self._reader is None) or (
+            (self._reader.path, self._reader.dsize) != (self.decode_path, dsize)
+        ):
+            self._reader = SequentialReader(
+                path=self.decode_path,
+                dsize=dsize,
+                keyframes=keyframe_index(self.decode_path) if self.in_pos > 0 else None,
+            )
+        return self._reader.read(pos=int(self.schedule[pos - self.start_pos]))
+
     def check_work(
         self, pos: int, as_pil: bool = True
     ) -> Union[npt.NDArray[np.uint8], Image.Image]:
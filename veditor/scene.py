@@ -0,0 +1,491 @@
+# coding: utf-8
+import collections.abc
+import inspect
+import json
+import os
+from numbers import Number
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+
+import numpy as np
+
+from .editor import VEditor
+from .elements import (
+    AnimationElement,
+    BaseElement,
+    ImageElement,
+    SequenceElement,
+    SubtitleTrackElement,
+    TextElement,
+    TransitionElement,
+    VideoElement,
+)
+from .elements.base import TRACK_PROPERTIES, OmittedArgument
+from .utils._colorings import toBLUE, toGREEN
+from .utils.generic_utils import handleKeyError, object_fingerprint
+from .utils.track_utils import easing2points
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+SCENE_VERSION: int = 1
+SCENE_ELEMENTS: Dict[str, Type[BaseElement]] = {
+    cls.__name__: cls
+    for cls in [
+        TextElement,
+        ImageElement,
+        AnimationElement,
+        VideoElement,
+        SequenceElement,
+        SubtitleTrackElement,
+        TransitionElement,
+    ]
+}
+# Arguments which are paths to assets (when they are strings or lists of strings.)
+SCENE_PATH_ARGUMENTS: List[str] = [
+    "video_path",
+    "video_paths",
+    "animation_path",
+    "ttfontname",
+    "x",
+    "subtitles",
+]
+
+
+class SceneValidationError(ValueError):
+    def __init__(self, errors: List[str]):
+        self.errors = errors
+        super().__init__("\n".join(["Invalid scene:"] + [f"- {e}" for e in errors]))
+
+
+def load_document(path: str) -> Any:
+    """Load a document from ``.json``, ``.yaml`` / ``.yml`` (requires ``PyYAML``) or ``.msgpack`` (requires ``msgpack``) file.
+
+    Args:
+        path (str) : Path to the file.
+
+    Raises:
+        FileNotFoundError: When file is not found.
+        ImportError: When the library for the format is not installed.
+
+    Returns:
+        Any: The loaded document.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{toBLUE(path)} is not found.")
+    ext = os.path.splitext(path)[1].lower()
+    if ext in [".yaml", ".yml"]:
+        if yaml is None:
+            raise ImportError(
+                f"Please install {toGREEN('PyYAML')} to read {toBLUE(path)}."
+            )
+        with open(path, mode="r", encoding="utf-8") as f:
+            return yaml.safe_load(f)
+    if ext == ".msgpack":
+        if msgpack is None:
+            raise ImportError(
+                f"Please install {toGREEN('msgpack')} to read {toBLUE(path)}."
+            )
+        with open(path, mode="rb") as f:
+            return msgpack.unpackb(f.read())
+    with open(path, mode="r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def dump_document(obj: Any, path: str) -> str:
+    """Dump ``obj`` into a file whose format is decided by the extension of ``path``. (See :func:`load_document <veditor.scene.load_document>`)"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext in [".yaml", ".yml"]:
+        if yaml is None:
+            raise ImportError(
+                f"Please install {toGREEN('PyYAML')} to write {toBLUE(path)}."
+            )
+        with open(path, mode="w", encoding="utf-8") as f:
+            yaml.safe_dump(obj, f, sort_keys=False, allow_unicode=True)
+    elif ext == ".msgpack":
+        if msgpack is None:
+            raise ImportError(
+                f"Please install {toGREEN('msgpack')} to write {toBLUE(path)}."
+            )
+        with open(path, mode="wb") as f:
+            f.write(msgpack.packb(obj))
+    else:
+        with open(path, mode="w", encoding="utf-8") as f:
+            json.dump(obj, f, indent=2, ensure_ascii=False)
+    return path
+
+
+def _conform(value: Any, annotation: Any) -> Any:
+    """Check that ``value`` (loaded from a document) matches the type ``annotation``, and convert lists into tuples where tuples are expected.
+
+    Raises:
+        TypeError: When ``value`` does not match ``annotation``.
+    """
+    origin = getattr(annotation, "__origin__", None)
+    args = getattr(annotation, "__args__", None) or ()
+    if annotation in (Any, inspect.Parameter.empty):
+        return value
+    if origin is Union:
+        for arg in args:
+            try:
+                return _conform(value, arg)
+            except TypeError:
+                pass
+        raise TypeError(f"{value!r} does not match {annotation}")
+    if annotation is type(None):
+        if value is None:
+            return value
+    elif inspect.isclass(annotation) and issubclass(annotation, BaseElement):
+        if isinstance(value, dict) and (set(value.keys()) == {"$ref"}):
+            return value
+    elif origin in (list, List):
+        if isinstance(value, list):
+            return [_conform(v, args[0]) for v in value] if len(args) > 0 else value
+    elif origin in (tuple, Tuple):
+        if isinstance(value, (list, tuple)):
+            if (len(args) > 0) and (args[-1] is not Ellipsis):
+                if len(value) == len(args):
+                    return tuple(_conform(v, a) for v, a in zip(value, args))
+            else:
+                return tuple(value)
+    elif (annotation is collections.abc.Callable) or (
+        origin is collections.abc.Callable
+    ):
+        pass  # Functions can not be serialized.
+    elif origin is np.ndarray:
+        pass  # Arrays can not be serialized. (Use paths to the files instead.)
+    elif annotation in (float, Number):
+        if isinstance(value, Number) and not isinstance(value, bool):
+            return value
+    elif annotation is int:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+    elif annotation in (str, bool):
+        if isinstance(value, annotation):
+            return value
+    else:
+        return value
+    raise TypeError(f"{value!r} does not match {annotation}")
+
+
+def _serialize(value: Any, ids: Dict[int, str]) -> Any:
+    """Convert a constructor argument into a serializable value (elements into references.)"""
+    if isinstance(value, BaseElement):
+        if id(value) not in ids:
+            raise SceneValidationError(
+                [f"{value} is referred to, but is not in the editor."]
+            )
+        return {"$ref": ids[id(value)]}
+    if isinstance(value, OmittedArgument):
+        raise SceneValidationError(
+            [
+                f"{value.type_name} can not be serialized. (Use the path to the file instead.)"
+            ]
+        )
+    if isinstance(value, (list, tuple)):
+        return [_serialize(v, ids) for v in value]
+    if isinstance(value, dict):
+        return {k: _serialize(v, ids) for k, v in value.items()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if (value is None) or isinstance(value, (bool, Number, str)):
+        return value
+    raise SceneValidationError([f"{type(value).__name__} can not be serialized."])
+
+
+class Scene:
+    def __init__(
+        self,
+        editor: Optional[Dict[str, Any]] = None,
+        elements: Optional[List[Dict[str, Any]]] = None,
+        version: int = SCENE_VERSION,
+    ):
+        """Declarative description of a :class:`VEditor <veditor.editor.VEditor>` and its elements, which can be saved, diffed, validated and hashed.
+
+        A scene is a document like:
+
+        .. code-block:: json
+
+            {
+                "version": 1,
+                "editor": {"video_path": "base.mp4"},
+                "elements": [
+                    {"type": "ImageElement", "id": "logo", "x": "logo.png", "top": 10, "left": 10},
+                    {"type": "TextElement", "text": "Hello", "ttfontname": "font.ttf", "top": {"$ref": "logo"}, "left": 10}
+                ]
+            }
+
+        ``"editor"`` holds the keyword arguments of :class:`VEditor <veditor.editor.VEditor>`, and each element holds its ``"type"`` (one of ``SCENE_ELEMENTS``), an optional ``"id"``, optional ``"tracks"`` (keyframes of each animated property. See :meth:`animate <veditor.elements.base.FixedElement.animate>`), and the keyword arguments of the element class. An argument ``{"$ref": "<id>"}`` refers to an element defined before it. The schema is derived from the signatures of the classes, so :meth:`validate <veditor.scene.Scene.validate>` checks a scene without opening any asset.
+
+        Args:
+            editor (Optional[Dict[str, Any]], optional)         : Keyword arguments of ``VEditor``. Defaults to ``None``.
+            elements (Optional[List[Dict[str, Any]]], optional) : Elements. Defaults to ``None``.
+            version (int, optional)                             : Version of the scene format. Defaults to ``SCENE_VERSION``.
+
+        Examples:
+            >>> from veditor.scene import Scene
+            >>> from veditor.utils import SampleData
+            >>> scene = Scene(elements=[{"type": "ImageElement", "x": SampleData().IMAGE_PATH, "top": 0, "left": 0}])
+            >>> editor = scene.validate().build()
+            >>> Scene.from_editor(editor).hash() == scene.hash()
+            True
+        """
+        self.version = version
+        self.editor = dict(editor or {})
+        self.elements = [dict(element) for element in (elements or [])]
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Scene":
+        return cls(
+            editor=data.get("editor"),
+            elements=data.get("elements"),
+            version=data.get("version", SCENE_VERSION),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(version=self.version, editor=self.editor, elements=self.elements)
+
+    @classmethod
+    def load(cls, path: str) -> "Scene":
+        """Load a scene from a file. (See :func:`load_document <veditor.scene.load_document>`)"""
+        return cls.from_dict(load_document(path))
+
+    def dump(self, path: str) -> str:
+        """Save this scene into a file. (See :func:`dump_document <veditor.scene.dump_document>`)"""
+        return dump_document(self.to_dict(), path)
+
+    @classmethod
+    def from_editor(cls, editor: VEditor) -> "Scene":
+        """Describe an existing ``editor`` (and its elements) by the arguments they were created with.
+
+        Args:
+            editor (VEditor) : An editor whose elements are all in ``SCENE_ELEMENTS``.
+
+        Raises:
+            SceneValidationError: When an element or an argument can not be serialized.
+
+        Returns:
+            Scene: A scene which builds an equivalent editor.
+        """
+        ids: Dict[int, str] = {}
+        elements = []
+        for i, element in enumerate(editor.elements):
+            name = element.__class__.__name__
+            if name not in SCENE_ELEMENTS:
+                raise SceneValidationError([f"{toGREEN(name)} is not supported."])
+            ids[id(element)] = str(i)
+            elements.append(
+                dict(type=name, id=str(i), **cls._arguments(element, ids=ids))
+            )
+            if getattr(element, "animated", False):
+                elements[-1]["tracks"] = _serialize(element.tracks, ids)
+        kwargs = cls._arguments(editor, ids=ids)
+        kwargs.pop("elements", None)
+        return cls(editor=kwargs, elements=elements)
+
+    @staticmethod
+    def _arguments(element: BaseElement, ids: Dict[int, str]) -> Dict[str, Any]:
+        """The arguments ``element`` was created with (except defaults), in a serializable form."""
+        args, kwargs = element._init_args
+        bound = inspect.signature(element.__class__).bind(*args, **kwargs)
+        arguments = {}
+        for name, value in bound.arguments.items():
+            if bound.signature.parameters[name].kind is inspect.Parameter.VAR_KEYWORD:
+                arguments.update(_serialize(value, ids))
+            else:
+                arguments[name] = _serialize(value, ids)
+        return arguments
+
+    def validate(self, check_files: bool = True) -> "Scene":
+        """Validate this scene against the signatures of ``VEditor`` and the element classes. No asset is opened.
+
+        Args:
+            check_files (bool, optional) : Whether to check that the files given by paths exist. Defaults to ``True``.
+
+        Raises:
+            SceneValidationError: When this scene has errors. (All errors are reported at once.)
+
+        Returns:
+            Scene: This scene.
+        """
+        errors: List[str] = []
+        if self.version != SCENE_VERSION:
+            errors.append(
+                f"Unsupported version {self.version} (expected {SCENE_VERSION})."
+            )
+        self._validate_arguments(
+            "editor",
+            VEditor,
+            self.editor,
+            ids=[],
+            errors=errors,
+            check_files=check_files,
+        )
+        if "elements" in self.editor:
+            errors.append(
+                "editor: elements must be given in the elements of the scene."
+            )
+        ids: List[str] = []
+        for i, element in enumerate(self.elements):
+            element = dict(element)
+            name = element.pop("type", None)
+            where = f"elements[{i}]"
+            if name not in SCENE_ELEMENTS:
+                errors.append(
+                    f"{where}: type must be one of {list(SCENE_ELEMENTS.keys())}, but got {name!r}."
+                )
+                continue
+            eid = str(element.pop("id", i))
+            if eid in ids:
+                errors.append(f"{where}: id {eid!r} is duplicated.")
+            tracks = element.pop("tracks", {})
+            if not isinstance(tracks, dict):
+                errors.append(
+                    f"{where}: tracks must be a dictionary of keyframes for each property, but got {tracks!r}."
+                )
+                tracks = {}
+            for prop, keyframes in tracks.items():
+                try:
+                    handleKeyError(lst=TRACK_PROPERTIES, name=prop)
+                    if len(keyframes) == 0:
+                        raise ValueError("no keyframe is given.")
+                    for keyframe in keyframes:
+                        int(keyframe[0]), float(keyframe[1])
+                        easing2points(keyframe[2] if len(keyframe) > 2 else "linear")
+                except (KeyError, ValueError, TypeError, IndexError) as e:
+                    errors.append(f"{where}: track {toGREEN(prop)} is invalid. {e}")
+            self._validate_arguments(
+                f"{where} ({name})",
+                SCENE_ELEMENTS[name],
+                element,
+                ids=ids,
+                errors=errors,
+                check_files=check_files,
+            )
+            ids.append(eid)
+        if len(errors) > 0:
+            raise SceneValidationError(errors)
+        return self
+
+    @staticmethod
+    def _validate_arguments(
+        where: str,
+        cls: Type[BaseElement],
+        kwargs: Dict[str, Any],
+        ids: List[str],
+        errors: List[str],
+        check_files: bool = True,
+    ) -> None:
+        parameters = inspect.signature(cls).parameters
+        accepts_any = any(
+            p.kind is inspect.Parameter.VAR_KEYWORD for p in parameters.values()
+        )
+        for name, p in parameters.items():
+            if (p.default is inspect.Parameter.empty) and (
+                p.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD
+            ):
+                if name not in kwargs:
+                    errors.append(f"{where}: {toGREEN(name)} is required.")
+        for name, value in kwargs.items():
+            if name not in parameters:
+                if not accepts_any:
+                    errors.append(f"{where}: unknown argument {toGREEN(name)}.")
+                continue
+            try:
+                _conform(value, parameters[name].annotation)
+            except TypeError as e:
+                errors.append(f"{where}: {toGREEN(name)} is invalid. {e}")
+                continue
+            refs = value if isinstance(value, list) else [value]
+            for ref in refs:
+                if (
+                    isinstance(ref, dict)
+                    and ("$ref" in ref)
+                    and (ref["$ref"] not in ids)
+                ):
+                    errors.append(
+                        f"{where}: {toGREEN(name)} refers to {ref['$ref']!r}, which is not defined before."
+                    )
+            if check_files and (name in SCENE_PATH_ARGUMENTS):
+                for path in value if isinstance(value, list) else [value]:
+                    if isinstance(path, str) and (not os.path.exists(path)):
+                        errors.append(f"{where}: {toBLUE(path)} is not found.")
+
+    def hash(self) -> str:
+        """Hash of this scene including the contents of the assets it refers to, which can be used as a key of render caches. (See :func:`object_fingerprint <veditor.utils.generic_utils.object_fingerprint>`)
+
+        Returns:
+            str: A SHA-1 hex digest.
+        """
+        data = json.loads(json.dumps(self.to_dict()))  # tuples -> lists
+        # Ids are only names, so they are replaced by the indexes of elements.
+        indexes = {
+            str(element.get("id", i)): str(i)
+            for i, element in enumerate(data["elements"])
+        }
+
+        def canonicalize(value: Any) -> Any:
+            if isinstance(value, dict):
+                if "$ref" in value:
+                    return {"$ref": indexes.get(value["$ref"], value["$ref"])}
+                return {k: canonicalize(v) for k, v in value.items()}
+            if isinstance(value, list):
+                return [canonicalize(v) for v in value]
+            return value
+
+        for i, element in enumerate(data["elements"]):
+            element["id"] = str(i)
+        return object_fingerprint(canonicalize(data))
+
+    def build(self, validate: bool = True) -> VEditor:
+        """Create the :class:`VEditor <veditor.editor.VEditor>` described by this scene.
+
+        Args:
+            validate (bool, optional) : Whether to :meth:`validate <veditor.scene.Scene.validate>` before building. Defaults to ``True``.
+
+        Returns:
+            VEditor: An editor.
+        """
+        if validate:
+            self.validate()
+        built: Dict[str, BaseElement] = {}
+
+        def resolve(value: Any, annotation: Any) -> Any:
+            value = _conform(value, annotation)
+            if isinstance(value, dict) and ("$ref" in value):
+                return built[value["$ref"]]
+            return value
+
+        elements = []
+        for i, element in enumerate(self.elements):
+            element = dict(element)
+            cls = SCENE_ELEMENTS[element.pop("type")]
+            eid = str(element.pop("id", i))
+            tracks = element.pop("tracks", {})
+            parameters = inspect.signature(cls).parameters
+            built[eid] = cls(
+                **{
+                    name: resolve(
+                        value,
+                        parameters[name].annotation if name in parameters else Any,
+                    )
+                    for name, value in element.items()
+                }
+            )
+            for prop, keyframes in tracks.items():
+                built[eid].animate(prop, keyframes)
+            elements.append(built[eid])
+        parameters = inspect.signature(VEditor).parameters
+        return VEditor(
+            elements=elements,
+            **{
+                name: _conform(value, parameters[name].annotation)
+                for name, value in self.editor.items()
+            },
+        )
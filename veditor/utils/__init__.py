@@ -3,10 +3,16 @@ from . import (
     _datasets,
     argparse_utils,
     audio_utils,
+    cache_utils,
     color_utils,
     download_utils,
     generic_utils,
+    glyph_utils,
     image_utils,
+    media_utils,
+    proxy_utils,
+    subtitle_utils,
+    track_utils,
     video_utils,
 )
 from ._colorings import *
@@ -17,6 +23,7 @@ from ._path import *
 from ._warnings import *
 from .argparse_utils import DictParamProcessor, KwargsParamProcessor, ListParamProcessorCreate
 from .audio_utils import overlay_audio, synthesize_audio
+from .cache_utils import AssetPool, DiskCache, FrameRing, LRUCache, RenderCache, get_asset_pool
 from .color_utils import (
     choose_text_color,
     detect_color_code_type,
@@ -35,15 +42,19 @@ from .download_utils import download_file, progress_reporthook_create
 from .generic_utils import (
     assign_trbl,
     class2str,
+    file_fingerprint,
     handleKeyError,
     handleTypeError,
     now_str,
+    object_fingerprint,
     openf,
     readable_bytes,
     str_strip,
 )
+from .glyph_utils import GlyphAtlas, get_glyph_atlas
 from .image_utils import (
     SUPPORTED_CONVERSION_METHODS,
+    SUPPORTED_UPSCALE_FILTERS,
     alpha_composite,
     apply_heatmap,
     arr2pil,
@@ -52,8 +63,53 @@ from .image_utils import (
     draw_cross,
     draw_text_in_pil,
     image_conversion,
+    image_size,
     min_max_normalization,
     nega_conversion,
+    overlay_bgra,
+    overlay_premultiplied,
     pil2arr,
+    pil2bgra,
+    premultiply_alpha,
+    resize_image,
+    resize_images,
+)
+from .media_utils import ALPHA_PIXEL_FORMATS, MEDIA_PROBES, probe_media
+from .proxy_utils import ProxyManager, get_proxy_manager
+from .subtitle_utils import (
+    SUPPORTED_SUBTITLE_FORMATS,
+    load_subtitles,
+    merge_cues,
+    parse_subtitles,
+    timestamp2msec,
+)
+from .timing_utils import (
+    DEFAULT_FRAME_DURATION,
+    FRAME_TIMES,
+    frame_schedule,
+    probe_frame_times,
+    retime_schedule,
+)
+from .track_utils import SUPPORTED_EASINGS, cubic_bezier, easing2points, interpolate_keyframes
+from .video_utils import (
+    KEYFRAME_INDEXES,
+    PREVIEW_CODEC,
+    SMART_CUT_ENCODERS,
+    VIDEO_EXTENSIONS,
+    FFmpegVideoReader,
+    FFmpegVideoWriter,
+    ScrubReader,
+    SequentialReader,
+    capture2writor,
+    concat_videos,
+    copy_video_range,
+    createVideoWritor,
+    detect_clip_locations,
+    keyframe_index,
+    probe_keyframes,
+    probe_video_stream,
+    sample_keyframes,
+    save_frames,
+    show_frames,
+    vcodec2ext,
 )
-from .video_utils import capture2writor, createVideoWritor, save_frames, show_frames, vcodec2ext
@@ -9,6 +9,8 @@ __all__ = [
     "MODULE_DIR",
     "VEDITOR_DIR",
     "FONT_DIR",
+    "PROXY_DIR",
+    "RENDER_CACHE_DIR",
 ]
 
 
@@ -39,3 +41,9 @@ _makedirs(name=VEDITOR_DIR)
 
 FONT_DIR = os.path.join(VEDITOR_DIR, "fonts")
 _makedirs(name=FONT_DIR)
+
+PROXY_DIR = os.path.join(VEDITOR_DIR, "proxies")
+_makedirs(name=PROXY_DIR)
+
+RENDER_CACHE_DIR = os.path.join(VEDITOR_DIR, "render_cache")
+_makedirs(name=RENDER_CACHE_DIR)
@@ -0,0 +1,404 @@
+# coding: utf-8
+import logging
+import os
+import tempfile
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Collection, Hashable, List, Optional, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from ._colorings import toBLUE, toGREEN
+from ._loggers import get_logger
+from ._path import RENDER_CACHE_DIR
+from .generic_utils import object_fingerprint, readable_bytes
+
+
+class LRUCache(OrderedDict):
+    def __init__(self, maxsize: int = 128):
+        """Dictionary which discards the least recently used items when it exceeds ``maxsize``.
+
+        Args:
+            maxsize (int, optional) : The maximum number of items. Defaults to ``128``.
+
+        Examples:
+            >>> from veditor.utils import LRUCache
+            >>> cache = LRUCache(maxsize=2)
+            >>> cache["a"] = 1; cache["b"] = 2
+            >>> cache["a"]
+            1
+            >>> cache["c"] = 3
+            >>> list(cache.keys())
+            ['a', 'c']
+        """
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: Hashable, value: Any) -> None:
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+    def get_or_create(self, key: Hashable, create: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, or create and cache it with ``create()``.
+
+        Args:
+            key (Hashable)           : A cache key.
+            create (Callable[[], Any]) : Function to create the value when ``key`` is not cached.
+
+        Returns:
+            Any: The cached (or created) value.
+        """
+        if key in self:
+            return self[key]
+        value = create()
+        self[key] = value
+        return value
+
+
+class DiskCache:
+    def __init__(
+        self,
+        cache_dir: str,
+        ext: str = "",
+        max_bytes: int = 10 * (1 << 30),
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Directory of files keyed by strings, which discards the least recently used files when the total size exceeds ``max_bytes``.
+
+        Args:
+            cache_dir (str)                             : Directory to store files.
+            ext (str, optional)                         : Extension of the cached files. Defaults to ``""``.
+            max_bytes (int, optional)                   : The maximum total size of the cache. Defaults to ``10 * (1 << 30)``. (10GB)
+            logger (Optional[logging.Logger], optional) : Logger. Defaults to ``None``.
+        """
+        self.cache_dir = cache_dir
+        self.ext = ext
+        self.max_bytes = max_bytes
+        self.logger = logger or get_logger(name=__name__)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        """Return the path where the file for ``key`` is (or will be) stored."""
+        return os.path.join(self.cache_dir, key + self.ext)
+
+    def tmp_path(self, key: str) -> str:
+        """Return the path where the file for ``key`` should be written before :meth:`put <veditor.utils.cache_utils.DiskCache.put>`. (It is unique to the process, so processes sharing the cache never write the same file.)"""
+        root, ext = os.path.splitext(self.path(key))
+        return f"{root}.{os.getpid()}.part{ext}"
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the path to the cached file for ``key`` (and mark it as recently used), or ``None`` if it is not cached."""
+        path = self.path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        return path
+
+    def put(self, key: str, path: str, keep: Collection[str] = ()) -> str:
+        """Move the file at ``path`` into the cache as ``key``, and evict old files.
+
+        Args:
+            key (str)                        : A cache key.
+            path (str)                       : Path to the file. (Usually :meth:`tmp_path <veditor.utils.cache_utils.DiskCache.tmp_path>`)
+            keep (Collection[str], optional) : Paths to other cached files which are still in use, and must not be evicted. Defaults to ``()``.
+
+        Returns:
+            str: Path to the cached file.
+        """
+        cached_path = self.path(key)
+        os.replace(path, cached_path)
+        self.evict(keep={cached_path, *keep})
+        return cached_path
+
+    def entries(self) -> List[Tuple[float, int, str]]:
+        """List cached files as (last used time, size, path) from the least recently used one."""
+        entries = []
+        for fn in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, fn)
+            if fn.endswith(self.ext) and (".part" not in fn):
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        return sorted(entries)
+
+    def evict(self, keep: Collection[str] = ()) -> List[str]:
+        """Remove the least recently used files until the total size is within ``max_bytes``.
+
+        Args:
+            keep (Collection[str], optional) : Paths to files which must not be removed. Defaults to ``()``.
+
+        Returns:
+            List[str]: Paths to the removed files.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            if path in keep:
+                continue
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Evicted by another process sharing the cache.
+            total -= size
+            removed.append(path)
+        if len(removed) > 0:
+            size, unit = readable_bytes(total)
+            self.logger.info(
+                f"Evicted {toGREEN(len(removed))} files from {toBLUE(self.cache_dir)} (cache size: {toGREEN(f'{size:.1f}[{unit}]')})"
+            )
+        return removed
+
+
+class RenderCache(DiskCache):
+    def __init__(
+        self,
+        cache_dir: str = RENDER_CACHE_DIR,
+        segment_frames: int = 60,
+        max_bytes: int = 10 * (1 << 30),
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Cache of encoded segments for incremental exports.
+
+        The timeline is split into fixed segments of ``segment_frames`` frames. Each segment is encoded independently (so it starts with a keyframe and can be concatenated by stream-copy) and stored under a key which fingerprints everything that affects its pixels: output settings, the identity of the source frames, and the elements in charge with their parameters. On re-export, only the segments whose key changed are rendered.
+
+        Args:
+            cache_dir (str, optional)                   : Directory to store segments. Defaults to ``RENDER_CACHE_DIR``.
+            segment_frames (int, optional)              : The number of frames in each segment. Defaults to ``60``.
+            max_bytes (int, optional)                   : The maximum total size of the cache. Defaults to ``10 * (1 << 30)``. (10GB)
+            logger (Optional[logging.Logger], optional) : Logger. Defaults to ``None``.
+
+        Examples:
+            >>> from veditor.utils import RenderCache
+            >>> RenderCache(segment_frames=60).segments(frame_count=150)
+            [(0, 60), (60, 120), (120, 150)]
+        """
+        super().__init__(
+            cache_dir=cache_dir, ext="", max_bytes=max_bytes, logger=logger
+        )
+        self.segment_frames = segment_frames
+
+    def segments(self, frame_count: int) -> List[Tuple[int, int]]:
+        """Split ``frame_count`` frames into segments.
+
+        Args:
+            frame_count (int) : The number of frames.
+
+        Returns:
+            List[Tuple[int, int]]: Segments as (``start``, ``end``) (``end`` is exclusive.)
+        """
+        return [
+            (start, min(start + self.segment_frames, frame_count))
+            for start in range(0, frame_count, self.segment_frames)
+        ]
+
+    def key(self, *objs, ext: str = "") -> str:
+        """Return the cache key of a segment fingerprinted by ``objs``. (See :func:`object_fingerprint <veditor.utils.generic_utils.object_fingerprint>`)
+
+        Args:
+            objs (Any)          : Everything which affects the pixels of the segment.
+            ext (str, optional) : Extension of the segment file (which depends on the codec.) Defaults to ``""``.
+
+        Returns:
+            str: A cache key.
+        """
+        return object_fingerprint(*objs) + ext
+
+
+class FrameRing:
+    def __init__(
+        self,
+        capacity: int,
+        shape: Tuple[int, ...],
+        dtype: npt.DTypeLike = np.uint8,
+        dir: Optional[str] = None,
+    ):
+        """Ring of frames keyed by their positions, backed by a memory-mapped temporary file.
+
+        The ``pos``-th frame is stored in the slot ``pos % capacity``, so lookups are ``O(1)`` and the memory footprint is bounded by the OS page cache instead of the process heap. It is safe to :meth:`put <veditor.utils.cache_utils.FrameRing.put>` from one thread while :meth:`get <veditor.utils.cache_utils.FrameRing.get>` from another.
+
+        Args:
+            capacity (int)                    : The number of slots.
+            shape (Tuple[int, ...])           : Shape of each frame. (e.g. ``(H, W, 3)``)
+            dtype (npt.DTypeLike, optional)   : Data type of frames. Defaults to ``np.uint8``.
+            dir (Optional[str], optional)     : Directory to create the temporary file in. Defaults to ``None``. (The system default.)
+
+        Examples:
+            >>> import numpy as np
+            >>> from veditor.utils import FrameRing
+            >>> ring = FrameRing(capacity=4, shape=(2, 2, 3))
+            >>> ring.put(pos=5, frame=np.ones(shape=(2, 2, 3), dtype=np.uint8))
+            >>> 5 in ring, 1 in ring
+            (True, False)
+            >>> int(ring.get(pos=5).sum())
+            12
+        """
+        self.capacity = capacity
+        self.shape = tuple(shape)
+        self._file = tempfile.TemporaryFile(dir=dir)
+        self.frames = np.memmap(
+            self._file, dtype=dtype, mode="w+", shape=(capacity,) + self.shape
+        )
+        self.positions: npt.NDArray[np.int64] = np.full(
+            shape=capacity, fill_value=-1, dtype=np.int64
+        )
+        self.lock = threading.Lock()
+
+    def __contains__(self, pos: int) -> bool:
+        return bool(self.positions[pos % self.capacity] == pos)
+
+    def get(self, pos: int) -> Optional[npt.NDArray]:
+        """Return a copy of the ``pos``-th frame, or ``None`` if it is not stored."""
+        with self.lock:
+            if pos in self:
+                return np.array(self.frames[pos % self.capacity])
+        return None
+
+    def put(self, pos: int, frame: npt.NDArray) -> None:
+        """Store ``frame`` as the ``pos``-th frame (overwriting the frame in the same slot.)"""
+        slot = pos % self.capacity
+        with self.lock:
+            self.positions[slot] = -1
+            self.frames[slot] = frame
+            self.positions[slot] = pos
+
+    def close(self) -> None:
+        """Release the memory map and remove the temporary file."""
+        del self.frames
+        self._file.close()
+
+
+def _freeze(value: Any) -> int:
+    """Make arrays in ``value`` (recursively) read-only, and return their total size in bytes."""
+    if isinstance(value, np.ndarray):
+        value.setflags(write=False)
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(_freeze(v) for v in value)
+    # PIL.Image.Image (shared, so it must not be modified either.)
+    if hasattr(value, "getbands"):
+        return value.width * value.height * len(value.getbands())
+    return 0
+
+
+class AssetPool:
+    def __init__(
+        self, max_bytes: int = 1 << 30, logger: Optional[logging.Logger] = None
+    ):
+        """Process-wide pool of decoded (and resized) assets, so that elements which use the same file at the same size share one read-only copy.
+
+        Assets are reference counted. Assets which are no longer referenced stay in the pool (so that they can be reused by later elements) until the total size exceeds ``max_bytes``, then they are discarded from the least recently used one. Referenced assets are never discarded.
+
+        Args:
+            max_bytes (int, optional)                   : The maximum total size of the pool. Defaults to ``1 << 30``. (1GB)
+            logger (Optional[logging.Logger], optional) : Logger. Defaults to ``None``.
+
+        Examples:
+            >>> import numpy as np
+            >>> from veditor.utils import AssetPool, SampleData
+            >>> pool = AssetPool()
+            >>> key = pool.key(SampleData().IMAGE_PATH, (64, 36), "linear")
+            >>> a = pool.acquire(key, create=lambda: np.zeros(shape=(36, 64, 3), dtype=np.uint8))
+            >>> b = pool.acquire(key, create=lambda: np.ones(shape=(36, 64, 3), dtype=np.uint8))
+            >>> a is b, a.flags.writeable, pool.refcounts[key]
+            (True, False, 2)
+        """
+        self.max_bytes = max_bytes
+        self.logger = logger or get_logger(name=__name__)
+        self.assets: LRUCache = LRUCache(maxsize=float("inf"))
+        self.refcounts: dict = {}
+        self.sizes: dict = {}
+        self.nbytes: int = 0
+        self.lock = threading.RLock()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self.assets
+
+    def __len__(self) -> int:
+        return len(self.assets)
+
+    @staticmethod
+    def key(path: str, *params: Hashable) -> Tuple:
+        """Return the key of an asset made from the file at ``path`` with ``params`` (e.g. target size, interpolation.) The key changes when the file is modified."""
+        stat = os.stat(path)
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size) + params
+
+    def acquire(
+        self, key: Hashable, create: Callable[[], Any], owner: Optional[Any] = None
+    ) -> Any:
+        """Return the asset for ``key`` (creating it with ``create()`` if it is not pooled), and increment its reference count.
+
+        Args:
+            key (Hashable)                : An asset key. (See :meth:`key <veditor.utils.cache_utils.AssetPool.key>`)
+            create (Callable[[], Any])    : Function to create the asset (an array, or a tuple / list of arrays.) The arrays are made read-only.
+            owner (Optional[Any], optional) : If given, the reference is released when ``owner`` is garbage collected. Defaults to ``None``.
+
+        Returns:
+            Any: The shared asset.
+        """
+        with self.lock:
+            if key in self.assets:
+                asset = self.assets[key]
+            else:
+                asset = create()
+                self.assets[key] = asset
+                self.sizes[key] = _freeze(asset)
+                self.nbytes += self.sizes[key]
+            self.refcounts[key] = self.refcounts.get(key, 0) + 1
+            self.evict()
+        if owner is not None:
+            weakref.finalize(owner, self.release, key)
+        return asset
+
+    def release(self, key: Hashable) -> None:
+        """Decrement the reference count of the asset for ``key``."""
+        with self.lock:
+            if self.refcounts.get(key, 0) > 0:
+                self.refcounts[key] -= 1
+            self.evict()
+
+    def evict(self) -> List[Hashable]:
+        """Discard unreferenced assets from the least recently used one until the total size is within ``max_bytes``.
+
+        Returns:
+            List[Hashable]: Keys of the discarded assets.
+        """
+        removed = []
+        with self.lock:
+            for key in list(self.assets.keys()):
+                if self.nbytes <= self.max_bytes:
+                    break
+                if self.refcounts.get(key, 0) > 0:
+                    continue
+                del self.assets[key]
+                self.refcounts.pop(key, None)
+                self.nbytes -= self.sizes.pop(key)
+                removed.append(key)
+        if len(removed) > 0:
+            size, unit = readable_bytes(self.nbytes)
+            self.logger.debug(
+                f"Discarded {toGREEN(len(removed))} assets (pool size: {toGREEN(f'{size:.1f}[{unit}]')})"
+            )
+        return removed
+
+
+_asset_pool: AssetPool = AssetPool()
+
+
+def get_asset_pool() -> AssetPool:
+    """Return the process-wide :class:`AssetPool <veditor.utils.cache_utils.AssetPool>` shared by elements."""
+    return _asset_pool
@@ -1,11 +1,16 @@
 # coding: utf-8
 import argparse
 import datetime
+import functools
+import hashlib
+import os
 import re
 import subprocess
 from numbers import Number
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+import numpy as np
+
 from ._colorings import toBLUE, toGREEN, toRED
 from ._exceptions import KeyError
 
@@ -263,3 +268,92 @@ def openf(file_path: str, timeout: Optional[int] = None, shell: bool = True) ->
         shell (bool, optional)            : [description]. Defaults to ``True``.
     """
     subprocess.call(f"open '{file_path}'", timeout=timeout, shell=shell)
+
+
+@functools.lru_cache(maxsize=1024)
+def _file_digest(path: str, mtime_ns: int, size: int, chunk_size: int) -> str:
+    """Hash the whole file at ``path``. (Memoized per version of the file: ``mtime_ns`` and ``size``.)"""
+    h = hashlib.sha1(str(size).encode())
+    with open(path, mode="rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_fingerprint(path: str, chunk_size: int = 1 << 20) -> str:
+    """Calculate a content-based fingerprint of the file at ``path``.
+
+    The whole content is hashed, so any edit changes the fingerprint, while copies of the file share it. To avoid reading huge media files again and again, the result is memoized per (``path``, modification time, size.)
+
+    Args:
+        path (str)                 : Path to the file.
+        chunk_size (int, optional) : The number of bytes to read at once. Defaults to ``1 << 20``. (1MB)
+
+    Returns:
+        str: A SHA-1 hex digest.
+
+    Examples:
+        >>> from veditor.utils import file_fingerprint, SampleData
+        >>> len(file_fingerprint(SampleData().IMAGE_PATH))
+        40
+    """
+    stat = os.stat(path)
+    return _file_digest(
+        os.path.abspath(path), stat.st_mtime_ns, stat.st_size, chunk_size
+    )
+
+
+def _update_fingerprint(h: "hashlib._Hash", obj: Any) -> None:
+    """Feed ``obj`` into the hash object ``h`` recursively. (See :func:`object_fingerprint <veditor.utils.generic_utils.object_fingerprint>`)"""
+    h.update(type(obj).__name__.encode())
+    if (obj is None) or isinstance(obj, (bool, Number)):
+        h.update(repr(obj).encode())
+    elif isinstance(obj, str):
+        h.update(obj.encode())
+        if os.path.isfile(obj):
+            h.update(file_fingerprint(obj).encode())
+    elif isinstance(obj, bytes):
+        h.update(obj)
+    elif type(obj) in (list, tuple):
+        h.update(str(len(obj)).encode())
+        for o in obj:
+            _update_fingerprint(h, o)
+    elif type(obj) is dict:
+        for k in sorted(obj.keys(), key=str):
+            _update_fingerprint(h, k)
+            _update_fingerprint(h, obj[k])
+    elif hasattr(obj, "__array_interface__"):  # np.ndarray, PIL.Image.Image
+        arr = np.ascontiguousarray(obj)
+        h.update(f"{arr.shape}{arr.dtype}".encode())
+        h.update(arr.tobytes())
+    elif hasattr(obj, "__code__"):  # Functions.
+        h.update(obj.__code__.co_code)
+        _update_fingerprint(
+            h, [c for c in obj.__code__.co_consts if not hasattr(c, "co_code")]
+        )
+        _update_fingerprint(
+            h, [c.cell_contents for c in (getattr(obj, "__closure__", None) or [])]
+        )
+
+
+def object_fingerprint(*objs) -> str:
+    """Calculate a fingerprint of ``objs`` which is stable across processes.
+
+    Primitives, (nested) ``list``, ``tuple`` and ``dict`` are hashed by their values, arrays and images by their pixels, functions by their bytecodes (and closure variables), and strings which are paths to existing files also by :func:`file_fingerprint <veditor.utils.generic_utils.file_fingerprint>`. Any other object (loggers, fonts, caches, other elements, ...) contributes only its type name.
+
+    Args:
+        objs (Any) : Objects to fingerprint.
+
+    Returns:
+        str: A SHA-1 hex digest.
+
+    Examples:
+        >>> from veditor.utils import object_fingerprint
+        >>> object_fingerprint({"a": 1, "b": [2, 3]}) == object_fingerprint({"b": [2, 3], "a": 1})
+        True
+        >>> object_fingerprint(1) == object_fingerprint(1.0)
+        False
+    """
+    h = hashlib.sha1()
+    _update_fingerprint(h, objs)
+    return h.hexdigest()
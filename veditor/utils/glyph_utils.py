@@ -0,0 +1,226 @@
+# coding: utf-8
+import math
+from typing import Dict, List, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+from PIL import Image, ImageColor, ImageDraw, ImageFont
+
+from .cache_utils import LRUCache
+
+_glyph_atlases: LRUCache = LRUCache(maxsize=32)
+
+
+class GlyphAtlas:
+    def __init__(
+        self,
+        ttfontname: str,
+        fontsize: int = 16,
+        stroke_width: int = 0,
+        atlas_width: int = 1024,
+    ):
+        """Atlas of rasterized glyphs for a combination of (``ttfontname``, ``fontsize``, ``stroke_width``).
+
+        Each glyph is rasterized only once into a shelf of the atlas (a 2-channel alpha bitmap which stores the fill and the stroke coverage), and strings are composed by copying glyph quads with kerning obtained from the font metrics. Therefore, drawing text which changes every frame (counters, timers, scoreboards, ...) costs ``O(characters)`` ``numpy`` copies instead of a full layout and rasterization by ``PIL``.
+
+        Args:
+            ttfontname (str)            : A filename or file-like object containing a TrueType font.
+            fontsize (int, optional)    : The font size. Defaults to ``16``.
+            stroke_width (int, optional) : The width of the text stroke. Defaults to ``0``.
+            atlas_width (int, optional) : The width of the atlas bitmap. Defaults to ``1024``.
+
+        Examples:
+            >>> from veditor.utils import get_glyph_atlas, SampleData
+            >>> atlas = get_glyph_atlas(ttfontname=SampleData().FONT_POKEFONT_PATH, fontsize=32)
+            >>> sprite = atlas.render(text="00:12", textRGB=(255, 255, 255))
+            >>> sprite.shape[2]
+            4
+        """
+        self.ttfontname = ttfontname
+        self.fontsize = fontsize
+        self.stroke_width = stroke_width
+        self.font = ImageFont.truetype(font=ttfontname, size=int(fontsize))
+        ascent, descent = self.font.getmetrics()
+        self.line_height: int = ascent + descent
+        self.cell_height: int = self.line_height + 2 * stroke_width
+        self.atlas_width = atlas_width
+        self.atlas: npt.NDArray[np.uint8] = np.zeros(
+            shape=(self.cell_height, atlas_width, 2), dtype=np.uint8
+        )
+        self._shelf: Tuple[int, int] = (0, 0)  # (y, x) of the next free space.
+        # char -> (y, x, w, x_offset, advance)
+        self.glyphs: Dict[str, Tuple[int, int, int, int, float]] = {}
+        self.kernings: Dict[Tuple[str, str], float] = {}
+
+    def _allocate(self, w: int) -> Tuple[int, int]:
+        """Find the free space for a glyph whose width is ``w`` (Shelf packing)."""
+        y, x = self._shelf
+        if x + w > self.atlas_width:
+            y, x = (y + self.cell_height, 0)
+        if y + self.cell_height > self.atlas.shape[0]:
+            # Double the atlas height (amortized O(1) per glyph.)
+            self.atlas = np.concatenate([self.atlas, np.zeros_like(self.atlas)], axis=0)
+        self._shelf = (y, x + w)
+        return (y, x)
+
+    def get_glyph(self, char: str) -> Tuple[int, int, int, int, float]:
+        """Return the location of ``char`` in the atlas, rasterizing it at the first call.
+
+        Args:
+            char (str) : A character.
+
+        Returns:
+            Tuple[int, int, int, int, float]: ``y``, ``x`` and width in the atlas, offset from the pen position, and the advance width.
+        """
+        if char in self.glyphs:
+            return self.glyphs[char]
+        sw = self.stroke_width
+        x0, _, x1, _ = self.font.getbbox(char, anchor="la", stroke_width=sw)
+        x0, x1 = (math.floor(x0), math.ceil(x1))
+        w = max(x1 - x0, 0)
+        y, x = self._allocate(w)
+        if w > 0:
+            for c, stroke_width in enumerate([0, sw]):
+                mask = Image.new(mode="L", size=(w, self.cell_height), color=0)
+                ImageDraw.Draw(mask).text(
+                    xy=(-x0, sw),
+                    text=char,
+                    fill=255,
+                    font=self.font,
+                    anchor="la",
+                    stroke_width=stroke_width,
+                    stroke_fill=255,
+                )
+                self.atlas[y : y + self.cell_height, x : x + w, c] = np.asarray(mask)
+        self.glyphs[char] = (y, x, w, x0, self.font.getlength(char))
+        return self.glyphs[char]
+
+    def get_kerning(self, left: str, right: str) -> float:
+        """Return the kerning between ``left`` and ``right`` characters obtained from the font metrics.
+
+        Args:
+            left (str)  : A left character.
+            right (str) : A right character.
+
+        Returns:
+            float: Adjustment of the pen position. (Usually negative or ``0``.)
+        """
+        key = (left, right)
+        if key not in self.kernings:
+            self.kernings[key] = (
+                self.font.getlength(left + right)
+                - self.font.getlength(left)
+                - self.font.getlength(right)
+            )
+        return self.kernings[key]
+
+    def _layout(
+        self, text: str, spacing: int = 4
+    ) -> Tuple[List[Tuple[int, int, int, int, int]], int, int]:
+        """Place the glyph quads of ``text``, and return them as ``(top, left, y, x, w)`` with the size (``width``, ``height``) of the bitmap."""
+        quads = []
+        width = 0
+        lines = text.split("\n")
+        for i, line in enumerate(lines):
+            pen, prev = (float(self.stroke_width), None)
+            top = i * (self.line_height + spacing)
+            for char in line:
+                if prev is not None:
+                    pen += self.get_kerning(prev, char)
+                y, x, w, x_offset, advance = self.get_glyph(char)
+                left = max(int(round(pen)) + x_offset, 0)
+                quads.append((top, left, y, x, w))
+                width = max(width, left + w)
+                pen += advance
+                prev = char
+            width = max(width, int(math.ceil(pen)) + self.stroke_width)
+        height = (len(lines) - 1) * (self.line_height + spacing) + self.cell_height
+        return (quads, width, height)
+
+    def measure(self, text: str, spacing: int = 4) -> Tuple[int, int]:
+        """Measure the size of the bitmap of ``text`` without composing it.
+
+        Args:
+            text (str)              : Text to measure. ``"\\n"`` breaks lines.
+            spacing (int, optional) : The number of pixels between lines. Defaults to ``4``.
+
+        Returns:
+            Tuple[int, int]: The size (``width``, ``height``) of :meth:`compose <veditor.utils.glyph_utils.GlyphAtlas.compose>` of ``text``.
+        """
+        _, width, height = self._layout(text=text, spacing=spacing)
+        return (width, height)
+
+    def compose(self, text: str, spacing: int = 4) -> npt.NDArray[np.uint8]:
+        """Compose the 2-channel (fill, stroke) alpha bitmap of ``text`` by blitting glyph quads.
+
+        Args:
+            text (str)              : Text to compose. ``"\\n"`` breaks lines.
+            spacing (int, optional) : The number of pixels between lines. Defaults to ``4``.
+
+        Returns:
+            npt.NDArray[np.uint8]: The alpha bitmap of ``text``. The shape is ``(height, width, 2)``.
+        """
+        quads, width, height = self._layout(text=text, spacing=spacing)
+        canvas = np.zeros(shape=(height, width, 2), dtype=np.uint8)
+        for top, left, y, x, w in quads:
+            roi = canvas[top : top + self.cell_height, left : left + w]
+            np.maximum(roi, self.atlas[y : y + self.cell_height, x : x + w], out=roi)
+        return canvas
+
+    def render(
+        self,
+        text: str,
+        textRGB: Union[str, Tuple] = "black",
+        stroke_fill: Union[str, Tuple, None] = None,
+        spacing: int = 4,
+    ) -> npt.NDArray[np.uint8]:
+        """Render ``text`` into a BGRA sprite.
+
+        Args:
+            text (str)                                          : Text to render.
+            textRGB (Union[str, Tuple], optional)               : The color of text. Defaults to ``"black"``.
+            stroke_fill (Optional[Union[str, Tuple]], optional) : Color to use for the text stroke. If not given, will default to the ``textRGB`` parameter. Defaults to ``None``.
+            spacing (int, optional)                             : The number of pixels between lines. Defaults to ``4``.
+
+        Returns:
+            npt.NDArray[np.uint8]: A BGRA sprite which can be pasted with :func:`overlay_bgra <veditor.utils.image_utils.overlay_bgra>`.
+        """
+        canvas = self.compose(text=text, spacing=spacing)
+        fill_alpha = canvas[:, :, :1].astype(np.uint16)
+        fill_color = np.asarray(_toBGR(textRGB), dtype=np.uint16)
+        stroke_color = np.asarray(_toBGR(stroke_fill or textRGB), dtype=np.uint16)
+        sprite = np.empty(shape=canvas.shape[:2] + (4,), dtype=np.uint8)
+        sprite[:, :, :3] = (
+            fill_color * fill_alpha + stroke_color * (255 - fill_alpha)
+        ) // 255
+        sprite[:, :, 3] = np.maximum(canvas[:, :, 0], canvas[:, :, 1])
+        return sprite
+
+
+def _toBGR(color: Union[str, Tuple]) -> Tuple[int, int, int]:
+    """Convert a color name or an RGB(A) tuple to a BGR tuple."""
+    if isinstance(color, str):
+        color = ImageColor.getrgb(color)
+    r, g, b = color[:3]
+    return (b, g, r)
+
+
+def get_glyph_atlas(
+    ttfontname: str, fontsize: int = 16, stroke_width: int = 0
+) -> GlyphAtlas:
+    """Return the shared :class:`GlyphAtlas <veditor.utils.glyph_utils.GlyphAtlas>` for (``ttfontname``, ``fontsize``, ``stroke_width``).
+
+    Args:
+        ttfontname (str)             : A filename containing a TrueType font.
+        fontsize (int, optional)     : The font size. Defaults to ``16``.
+        stroke_width (int, optional) : The width of the text stroke. Defaults to ``0``.
+
+    Returns:
+        GlyphAtlas: A glyph atlas which is shared among all callers.
+    """
+    return _glyph_atlases.get_or_create(
+        key=(ttfontname, int(fontsize), int(stroke_width)),
+        create=lambda: GlyphAtlas(
+            ttfontname=ttfontname, fontsize=fontsize, stroke_width=stroke_width
+        ),
+    )
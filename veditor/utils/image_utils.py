@@ -1,8 +1,10 @@
 # coding: utf-8
 import math
+import os
 import string
 import textwrap
-from typing import List, Optional, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple, Union
 
 import cv2
 import matplotlib.pyplot as plt
@@ -13,6 +15,7 @@ from matplotlib.colors import Colormap
 from PIL import Image, ImageDraw, ImageFont
 
 from .generic_utils import assign_trbl, flatten_dual, handleKeyError
+from .media_utils import probe_media
 
 
 def arr2pil(frame: npt.NDArray[np.uint8]) -> Image.Image:
@@ -463,3 +466,219 @@ def alpha_composite(
     img_clear.paste(paste, box=box)
     bg = Image.alpha_composite(im1=bg, im2=img_clear)
     return bg
+
+
+def pil2bgra(image: Image.Image) -> npt.NDArray[np.uint8]:
+    """Convert from ``image`` (``Image.Image``) to ``frame`` (BGRA ``npt.NDArray``) keeping the alpha channel.
+
+    Args:
+        image (Image.Image) : An ``Image.Image`` (Any mode.)
+
+    Returns:
+        npt.NDArray[np.uint8] : A BGRA ``npt.NDArray``.
+    """
+    return cv2.cvtColor(
+        np.asarray(image.convert("RGBA"), dtype=np.uint8), cv2.COLOR_RGBA2BGRA
+    )
+
+
+def overlay_bgra(
+    frame: npt.NDArray[np.uint8],
+    paste: npt.NDArray[np.uint8],
+    top: int = 0,
+    left: int = 0,
+) -> npt.NDArray[np.uint8]:
+    """Paste the ``paste`` image to ``frame`` in place with considering alpha channel.
+
+    Unlike :func:`alpha_composite <veditor.utils.image_utils.alpha_composite>`, only the region of interest (ROI) covered by ``paste`` is blended, and no conversion to ``Image.Image`` occurs. The parts of ``paste`` which are out of ``frame`` are clipped.
+
+    Args:
+        frame (npt.NDArray[np.uint8]) : Background image (BGR).
+        paste (npt.NDArray[np.uint8]) : Image to paste (BGRA or BGR).
+        top (int, optional)           : Where to paste the ``paste`` image on ``frame`` (y). Defaults to ``0``.
+        left (int, optional)          : Where to paste the ``paste`` image on ``frame`` (x). Defaults to ``0``.
+
+    Returns:
+        npt.NDArray[np.uint8]: ``frame`` with ``paste`` composited.
+    """
+    H, W = frame.shape[:2]
+    h, w = paste.shape[:2]
+    t, l = max(top, 0), max(left, 0)
+    b, r = min(top + h, H), min(left + w, W)
+    if (t >= b) or (l >= r):
+        return frame
+    src = paste[t - top : b - top, l - left : r - left]
+    roi = frame[t:b, l:r]
+    if src.shape[2] == 3:
+        roi[:] = src
+    else:
+        alpha = src[:, :, 3:].astype(np.uint16)
+        roi[:] = (src[:, :, :3] * alpha + roi * (255 - alpha) + 127) // 255
+    return frame
+
+
+def image_size(path: str) -> Tuple[int, int]:
+    """Read the size of the image at ``path`` from its header, without decoding pixels. (See :func:`probe_media <veditor.utils.media_utils.probe_media>`)
+
+    Like ``cv2.imread``, the EXIF orientation is taken into account (the width and the height are swapped for rotated images.)
+
+    Args:
+        path (str) : Path to the image file.
+
+    Returns:
+        Tuple[int, int]: The size of the image (``width``, ``height``).
+
+    Examples:
+        >>> from veditor.utils import image_size, SampleData
+        >>> image_size(SampleData().IMAGE_PATH)
+        (1280, 720)
+    """
+    info = probe_media(path)
+    return (info["width"], info["height"])
+
+
+def premultiply_alpha(
+    image: npt.NDArray[np.uint8],
+) -> Tuple[npt.NDArray[np.uint8], Optional[npt.NDArray[np.uint8]]]:
+    """Split ``image`` into the colors premultiplied by alpha and the inverse alpha, which can be pasted by :func:`overlay_premultiplied <veditor.utils.image_utils.overlay_premultiplied>`.
+
+    Args:
+        image (npt.NDArray[np.uint8]) : An image (Gray, BGR or BGRA. 16-bit images are reduced to 8-bit.)
+
+    Returns:
+        Tuple[npt.NDArray[np.uint8], Optional[npt.NDArray[np.uint8]]]: The premultiplied colors (BGR) and the inverse alpha (``255 - alpha`` in 3 channels.) The inverse alpha is ``None`` when ``image`` is opaque.
+    """
+    if image.dtype == np.uint16:
+        image = (image >> 8).astype(np.uint8)
+    if image.ndim == 2:
+        image = cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+    if (image.shape[2] == 3) or np.all(image[:, :, 3] == 255):
+        return (np.ascontiguousarray(image[:, :, :3]), None)
+    alpha = cv2.cvtColor(image[:, :, 3], cv2.COLOR_GRAY2BGR)
+    premultiplied = cv2.multiply(
+        np.ascontiguousarray(image[:, :, :3]), alpha, scale=1 / 255
+    )
+    return (premultiplied, 255 - alpha)
+
+
+def overlay_premultiplied(
+    frame: npt.NDArray[np.uint8],
+    premultiplied: npt.NDArray[np.uint8],
+    inverse_alpha: Optional[npt.NDArray[np.uint8]] = None,
+    top: int = 0,
+    left: int = 0,
+) -> npt.NDArray[np.uint8]:
+    """Paste an image split by :func:`premultiply_alpha <veditor.utils.image_utils.premultiply_alpha>` to ``frame`` in place.
+
+    As alpha is precomputed, the region of interest (ROI) is blended with two saturating ``OpenCV`` operations, which is much faster than :func:`overlay_bgra <veditor.utils.image_utils.overlay_bgra>`. The parts out of ``frame`` are clipped.
+
+    Args:
+        frame (npt.NDArray[np.uint8])                           : Background image (BGR).
+        premultiplied (npt.NDArray[np.uint8])                   : The premultiplied colors (BGR) to paste.
+        inverse_alpha (Optional[npt.NDArray[np.uint8]], optional) : The inverse alpha. Defaults to ``None``. (Opaque.)
+        top (int, optional)                                     : Where to paste the image on ``frame`` (y). Defaults to ``0``.
+        left (int, optional)                                    : Where to paste the image on ``frame`` (x). Defaults to ``0``.
+
+    Returns:
+        npt.NDArray[np.uint8]: ``frame`` with the image composited.
+    """
+    H, W = frame.shape[:2]
+    h, w = premultiplied.shape[:2]
+    t, l = max(top, 0), max(left, 0)
+    b, r = min(top + h, H), min(left + w, W)
+    if (t >= b) or (l >= r):
+        return frame
+    src = (slice(t - top, b - top), slice(l - left, r - left))
+    roi = frame[t:b, l:r]
+    if inverse_alpha is None:
+        roi[:] = premultiplied[src]
+    else:
+        cv2.add(
+            cv2.multiply(roi, inverse_alpha[src], scale=1 / 255),
+            premultiplied[src],
+            dst=roi,
+        )
+    return frame
+
+
+# Filter name -> (OpenCV interpolation, PIL resampling filter) used for upscales. (Downscales always use area interpolation.)
+SUPPORTED_UPSCALE_FILTERS: Dict[str, Tuple[int, int]] = {
+    "nearest": (cv2.INTER_NEAREST, Image.NEAREST),
+    "linear": (cv2.INTER_LINEAR, Image.BILINEAR),
+    "cubic": (cv2.INTER_CUBIC, Image.BICUBIC),
+    "lanczos": (cv2.INTER_LANCZOS4, Image.LANCZOS),
+}
+
+
+def resize_image(
+    image: Union[npt.NDArray[np.uint8], Image.Image],
+    dsize: Tuple[int, int],
+    upscale_filter: str = "cubic",
+) -> Union[npt.NDArray[np.uint8], Image.Image]:
+    """Resize ``image`` to ``dsize`` with the interpolation suitable for the scale.
+
+    Downscales use area interpolation (which averages pixels, so it does not alias), and upscales use ``upscale_filter``. ``image`` itself is returned if it already has the size.
+
+    Args:
+        image (Union[npt.NDArray[np.uint8], Image.Image]) : An image (``npt.NDArray`` or ``Image.Image``.)
+        dsize (Tuple[int, int])                         : Desired size (``width``, ``height``).
+        upscale_filter (str, optional)                  : Filter for upscales. (See ``SUPPORTED_UPSCALE_FILTERS``) Defaults to ``"cubic"``.
+
+    Returns:
+        Union[npt.NDArray[np.uint8], Image.Image]: The resized image.
+
+    Examples:
+        >>> import numpy as np
+        >>> from veditor.utils import resize_image
+        >>> resize_image(np.zeros(shape=(40, 80, 3), dtype=np.uint8), dsize=(160, 80)).shape
+        (80, 160, 3)
+    """
+    handleKeyError(
+        lst=list(SUPPORTED_UPSCALE_FILTERS.keys()), upscale_filter=upscale_filter
+    )
+    is_pil = isinstance(image, Image.Image)
+    w, h = image.size if is_pil else image.shape[1::-1]
+    if (w, h) == tuple(dsize):
+        return image
+    cv2_filter, pil_filter = SUPPORTED_UPSCALE_FILTERS[upscale_filter]
+    if (dsize[0] <= w) and (dsize[1] <= h):
+        cv2_filter, pil_filter = (cv2.INTER_AREA, Image.BOX)
+    if is_pil:
+        return image.resize(tuple(dsize), resample=pil_filter)
+    return cv2.resize(image, dsize=tuple(dsize), interpolation=cv2_filter)
+
+
+def resize_images(
+    images: List[Union[npt.NDArray[np.uint8], Image.Image]],
+    dsize: Tuple[int, int],
+    upscale_filter: str = "cubic",
+    max_workers: Optional[int] = None,
+) -> List[Union[npt.NDArray[np.uint8], Image.Image]]:
+    """Resize a stack of images (e.g. frames of an animation) by :func:`resize_image <veditor.utils.image_utils.resize_image>` in parallel.
+
+    Both ``OpenCV`` and ``PIL`` release the GIL while resizing, so a thread pool scales with CPU cores without copying images between processes.
+
+    Args:
+        images (List[Union[npt.NDArray[np.uint8], Image.Image]]) : Images.
+        dsize (Tuple[int, int])                                : Desired size (``width``, ``height``).
+        upscale_filter (str, optional)                         : Filter for upscales. Defaults to ``"cubic"``.
+        max_workers (Optional[int], optional)                  : The number of threads. Defaults to ``None``. (The number of CPU cores.)
+
+    Returns:
+        List[Union[npt.NDArray[np.uint8], Image.Image]]: The resized images in order.
+    """
+    images = list(images)
+    if len(images) <= 1:
+        return [
+            resize_image(img, dsize=dsize, upscale_filter=upscale_filter)
+            for img in images
+        ]
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        return list(
+            executor.map(
+                lambda img: resize_image(
+                    img, dsize=dsize, upscale_filter=upscale_filter
+                ),
+                images,
+            )
+        )
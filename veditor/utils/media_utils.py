@@ -0,0 +1,94 @@
+# coding: utf-8
+import os
+from typing import Any, Dict
+
+import cv2
+from PIL import Image, UnidentifiedImageError
+
+from ._colorings import toBLUE
+from .cache_utils import LRUCache
+
+# (path, mtime, size) -> properties. Files are re-probed when they are modified.
+MEDIA_PROBES: LRUCache = LRUCache(maxsize=1024)
+# Pixel formats (reported by OpenCV as FOURCC) which have an alpha channel.
+ALPHA_PIXEL_FORMATS: tuple = (b"BGRA", b"RGBA", b"ARGB", b"ABGR", b"YUVA", b"Y4A0")
+
+
+def _probe_image(path: str) -> Dict[str, Any]:
+    """Read properties of the (animated) image at ``path`` from its headers with ``PIL``."""
+    with Image.open(path) as img:
+        w, h = img.size
+        # Orientation (Transpose / Rotate 90.)
+        if img.getexif().get(0x0112, 1) in (5, 6, 7, 8):
+            w, h = (h, w)
+        frame_count = getattr(img, "n_frames", 1)
+        interval = img.info.get("duration") or 0  # [ms] per frame.
+        has_alpha = (img.mode in ("RGBA", "LA", "PA", "RGBa", "La")) or (
+            "transparency" in img.info
+        )
+    fps = 1000 / interval if (frame_count > 1) and (interval > 0) else None
+    return dict(
+        kind="image",
+        width=w,
+        height=h,
+        frame_count=frame_count,
+        fps=fps,
+        duration=frame_count / fps if fps else None,
+        has_alpha=has_alpha,
+    )
+
+
+def _probe_video(path: str) -> Dict[str, Any]:
+    """Read properties of the video at ``path`` from its container with ``OpenCV``. (No frame is read.)"""
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"{toBLUE(path)} is neither an image nor a video.")
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    pixel_format = int(cap.get(cv2.CAP_PROP_CODEC_PIXEL_FORMAT)).to_bytes(4, "little")
+    info = dict(
+        kind="video",
+        width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        frame_count=frame_count,
+        fps=fps,
+        duration=frame_count / fps if fps > 0 else None,
+        has_alpha=pixel_format in ALPHA_PIXEL_FORMATS,
+    )
+    cap.release()
+    return info
+
+
+def probe_media(path: str) -> Dict[str, Any]:
+    """Probe an image, an animation or a video at ``path`` from its headers, without decoding pixels.
+
+    Results are memoized per (``path``, modification time), so elements which refer to the same file measure it only once.
+
+    Args:
+        path (str) : Path to the media file.
+
+    Raises:
+        FileNotFoundError: When file is not found.
+        ValueError: When the file cannot be read as an image or a video.
+
+    Returns:
+        Dict[str, Any]: Properties of the media (``path``, ``kind`` (``"image"`` or ``"video"``), ``width``, ``height``, ``frame_count``, ``fps``, ``duration`` [s] and ``has_alpha``.) ``fps`` and ``duration`` are ``None`` for still images.
+
+    Examples:
+        >>> from veditor.utils import probe_media, SampleData
+        >>> info = probe_media(SampleData().VIDEO_PATH)
+        >>> info["kind"], info["width"], info["height"]
+        ('video', 1280, 720)
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{toBLUE(path)} is not found.")
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key not in MEDIA_PROBES:
+        try:
+            info = _probe_image(path)
+        except UnidentifiedImageError:
+            info = _probe_video(path)
+        MEDIA_PROBES[key] = info
+    # Return a copy, so that callers cannot modify the memoized result.
+    return dict(path=path, **MEDIA_PROBES[key])
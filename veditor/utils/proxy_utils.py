@@ -0,0 +1,135 @@
+# coding: utf-8
+import logging
+import os
+import shutil
+import subprocess
+from typing import Optional
+
+import cv2
+
+from ._colorings import toBLUE
+from ._loggers import get_logger
+from ._path import PROXY_DIR
+from .cache_utils import DiskCache
+from .generic_utils import file_fingerprint
+
+# Motion JPEG in AVI (all-intra, so every frame is a cheap seek target.)
+PROXY_EXT: str = ".avi"
+
+_proxy_managers = {}
+
+
+class ProxyManager:
+    def __init__(
+        self,
+        cache_dir: str = PROXY_DIR,
+        height: int = 360,
+        quality: int = 5,
+        max_bytes: int = 10 * (1 << 30),
+        logger: Optional[logging.Logger] = None,
+    ):
+        """Manager of low-resolution, all-intra proxies of heavy source videos.
+
+        Each source is transcoded only once. Proxies are stored in a content-addressed cache (keyed by :func:`file_fingerprint <veditor.utils.generic_utils.file_fingerprint>` of the source and the proxy ``height``), so renamed or copied sources share the same proxy, and edited sources get a new one. When the cache exceeds ``max_bytes``, the least recently used proxies are evicted. (See :class:`DiskCache <veditor.utils.cache_utils.DiskCache>`)
+
+        Args:
+            cache_dir (str, optional)                  : Directory to store proxies. Defaults to ``PROXY_DIR``.
+            height (int, optional)                     : Height of proxies. (Sources which are not taller than this are used as they are.) Defaults to ``360``.
+            quality (int, optional)                    : Motion JPEG quality scale for ``ffmpeg`` (``2`` - ``31``, lower is better.) Defaults to ``5``.
+            max_bytes (int, optional)                  : The maximum total size of the cache. Defaults to ``10 * (1 << 30)``. (10GB)
+            logger (Optional[logging.Logger], optional) : Logger. Defaults to ``None``.
+
+        Examples:
+            >>> from veditor.utils import get_proxy_manager, SampleData
+            >>> manager = get_proxy_manager()
+            >>> proxy_path = manager.get(SampleData().VIDEO_PATH)
+        """
+        self.height = height
+        self.quality = quality
+        self.logger = logger or get_logger(name=__name__)
+        self.cache = DiskCache(
+            cache_dir=cache_dir, ext=PROXY_EXT, max_bytes=max_bytes, logger=self.logger
+        )
+
+    def key(self, path: str) -> str:
+        """Return the cache key of the proxy of the video at ``path``."""
+        return f"{file_fingerprint(path)}_{self.height}p"
+
+    def get(self, path: str) -> str:
+        """Return the path to the proxy of the video at ``path``, transcoding it at the first call.
+
+        Args:
+            path (str) : Path to the source video.
+
+        Raises:
+            FileNotFoundError: When file is not found.
+
+        Returns:
+            str: Path to the proxy. If the source is small enough, ``path`` itself.
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"{toBLUE(path)} is not found.")
+        cap = cv2.VideoCapture(path)
+        H = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        cap.release()
+        if H <= self.height:
+            return path
+        key = self.key(path)
+        proxy_path = self.cache.get(key)
+        if proxy_path is None:
+            tmp_path = self.cache.tmp_path(key)
+            self.logger.info(
+                f"Creating the proxy of {toBLUE(path)} at {toBLUE(tmp_path)}"
+            )
+            if shutil.which("ffmpeg") is not None:
+                self.transcode_ffmpeg(path=path, out_path=tmp_path)
+            else:
+                self.transcode_cv2(path=path, out_path=tmp_path)
+            proxy_path = self.cache.put(key=key, path=tmp_path)
+        return proxy_path
+
+    def transcode_ffmpeg(self, path: str, out_path: str) -> None:
+        """Transcode the video at ``path`` into a proxy with ``ffmpeg``. (Audio is dropped and every frame is kept.)"""
+        command = [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-i", path,
+            "-an",
+            "-vf", f"scale=-2:{self.height}",
+            "-c:v", "mjpeg", "-q:v", str(self.quality),
+            "-vsync", "passthrough",
+            out_path,
+        ]  # fmt: skip
+        subprocess.run(command, check=True)
+
+    def transcode_cv2(self, path: str, out_path: str) -> None:
+        """Transcode the video at ``path`` into a proxy with ``cv2`` (when ``ffmpeg`` is not available.)"""
+        cap = cv2.VideoCapture(path)
+        W = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        H = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        dsize = (max(2, int(round(W * self.height / H / 2)) * 2), self.height)
+        out = cv2.VideoWriter(
+            out_path, cv2.VideoWriter_fourcc(*"MJPG"), cap.get(cv2.CAP_PROP_FPS), dsize
+        )
+        while True:
+            is_ok, frame = cap.read()
+            if (not is_ok) or (frame is None):
+                break
+            out.write(cv2.resize(frame, dsize=dsize, interpolation=cv2.INTER_AREA))
+        out.release()
+        cap.release()
+
+
+def get_proxy_manager(cache_dir: str = PROXY_DIR, height: int = 360) -> ProxyManager:
+    """Return the shared :class:`ProxyManager <veditor.utils.proxy_utils.ProxyManager>` for (``cache_dir``, ``height``).
+
+    Args:
+        cache_dir (str, optional) : Directory to store proxies. Defaults to ``PROXY_DIR``.
+        height (int, optional)    : Height of proxies. Defaults to ``360``.
+
+    Returns:
+        ProxyManager: A proxy manager which is shared among all callers.
+    """
+    key = (cache_dir, height)
+    if key not in _proxy_managers:
+        _proxy_managers[key] = ProxyManager(cache_dir=cache_dir, height=height)
+    return _proxy_managers[key]
@@ -0,0 +1,139 @@
+# coding: utf-8
+import os
+import re
+from typing import List, Tuple
+
+from ._colorings import toBLUE
+from .generic_utils import handleKeyError
+
+SUPPORTED_SUBTITLE_FORMATS: List[str] = ["srt", "vtt"]
+
+_TIMESTAMP_PATTERN = re.compile(r"(?:(\d+):)?(\d{1,2}):(\d{2})[,.](\d{1,3})")
+_TIMING_PATTERN = re.compile(
+    r"^\s*(?P<start>[\d:,.]+)\s*-->\s*(?P<end>[\d:,.]+)(?:\s+.*)?$"
+)
+_TAG_PATTERN = re.compile(r"<[^>]+>")
+
+
+def timestamp2msec(timestamp: str) -> int:
+    """Convert a subtitle timestamp into milliseconds.
+
+    Args:
+        timestamp (str) : A timestamp like ``"00:01:02,345"`` (SRT) or ``"01:02.345"`` (WebVTT).
+
+    Raises:
+        ValueError: When ``timestamp`` is not a valid format.
+
+    Returns:
+        int: Milliseconds.
+
+    Examples:
+        >>> from veditor.utils import timestamp2msec
+        >>> timestamp2msec("00:01:02,345")
+        62345
+        >>> timestamp2msec("01:02.345")
+        62345
+    """
+    match = _TIMESTAMP_PATTERN.fullmatch(timestamp.strip())
+    if match is None:
+        raise ValueError(f"Invalid timestamp: {toBLUE(timestamp)}")
+    h, m, s, ms = match.groups()
+    return ((int(h or 0) * 60 + int(m)) * 60 + int(s)) * 1000 + int(ms.ljust(3, "0"))
+
+
+def parse_subtitles(text: str) -> List[Tuple[int, int, str]]:
+    """Parse SRT or WebVTT formatted ``text`` into cues.
+
+    Both formats consist of blocks separated by blank lines, and each block has a timing line (``start --> end``) followed by text lines. Lines before the timing line (cue numbers / identifiers) and blocks without a timing line (``WEBVTT`` header, ``NOTE``, ``STYLE``, ...) are ignored, and markup tags (e.g. ``<i>``) are removed.
+
+    Args:
+        text (str) : Contents of a subtitle file.
+
+    Returns:
+        List[Tuple[int, int, str]]: Cues sorted by start time. Each cue is a tuple of (``start [ms]``, ``end [ms]``, ``text``).
+
+    Examples:
+        >>> from veditor.utils import parse_subtitles
+        >>> parse_subtitles("1\\n00:00:01,000 --> 00:00:02,500\\n<i>Hello</i>\\nWorld\\n")
+        [(1000, 2500, 'Hello\\nWorld')]
+    """
+    cues: List[Tuple[int, int, str]] = []
+    for block in re.split(r"\n\s*\n", text.replace("\r\n", "\n").replace("\r", "\n")):
+        lines = block.strip("\n").split("\n")
+        for i, line in enumerate(lines):
+            match = _TIMING_PATTERN.match(line)
+            if match is not None:
+                body = "\n".join(
+                    _TAG_PATTERN.sub("", l).strip() for l in lines[i + 1 :]
+                ).strip()
+                if len(body) > 0:
+                    cues.append(
+                        (
+                            timestamp2msec(match.group("start")),
+                            timestamp2msec(match.group("end")),
+                            body,
+                        )
+                    )
+                break
+    return sorted(cues, key=lambda cue: cue[0])
+
+
+def merge_cues(cues: List[Tuple[int, int, str]]) -> List[Tuple[int, int, str]]:
+    """Merge overlapping ``cues`` into cues which do not overlap, so that at most one cue is active at any time.
+
+    The timeline is split at every start and end of ``cues``, and the texts of the cues active in each interval are stacked (joined by newlines in order of their start times) as players display overlapping cues. Adjacent intervals with the same text are joined.
+
+    Args:
+        cues (List[Tuple[int, int, str]]) : Cues as (``start [ms]``, ``end [ms]``, ``text``).
+
+    Returns:
+        List[Tuple[int, int, str]]: Non-overlapping cues sorted by start time.
+
+    Examples:
+        >>> from veditor.utils import merge_cues
+        >>> merge_cues([(0, 2000, "Hello"), (500, 1000, "World")])
+        [(0, 500, 'Hello'), (500, 1000, 'Hello\\nWorld'), (1000, 2000, 'Hello')]
+    """
+    cues = sorted(cues, key=lambda cue: cue[0])
+    bounds = sorted(set(t for start, end, _ in cues for t in (start, end)))
+    merged: List[Tuple[int, int, str]] = []
+    active: List[int] = []
+    i = 0
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        active = [j for j in active if cues[j][1] > start]
+        while (i < len(cues)) and (cues[i][0] <= start):
+            if cues[i][1] > start:
+                active.append(i)
+            i += 1
+        if len(active) == 0:
+            continue
+        text = "\n".join(cues[j][2] for j in active)
+        if (len(merged) > 0) and (merged[-1][1] == start) and (merged[-1][2] == text):
+            merged[-1] = (merged[-1][0], end, text)
+        else:
+            merged.append((start, end, text))
+    return merged
+
+
+def load_subtitles(
+    path: str, encoding: str = "utf-8-sig"
+) -> List[Tuple[int, int, str]]:
+    """Load cues from a subtitle file (``.srt`` or ``.vtt``).
+
+    Args:
+        path (str)               : Path to the subtitle file.
+        encoding (str, optional) : Encoding of the subtitle file. Defaults to ``"utf-8-sig"``.
+
+    Raises:
+        FileNotFoundError: When file is not found.
+
+    Returns:
+        List[Tuple[int, int, str]]: Cues sorted by start time. (See :func:`parse_subtitles <veditor.utils.subtitle_utils.parse_subtitles>`)
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{toBLUE(path)} is not found.")
+    handleKeyError(
+        lst=SUPPORTED_SUBTITLE_FORMATS, format=os.path.splitext(path)[1][1:].lower()
+    )
+    with open(path, mode="r", encoding=encoding) as f:
+        return parse_subtitles(f.read())
@@ -0,0 +1,175 @@
+# coding: utf-8
+import os
+import shutil
+import subprocess
+from typing import List, Optional, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+from PIL import Image
+
+from .cache_utils import LRUCache
+from .media_utils import probe_media
+from .track_utils import interpolate_keyframes
+from .video_utils import probe_video_stream
+
+# (path, mtime, size) -> boundaries of frames in seconds. (See ``probe_frame_times``)
+FRAME_TIMES: LRUCache = LRUCache(maxsize=256)
+# Duration of animation frames which do not specify it (as browsers do for GIFs.)
+DEFAULT_FRAME_DURATION: float = 0.1
+
+
+def _image_frame_times(path: str) -> npt.NDArray[np.float64]:
+    """Boundaries of the frames of the (animated) image at ``path`` from the durations in its frame headers."""
+    durations = []
+    with Image.open(path) as img:
+        for i in range(getattr(img, "n_frames", 1)):
+            img.seek(i)
+            durations.append((img.info.get("duration") or 0) / 1000)
+    durations = np.asarray(durations, dtype=np.float64)
+    durations[durations <= 0] = DEFAULT_FRAME_DURATION
+    return np.concatenate([[0.0], np.cumsum(durations)])
+
+
+def _video_frame_times(
+    path: str, frame_count: int, fps: float
+) -> npt.NDArray[np.float64]:
+    """Boundaries of the frames of the video at ``path``.
+
+    Constant frame rate videos (whose ``r_frame_rate`` equals ``avg_frame_rate``) are computed from the frame rate without reading the file. Otherwise the presentation timestamps of all packets are read (without decoding) with ``ffprobe``.
+    """
+    uniform = np.arange(frame_count + 1, dtype=np.float64) / fps
+    if shutil.which("ffprobe") is None:
+        return uniform
+    try:
+        stream = probe_video_stream(path)
+    except (subprocess.CalledProcessError, ValueError):
+        return uniform
+    if stream.get("r_frame_rate") == stream.get("avg_frame_rate"):
+        return uniform
+    command = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "packet=pts_time",
+        "-of", "csv=p=0",
+        path,
+    ]  # fmt: skip
+    stdout = subprocess.run(command, capture_output=True, text=True).stdout
+    pts = np.sort(
+        [float(t) for t in stdout.replace(",", "\n").split() if t not in ("", "N/A")]
+    )
+    if len(pts) < 2:
+        return uniform
+    pts -= pts[0]
+    return np.concatenate([pts, [pts[-1] + np.median(np.diff(pts))]])
+
+
+def probe_frame_times(path: str) -> npt.NDArray[np.float64]:
+    """Boundaries of the frames of a video or an animation at ``path`` in seconds: the ``i``-th frame is presented during ``[times[i], times[i + 1])``.
+
+    Variable frame rate videos are indexed by their presentation timestamps, and animated images by the durations of their frames. Results are memoized per (``path``, modification time.)
+
+    Args:
+        path (str) : Path to the media file.
+
+    Returns:
+        npt.NDArray[np.float64]: ``frame_count + 1`` boundaries starting from ``0``.
+    """
+    info = probe_media(path)
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key not in FRAME_TIMES:
+        if info["kind"] == "image":
+            FRAME_TIMES[key] = _image_frame_times(path)
+        else:
+            fps = info["fps"] if info["fps"] and info["fps"] > 0 else 30.0
+            FRAME_TIMES[key] = _video_frame_times(path, info["frame_count"], fps)
+    return FRAME_TIMES[key]
+
+
+def frame_schedule(
+    frame_times: npt.ArrayLike, fps: float, start: int = 0, end: Optional[int] = None
+) -> npt.NDArray[np.int64]:
+    """Map the frames of a timeline at ``fps`` to the source frames ``[start, end)`` presented at the same time.
+
+    Frames of the source are duplicated (when it is slower than the timeline) or dropped (when faster), and the whole schedule is computed at once, so mapping a timeline frame to a source frame is a single lookup.
+
+    Args:
+        frame_times (npt.ArrayLike)   : Boundaries of the source frames in seconds. (See :func:`probe_frame_times <veditor.utils.timing_utils.probe_frame_times>`)
+        fps (float)                   : Frame rate of the timeline.
+        start (int, optional)         : The first source frame. Defaults to ``0``.
+        end (Optional[int], optional) : The source frame to stop at (exclusive.) Defaults to ``None``. (The last one.)
+
+    Returns:
+        npt.NDArray[np.int64]: The source frame of each timeline frame.
+
+    Examples:
+        >>> import numpy as np
+        >>> from veditor.utils import frame_schedule
+        >>> frame_schedule(np.arange(5) / 24, fps=60).tolist()  # 24fps -> 60fps
+        [0, 0, 0, 1, 1, 2, 2, 2, 3, 3]
+        >>> frame_schedule(np.arange(7) / 60, fps=24).tolist()  # 60fps -> 24fps
+        [0, 2, 5]
+    """
+    times = np.asarray(frame_times, dtype=np.float64)
+    if end is None:
+        end = len(times) - 1
+    count = max(int(np.ceil((times[end] - times[start]) * fps - 1e-6)), 1)
+    t = times[start] + np.arange(count) / fps
+    # The frame which is presented at ``t`` (with a margin for rounding errors of timestamps.)
+    idx = np.searchsorted(times, t + 1e-6, side="right") - 1
+    return np.clip(idx, start, end - 1).astype(np.int64)
+
+
+def retime_schedule(
+    frame_count: int,
+    fps: float,
+    out_fps: Optional[float] = None,
+    speed: Union[float, List[Tuple]] = 1.0,
+    blend: bool = False,
+) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]:
+    """Map the frames of an output at ``out_fps`` to the frames of a timeline at ``fps`` played at ``speed``.
+
+    The output time of each timeline frame is the cumulative sum of its durations divided by its speeds, and the timeline position presented at each output frame is found by interpolating it at once. Since the positions never go back, the timeline can be rendered in one sequential pass.
+
+    Args:
+        frame_count (int)                           : The number of frames of the timeline.
+        fps (float)                                 : Frame rate of the timeline.
+        out_fps (Optional[float], optional)         : Frame rate of the output. Defaults to ``None``. (Same as ``fps``.)
+        speed (Union[float, List[Tuple]], optional) : Playback speed, or keyframes of a speed ramp as ``(pos, speed)`` or ``(pos, speed, easing)`` in timeline positions. (See :func:`interpolate_keyframes <veditor.utils.track_utils.interpolate_keyframes>`) Defaults to ``1.0``.
+        blend (bool, optional)                      : Whether to blend the two timeline frames around the (fractional) position instead of taking the earlier one. Defaults to ``False``.
+
+    Raises:
+        ValueError: When the speed is not positive.
+
+    Returns:
+        Tuple[npt.NDArray[np.int64], npt.NDArray[np.float64]]: The (earlier) timeline frame of each output frame, and the weight of the next timeline frame (all ``0`` unless ``blend``.)
+
+    Examples:
+        >>> from veditor.utils import retime_schedule
+        >>> retime_schedule(frame_count=6, fps=30, speed=2.0)[0].tolist()
+        [0, 2, 4]
+        >>> idx, weights = retime_schedule(frame_count=3, fps=30, out_fps=60, blend=True)
+        >>> idx.tolist(), weights.tolist()
+        ([0, 0, 1, 1, 2, 2], [0.0, 0.5, 0.0, 0.5, 0.0, 0.0])
+    """
+    out_fps = out_fps or fps
+    positions = np.arange(frame_count)
+    if isinstance(speed, (int, float)):
+        speeds = np.full(shape=frame_count, fill_value=float(speed))
+    else:
+        speeds = interpolate_keyframes(
+            [(k[0], k[1], k[2] if len(k) > 2 else "linear") for k in sorted(speed)],
+            positions,
+        )
+    if np.any(speeds <= 0):
+        raise ValueError(f"The speed must be positive, but got {speed}.")
+    # Output time when each timeline frame starts (and when the last one ends.)
+    starts = np.concatenate([[0.0], np.cumsum(1 / (fps * speeds))])
+    count = max(int(np.ceil(starts[-1] * out_fps - 1e-6)), 1)
+    x = np.interp(np.arange(count) / out_fps, starts, np.arange(frame_count + 1))
+    idx = np.minimum(np.floor(x + 1e-6).astype(np.int64), frame_count - 1)
+    weights = np.clip(x - idx, 0, 1) if blend else np.zeros(shape=count)
+    weights[idx >= frame_count - 1] = 0
+    weights[weights < 1e-6] = 0
+    return (idx, weights)
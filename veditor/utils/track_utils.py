@@ -0,0 +1,96 @@
+# coding: utf-8
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from .generic_utils import handleKeyError
+
+# Easing name -> control points (x1, y1, x2, y2) of the cubic bezier curve (same as CSS.)
+SUPPORTED_EASINGS: Dict[str, Tuple[float, float, float, float]] = {
+    "linear": (0.0, 0.0, 1.0, 1.0),
+    "ease": (0.25, 0.1, 0.25, 1.0),
+    "ease-in": (0.42, 0.0, 1.0, 1.0),
+    "ease-out": (0.0, 0.0, 0.58, 1.0),
+    "ease-in-out": (0.42, 0.0, 0.58, 1.0),
+}
+Easing = Union[str, Sequence[float]]
+Keyframe = Tuple[int, float, Easing]
+
+
+def easing2points(easing: Easing) -> Tuple[float, float, float, float]:
+    """Convert ``easing`` (one of ``SUPPORTED_EASINGS``, or control points ``(x1, y1, x2, y2)``) to control points of the cubic bezier curve."""
+    if isinstance(easing, str):
+        handleKeyError(lst=list(SUPPORTED_EASINGS.keys()), easing=easing)
+        return SUPPORTED_EASINGS[easing]
+    x1, y1, x2, y2 = [float(v) for v in easing]
+    if not ((0 <= x1 <= 1) and (0 <= x2 <= 1)):
+        raise ValueError(
+            f"x1 and x2 of the bezier easing must be in [0, 1], but got {easing}."
+        )
+    return (x1, y1, x2, y2)
+
+
+def cubic_bezier(
+    t: npt.ArrayLike, easing: Easing = "ease", samples: int = 1024
+) -> npt.NDArray:
+    """Evaluate the easing curve at progress ``t`` (in ``[0, 1]``) in a vectorized way.
+
+    The curve is sampled once at ``samples`` points, and ``t`` is looked up by linear interpolation (instead of solving the cubic equation for each value.)
+
+    Args:
+        t (npt.ArrayLike)          : Progress in ``[0, 1]``.
+        easing (Easing, optional)  : Easing name or control points ``(x1, y1, x2, y2)``. Defaults to ``"ease"``.
+        samples (int, optional)    : The number of sample points of the curve. Defaults to ``1024``.
+
+    Returns:
+        npt.NDArray: The eased progress.
+
+    Examples:
+        >>> from veditor.utils import cubic_bezier
+        >>> cubic_bezier([0, 0.5, 1], easing="ease-in-out").round(3).tolist()
+        [0.0, 0.5, 1.0]
+    """
+    x1, y1, x2, y2 = easing2points(easing)
+    t = np.asarray(t, dtype=np.float64)
+    if (x1, y1, x2, y2) == SUPPORTED_EASINGS["linear"]:
+        return t
+    s = np.linspace(0, 1, samples)
+    bx = 3 * (1 - s) ** 2 * s * x1 + 3 * (1 - s) * s**2 * x2 + s**3
+    by = 3 * (1 - s) ** 2 * s * y1 + 3 * (1 - s) * s**2 * y2 + s**3
+    return np.interp(t, bx, by)
+
+
+def interpolate_keyframes(
+    keyframes: List[Keyframe], positions: npt.ArrayLike
+) -> npt.NDArray:
+    """Evaluate a keyframed track at ``positions`` at once.
+
+    Before the first (after the last) keyframe, the value of the first (last) keyframe is held. Between keyframes, values are interpolated with the easing of the earlier keyframe.
+
+    Args:
+        keyframes (List[Keyframe]) : Keyframes as ``(pos, value, easing)`` sorted by ``pos``.
+        positions (npt.ArrayLike)  : Positions to evaluate.
+
+    Returns:
+        npt.NDArray: Values at ``positions``.
+
+    Examples:
+        >>> from veditor.utils import interpolate_keyframes
+        >>> interpolate_keyframes([(0, 0.0, "linear"), (10, 100.0, "linear")], [-5, 0, 5, 10, 15]).tolist()
+        [0.0, 0.0, 50.0, 100.0, 100.0]
+    """
+    x = np.asarray(positions, dtype=np.float64)
+    pos = np.asarray([k[0] for k in keyframes], dtype=np.float64)
+    values = np.asarray([k[1] for k in keyframes], dtype=np.float64)
+    if len(keyframes) == 1:
+        return np.full(shape=x.shape, fill_value=values[0])
+    idx = np.clip(np.searchsorted(pos, x, side="right") - 1, 0, len(pos) - 2)
+    t = np.clip((x - pos[idx]) / np.maximum(pos[idx + 1] - pos[idx], 1e-9), 0, 1)
+    # Ease each group of segments which share the easing at once.
+    easings = [easing2points(k[2]) for k in keyframes[:-1]]
+    for points in set(easings):
+        segments = [i for i, e in enumerate(easings) if e == points]
+        mask = np.isin(idx, segments)
+        t[mask] = cubic_bezier(t[mask], easing=points)
+    return values[idx] + (values[idx + 1] - values[idx]) * t
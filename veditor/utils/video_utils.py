@@ -1,15 +1,40 @@
 # coding: utf-8
+import json
 import math
 import os
-from typing import List, Optional, Tuple, Union
+import shutil
+import subprocess
+import tempfile
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import cv2
 import matplotlib.pyplot as plt
+import numpy as np
+import numpy.typing as npt
 from matplotlib.figure import Figure
 from tqdm import tqdm
 
-from ._colorings import toGREEN
-from .generic_utils import now_str
+from ._colorings import toBLUE, toGREEN
+from .cache_utils import FrameRing, LRUCache
+from .generic_utils import handleKeyError, now_str
+from .image_utils import resize_image
+
+PREVIEW_CODEC: str = "MJPG"  # Intra-only codec which is fast to encode.
+# Source codec -> ffmpeg encoder, for codecs whose ranges can be cut and re-joined by stream-copy.
+SMART_CUT_ENCODERS: Dict[str, str] = {"h264": "libx264", "hevc": "libx265"}
+# (path, mtime, size) -> positions of keyframes. (See ``keyframe_index``)
+KEYFRAME_INDEXES: LRUCache = LRUCache(maxsize=256)
+VIDEO_EXTENSIONS: List[str] = [
+    ".mp4",
+    ".mov",
+    ".m4v",
+    ".mkv",
+    ".avi",
+    ".webm",
+    ".wmv",
+    ".ogg",
+]
 
 
 def createVideoWritor(
@@ -22,14 +47,14 @@ def createVideoWritor(
         W (int)                            : Width of the output video.
         fps (float)                        : Frame rate of the output video.
         codec (str, optional)              : Video codec for the output video. Defaults to ``"avc1"``.
-        out_path (Optional[str], optional) : [description]. Defaults to ``None``.
+        out_path (Optional[str], optional) : Path to the output video. Defaults to ``None``. (The extension is inferred from ``codec``.)
 
     Returns:
         Tuple[cv2.VideoWriter, str]: Tuple of ``cv2.VideoWriter`` and path to output video.
     """
     if out_path is None:
-        out_path = now_str() + ".mp4"
-    out = cv2.VideoWriter(out_path, fourcc, fps, (W, H))
+        out_path = now_str() + vcodec2ext(codec)
+    out = cv2.VideoWriter(out_path, cv2.VideoWriter_fourcc(*codec), fps, (W, H))
     return (out, out_path)
 
 
@@ -66,11 +91,354 @@ def capture2writor(
         H=H or int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
         W=W or int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
         fps=fps or cap.get(cv2.CAP_PROP_FPS),
-        fourcc=cv2.VideoWriter_fourcc(*codec),
+        codec=codec,
         out_path=out_path,
     )
 
 
+def concat_videos(paths: List[str], out_path: str) -> str:
+    """Concatenate videos (with the same codec and parameters) into one by stream-copy, using the ``ffmpeg`` concat demuxer.
+
+    Args:
+        paths (List[str]) : Paths to the videos. Each video should start with a keyframe.
+        out_path (str)    : Path to the concatenated video.
+
+    Returns:
+        str: Path to the concatenated video.
+    """
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".txt", delete=False) as f:
+        for path in paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+        list_path = f.name
+    try:
+        command = [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "concat", "-safe", "0",
+            "-i", list_path,
+            "-c", "copy",
+            out_path,
+        ]  # fmt: skip
+        subprocess.run(command, check=True)
+    finally:
+        os.remove(list_path)
+    return out_path
+
+
+def probe_video_stream(path: str) -> Dict[str, Any]:
+    """Probe the first video stream of the video at ``path`` with ``ffprobe``.
+
+    Args:
+        path (str) : Path to the video.
+
+    Returns:
+        Dict[str, Any]: Stream properties (``codec_name``, ``pix_fmt``, ``width``, ``height``, ``r_frame_rate``, ``start_time``, ...)
+    """
+    command = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-show_entries", "stream",
+        "-of", "json",
+        path,
+    ]  # fmt: skip
+    streams = json.loads(
+        subprocess.run(command, check=True, capture_output=True).stdout
+    )["streams"]
+    if len(streams) == 0:
+        raise ValueError(f"{toGREEN(path)} has no video stream.")
+    return streams[0]
+
+
+def probe_keyframes(path: str, fps: Optional[float] = None) -> npt.NDArray[np.int64]:
+    """Find the positions of keyframes in the video at ``path`` with ``ffprobe``. (Only keyframes are read, so it is fast.)
+
+    Args:
+        path (str)                      : Path to the video.
+        fps (Optional[float], optional) : Frame rate used to convert timestamps into positions. Defaults to ``None``. (Probed.)
+
+    Returns:
+        npt.NDArray[np.int64]: Sorted positions of keyframes.
+    """
+    stream = probe_video_stream(path)
+    if fps is None:
+        num, den = stream["r_frame_rate"].split("/")
+        fps = int(num) / int(den)
+    start_time = float(stream.get("start_time", 0) or 0)
+    command = [
+        "ffprobe", "-v", "error",
+        "-select_streams", "v:0",
+        "-skip_frame", "nokey",
+        "-show_entries", "frame=pts_time",
+        "-of", "csv=p=0",
+        path,
+    ]  # fmt: skip
+    stdout = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    times = [
+        float(t) for t in stdout.replace(",", "\n").split() if t not in ("", "N/A")
+    ]
+    return np.unique(np.round((np.asarray(times) - start_time) * fps).astype(np.int64))
+
+
+def keyframe_index(path: str) -> Optional[npt.NDArray[np.int64]]:
+    """Positions of keyframes in the video at ``path`` (See :func:`probe_keyframes <veditor.utils.video_utils.probe_keyframes>`), memoized per (``path``, modification time.)
+
+    Args:
+        path (str) : Path to the video.
+
+    Returns:
+        Optional[npt.NDArray[np.int64]]: Sorted positions of keyframes, or ``None`` if they cannot be probed (e.g. ``ffprobe`` is not available.)
+    """
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    if key not in KEYFRAME_INDEXES:
+        keyframes = None
+        if shutil.which("ffprobe") is not None:
+            try:
+                keyframes = probe_keyframes(path)
+            except (subprocess.CalledProcessError, ValueError, KeyError):
+                pass
+        if (keyframes is not None) and (len(keyframes) == 0):
+            keyframes = None
+        KEYFRAME_INDEXES[key] = keyframes
+    return KEYFRAME_INDEXES[key]
+
+
+def sample_keyframes(path: str, samples: int = 16) -> List[int]:
+    """Choose up to ``samples`` positions spread evenly across the video at ``path``, snapped to keyframes.
+
+    Seeking to a keyframe only decodes that frame, so sampling keyframes is much cheaper than sampling arbitrary positions (which decodes the whole GOP before them.) If ``ffprobe`` is not available, positions are spread evenly without snapping.
+
+    Args:
+        path (str)              : Path to the video.
+        samples (int, optional) : The maximum number of positions. Defaults to ``16``.
+
+    Returns:
+        List[int]: Sorted positions.
+    """
+    cap = cv2.VideoCapture(path)
+    count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    candidates = np.arange(max(count, 1), dtype=np.int64)
+    if shutil.which("ffprobe") is not None:
+        keyframes = probe_keyframes(path)
+        if len(keyframes) > 0:
+            candidates = keyframes
+    # Avoid the very first / last positions (fade in / fade out.)
+    idxes = (
+        np.linspace(0, len(candidates) - 1, num=samples + 2)[1:-1]
+        if len(candidates) > 2
+        else []
+    )
+    return sorted(set(int(candidates[int(round(i))]) for i in idxes)) or [
+        int(candidates[0])
+    ]
+
+
+def detect_clip_locations(
+    path: str, samples: int = 16, threshold: float = 8.0
+) -> Dict[str, Union[str, int]]:
+    """Detect static letterbox / pillarbox borders of the video at ``path``, and return where to clip it.
+
+    Rows (columns) of the borders have the same value over all columns (rows) of all sampled frames, so the borders are the runs of rows (columns) from each edge whose standard deviation is not larger than ``threshold``. The statistics are accumulated frame by frame with vectorized row and column sums, so frames are not kept in memory.
+
+    Args:
+        path (str)                  : Path to the video.
+        samples (int, optional)     : The number of frames to sample. (See :func:`sample_keyframes <veditor.utils.video_utils.sample_keyframes>`) Defaults to ``16``.
+        threshold (float, optional) : The maximum standard deviation of rows (columns) in the borders. Defaults to ``8.0``.
+
+    Raises:
+        FileNotFoundError: When file is not found.
+        ValueError: When file cannot be opened as a video.
+
+    Returns:
+        Dict[str, Union[str, int]]: ``path``, ``width`` and ``height`` of the video, and clip locations (``top``, ``left``, ``right``, ``bottom``) in the same manner as ``check-clip-locations``.
+
+    Examples:
+        >>> from veditor.utils import detect_clip_locations, SampleData
+        >>> detect_clip_locations(SampleData().VIDEO_PATH)
+        {'path': '...', 'width': 1280, 'height': 720, 'top': 0, 'left': 0, 'right': 1280, 'bottom': 720}
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"{toBLUE(path)} is not found.")
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError(f"{toBLUE(path)} cannot be opened as a video.")
+    W = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    H = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    # Sums (and sums of squares) of each row and column over all sampled frames.
+    row_sum, row_sq = (np.zeros(H), np.zeros(H))
+    col_sum, col_sq = (np.zeros(W), np.zeros(W))
+    n = 0
+    for pos in sample_keyframes(path, samples=samples):
+        cap.set(cv2.CAP_PROP_POS_FRAMES, pos)
+        is_ok, frame = cap.read()
+        if (not is_ok) or (frame is None):
+            continue
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY).astype(np.float32)
+        sq = gray * gray
+        row_sum += gray.sum(axis=1)
+        row_sq += sq.sum(axis=1)
+        col_sum += gray.sum(axis=0)
+        col_sq += sq.sum(axis=0)
+        n += 1
+    cap.release()
+    top, left, right, bottom = (0, 0, W, H)
+    if n > 0:
+        row_std = np.sqrt(np.maximum(row_sq / (n * W) - (row_sum / (n * W)) ** 2, 0))
+        col_std = np.sqrt(np.maximum(col_sq / (n * H) - (col_sum / (n * H)) ** 2, 0))
+        rows = np.flatnonzero(row_std > threshold)
+        cols = np.flatnonzero(col_std > threshold)
+        if len(rows) > 0:
+            top, bottom = (int(rows[0]), int(rows[-1]) + 1)
+        if len(cols) > 0:
+            left, right = (int(cols[0]), int(cols[-1]) + 1)
+    return dict(
+        path=path, width=W, height=H, top=top, left=left, right=right, bottom=bottom
+    )
+
+
+class FFmpegVideoWriter:
+    def __init__(
+        self,
+        out_path: str,
+        W: int,
+        H: int,
+        fps: Union[float, str],
+        vcodec: str = "libx264",
+        pix_fmt: str = "yuv420p",
+        options: List[str] = [],
+    ):
+        """Video writer which pipes raw BGR frames to ``ffmpeg``. It has the same interface as ``cv2.VideoWriter``, and can encode with any ``ffmpeg`` encoder (e.g. the one which matches the source video.)
+
+        Args:
+            out_path (str)                  : Path to the output video.
+            W (int)                         : Width of the output video.
+            H (int)                         : Height of the output video.
+            fps (Union[float, str])         : Frame rate of the output video. (A rational like ``"30000/1001"`` is also accepted.)
+            vcodec (str, optional)          : An ``ffmpeg`` video encoder. Defaults to ``"libx264"``.
+            pix_fmt (str, optional)         : Pixel format of the output video. Defaults to ``"yuv420p"``.
+            options (List[str], optional)   : Additional output options for ``ffmpeg``. Defaults to ``[]``.
+        """
+        command = [
+            "ffmpeg", "-y", "-loglevel", "error",
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{W}x{H}", "-r", str(fps),
+            "-i", "-",
+            "-an",
+            "-c:v", vcodec, "-pix_fmt", pix_fmt,
+            *options,
+            out_path,
+        ]  # fmt: skip
+        self.out_path = out_path
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE)
+
+    def isOpened(self) -> bool:
+        return self.process.poll() is None
+
+    def write(self, frame: npt.NDArray[np.uint8]) -> None:
+        self.process.stdin.write(np.ascontiguousarray(frame).tobytes())
+
+    def release(self) -> None:
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise subprocess.CalledProcessError(
+                self.process.returncode, self.process.args
+            )
+
+
+class FFmpegVideoReader:
+    def __init__(
+        self,
+        path: str,
+        top: int = 0,
+        left: int = 0,
+        right: Optional[int] = None,
+        bottom: Optional[int] = None,
+        start: int = 0,
+        fps: Optional[float] = None,
+    ):
+        """Video reader which decodes with ``ffmpeg`` and crops frames by the ``crop`` filter in the decoding pipeline. It has the same interface as ``cv2.VideoCapture`` (``read`` and ``release``.)
+
+        Only the cropped region (aligned to the chroma subsampling) is converted to BGR and piped, so the conversion, the transfer and the memory of each frame scale with the kept area.
+
+        Args:
+            path (str)                       : Path to the video.
+            top (int, optional)              : The top of the region. Defaults to ``0``.
+            left (int, optional)             : The left of the region. Defaults to ``0``.
+            right (Optional[int], optional)  : The right of the region (exclusive.) Defaults to ``None``. (The width of the video.)
+            bottom (Optional[int], optional) : The bottom of the region (exclusive.) Defaults to ``None``. (The height of the video.)
+            start (int, optional)            : The first position to read. Defaults to ``0``.
+            fps (Optional[float], optional)  : Frame rate used to convert ``start`` into a timestamp. Defaults to ``None``. (Probed.)
+        """
+        cap = cv2.VideoCapture(path)
+        W = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        H = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = fps or cap.get(cv2.CAP_PROP_FPS)
+        cap.release()
+        right = W if right is None else right
+        bottom = H if bottom is None else bottom
+        self.frame_size = (right - left, bottom - top)
+        # ``crop`` rounds odd offsets down on chroma-subsampled frames (e.g. yuv420p), so crop the region
+        # aligned to 2 pixels before the conversion, and trim it exactly after that.
+        x0, y0 = (left - left % 2, top - top % 2)
+        x1, y1 = (min(right + right % 2, W), min(bottom + bottom % 2, H))
+        filters = f"crop={x1 - x0}:{y1 - y0}:{x0}:{y0},format=bgr24"
+        if (x0, y0, x1, y1) != (left, top, right, bottom):
+            filters += f",crop={right - left}:{bottom - top}:{left - x0}:{top - y0}"
+        command = [
+            "ffmpeg", "-loglevel", "error",
+            "-ss", f"{start / fps:.6f}", "-i", path,
+            "-an", "-sn",
+            "-vf", filters,
+            "-f", "rawvideo", "-pix_fmt", "bgr24", "-",
+        ]  # fmt: skip
+        self.path = path
+        self.process = subprocess.Popen(command, stdout=subprocess.PIPE)
+
+    def isOpened(self) -> bool:
+        return self.process.stdout is not None and not self.process.stdout.closed
+
+    def read(self) -> Tuple[bool, Optional[npt.NDArray[np.uint8]]]:
+        W, H = self.frame_size
+        buf = bytearray(W * H * 3)
+        if self.process.stdout.readinto(buf) != len(buf):
+            return (False, None)
+        return (True, np.frombuffer(buf, dtype=np.uint8).reshape(H, W, 3))
+
+    def release(self) -> None:
+        self.process.stdout.close()
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+
+
+def copy_video_range(path: str, out_path: str, start: int, end: int, fps: float) -> str:
+    """Cut frames ``[start, end)`` out of the video at ``path`` by stream-copy (without re-encoding.)
+
+    ``start`` must be a keyframe (See :func:`probe_keyframes <veditor.utils.video_utils.probe_keyframes>`), otherwise the first frames cannot be decoded. Audio is dropped. Since input seeking (``-ss`` before ``-i``) is relative to the start time of the stream, ``start`` is converted into seconds as it is.
+
+    Args:
+        path (str)     : Path to the source video.
+        out_path (str) : Path to the output video.
+        start (int)    : The first position. (A keyframe.)
+        end (int)      : The position to stop copying. (exclusive)
+        fps (float)    : Frame rate of the source video.
+
+    Returns:
+        str: Path to the output video.
+    """
+    command = [
+        "ffmpeg", "-y", "-loglevel", "error",
+        "-ss", f"{start / fps:.6f}",
+        "-i", path,
+        "-map", "0:v:0", "-an",
+        "-frames:v", str(end - start),
+        "-c", "copy",
+        out_path,
+    ]  # fmt: skip
+    subprocess.run(command, check=True)
+    return out_path
+
+
 def show_frames(
     video: Union[str, cv2.VideoCapture],
     start: int = 0,
@@ -234,3 +602,203 @@ def vcodec2ext(*codec) -> str:
     }
     handleKeyError(lst=list(codec2ext.keys()), codec=codec)
     return codec2ext[codec]
+
+
+class ScrubReader:
+    def __init__(
+        self,
+        path: str,
+        capacity: int = 256,
+        height: Optional[int] = None,
+        dir: Optional[str] = None,
+    ):
+        """Random-access frame reader for interactive scrubbing.
+
+        Decoded (and downscaled) frames are kept in a memory-mapped :class:`FrameRing <veditor.utils.cache_utils.FrameRing>`. A worker thread services only the latest :meth:`request <veditor.utils.video_utils.ScrubReader.request>` (stale ones are dropped), and then prefetches neighbouring frames in the direction of travel, so the UI thread never waits for the decoder and just draws :meth:`latest <veditor.utils.video_utils.ScrubReader.latest>`.
+
+        Args:
+            path (str)                       : Path to the video.
+            capacity (int, optional)         : The number of frames to cache. Defaults to ``256``.
+            height (Optional[int], optional) : Height of cached frames. Defaults to ``None``. (The original height.)
+            dir (Optional[str], optional)    : Directory to create the memory-mapped file in. Defaults to ``None``.
+        """
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        W = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        H = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if height is not None:
+            W, H = (max(1, int(round(W * height / H))), height)
+        self.frame_size = (W, H)
+        self.ring = FrameRing(capacity=capacity, shape=(H, W, 3), dir=dir)
+        self.prefetch = capacity // 2
+        self._requested = threading.Event()
+        self._request_pos: Optional[int] = None
+        self._direction = 1
+        self._ready: Optional[Tuple[int, npt.NDArray[np.uint8]]] = None
+        self._stopped = False
+        self._worker = threading.Thread(target=self._work, daemon=True)
+        self._worker.start()
+
+    def _decode(self, cap: cv2.VideoCapture) -> Optional[npt.NDArray[np.uint8]]:
+        is_ok, frame = cap.read()
+        if (not is_ok) or (frame is None):
+            return None
+        if frame.shape[:2] != self.frame_size[::-1]:
+            frame = cv2.resize(
+                frame, dsize=self.frame_size, interpolation=cv2.INTER_AREA
+            )
+        return frame
+
+    def _interrupted(self) -> bool:
+        return self._stopped or self._requested.is_set()
+
+    def _decode_range(self, cap: cv2.VideoCapture, start: int, end: int) -> None:
+        """Decode frames ``[start, end)`` sequentially into the ring (skipping cached ones) until a new request arrives."""
+        next_pos = None
+        for pos in range(max(start, 0), min(end, self.frame_count)):
+            if self._interrupted():
+                break
+            if pos in self.ring:
+                continue
+            if pos != next_pos:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, pos)
+            frame = self._decode(cap)
+            if frame is None:
+                break
+            self.ring.put(pos=pos, frame=frame)
+            next_pos = pos + 1
+
+    def _work(self) -> None:
+        """Service the latest request, then prefetch in the direction of travel."""
+        cap = cv2.VideoCapture(self.path)
+        while True:
+            self._requested.wait()
+            self._requested.clear()
+            if self._stopped:
+                break
+            pos = self._request_pos
+            frame = self.ring.get(pos)
+            if frame is None:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, pos)
+                frame = self._decode(cap)
+                if frame is not None:
+                    self.ring.put(pos=pos, frame=frame)
+            if frame is not None:
+                self._ready = (pos, frame)
+            if self._direction > 0:
+                self._decode_range(cap, start=pos + 1, end=pos + 1 + self.prefetch)
+            else:
+                # Decoding backwards frame by frame needs a seek for each, so decode the window forwards.
+                self._decode_range(cap, start=pos - self.prefetch, end=pos)
+        cap.release()
+
+    def request(self, pos: int) -> None:
+        """Ask the worker thread to read the ``pos``-th frame. Only the latest request is serviced.
+
+        Args:
+            pos (int) : The position in the video.
+        """
+        if self._request_pos is not None and pos != self._request_pos:
+            self._direction = 1 if pos > self._request_pos else -1
+        self._request_pos = pos
+        self._requested.set()
+
+    def latest(self) -> Optional[Tuple[int, npt.NDArray[np.uint8]]]:
+        """Return the most recent ready frame as (``pos``, ``frame``), or ``None`` if no frame is ready yet."""
+        return self._ready
+
+    def read(self, pos: int) -> Optional[npt.NDArray[np.uint8]]:
+        """Read the ``pos``-th frame synchronously, from the ring if it is cached.
+
+        Args:
+            pos (int) : The position in the video.
+
+        Returns:
+            Optional[npt.NDArray[np.uint8]]: The ``pos``-th frame, or ``None`` if it cannot be read.
+        """
+        frame = self.ring.get(pos)
+        if frame is None:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, pos)
+            frame = self._decode(self.cap)
+            if frame is not None:
+                self.ring.put(pos=pos, frame=frame)
+        return frame
+
+    def release(self) -> None:
+        """Stop the worker thread and release resources."""
+        self._stopped = True
+        self._requested.set()
+        self._worker.join()
+        self.cap.release()
+        self.ring.close()
+
+
+class SequentialReader:
+    def __init__(
+        self,
+        path: str,
+        dsize: Optional[Tuple[int, int]] = None,
+        max_skip: int = 30,
+        keyframes: Optional[npt.NDArray[np.int64]] = None,
+    ):
+        """Frame reader which keeps one decoder open and reads forward.
+
+        Reading ``pos`` right after ``pos - 1`` decodes just one frame, small forward jumps (up to ``max_skip`` frames) are skipped with ``grab`` (which does not convert frames), and only other jumps seek. The last (resized) frame is kept, so reading the same position again (e.g. by a transition which shares the source with a :class:`VideoElement <veditor.elements.video.VideoElement>`) does not decode at all. Returned frames are shared, so do not modify them in place.
+
+        With ``keyframes`` (See :func:`keyframe_index <veditor.utils.video_utils.keyframe_index>`), a jump seeks exactly to the nearest preceding keyframe and grabs forward to ``pos``, and a forward jump within the current group of pictures does not seek at all.
+
+        Args:
+            path (str)                                            : Path to the video.
+            dsize (Optional[Tuple[int, int]], optional)           : Size (``width``, ``height``) of returned frames. Defaults to ``None``. (As it is.)
+            max_skip (int, optional)                              : The maximum number of frames skipped by decoding instead of seeking. Defaults to ``30``.
+            keyframes (Optional[npt.NDArray[np.int64]], optional) : Sorted positions of keyframes. Defaults to ``None``.
+        """
+        self.path = path
+        self.dsize = dsize
+        self.max_skip = max_skip
+        self.keyframes = keyframes
+        self.cap: Optional[cv2.VideoCapture] = None
+        self.next_pos = 0
+        self.last: Tuple[Optional[int], Optional[npt.NDArray[np.uint8]]] = (None, None)
+
+    def read(self, pos: int) -> Optional[npt.NDArray[np.uint8]]:
+        """Read the ``pos``-th frame.
+
+        Args:
+            pos (int) : The position in the video.
+
+        Returns:
+            Optional[npt.NDArray[np.uint8]]: The ``pos``-th frame, or ``None`` if it cannot be read.
+        """
+        if self.last[0] == pos:
+            return self.last[1]
+        if self.cap is None:
+            self.cap = cv2.VideoCapture(self.path)
+            self.next_pos = 0
+        start = self.next_pos
+        if not (0 <= pos - start <= self.max_skip):
+            start = pos
+            if self.keyframes is not None:
+                idx = np.searchsorted(self.keyframes, pos, side="right") - 1
+                start = int(self.keyframes[max(idx, 0)])
+            if start <= self.next_pos <= pos:
+                # The keyframe is behind the decoder, so keep decoding.
+                start = self.next_pos
+            else:
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+        for _ in range(pos - start):
+            self.cap.grab()
+        is_ok, frame = self.cap.read()
+        if is_ok and (self.dsize is not None):
+            frame = resize_image(frame, dsize=self.dsize)
+        self.next_pos = pos + 1
+        self.last = (pos, frame if is_ok else None)
+        return self.last[1]
+
+    def release(self) -> None:
+        """Release the decoder. (It is reopened by the next :meth:`read <veditor.utils.video_utils.SequentialReader.read>`.)"""
+        if self.cap is not None:
+            self.cap.release()
+        self.cap = None
+        self.last = (None, None)